@@ -0,0 +1,148 @@
+"""Background job queue that runs analyses off the API event loop."""
+
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+
+class Job:
+    """One queued analysis and its progress."""
+
+    def __init__(self, job_id: str, state_machine=None):
+        self.job_id = job_id
+        # queued -> running -> complete | failed
+        self.status = "queued"
+        # StateMachine of the orchestrator doing the work; its stage is the progress
+        self.state_machine = state_machine
+        self.created_at = datetime.utcnow().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.errors = []
+        # (event, data) pairs from the state machine, in order, for streaming
+        self.events = []
+
+    def record(self, event: str, data: Dict):
+        """State machine listener: keep an event for streaming clients."""
+        self.events.append((event, data))
+
+    @property
+    def stage(self) -> str:
+        """Pipeline stage, read live from the orchestrator's state machine."""
+        if self.state_machine is None:
+            return self.status
+        return self.state_machine.state.current_stage
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self.status in ("complete", "failed")
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        """JSON-serializable job status."""
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "stage": self.stage,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "errors": self.errors,
+        }
+        if self.result is not None:
+            data["analysis_id"] = self.result.get("analysis_id")
+            if include_result:
+                data["result"] = self.result
+        return data
+
+
+class JobQueue:
+    """
+    Runs blocking callables on a worker pool and tracks them by job id.
+
+    Analyses spend most of their time in I/O (LLM and Solana RPC calls) and
+    NumPy, and parsing already fans out to processes, so worker threads are
+    enough to keep the event loop free. Only the most recent finished jobs
+    are kept for polling.
+    """
+
+    def __init__(self, max_workers: int = 2, max_finished_jobs: int = 100):
+        self.max_workers = max(1, max_workers)
+        self.max_finished_jobs = max(1, max_finished_jobs)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="docksight-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[[], Dict], state_machine=None) -> Job:
+        """
+        Queue ``fn`` and return its job immediately.
+
+        Args:
+            fn: Blocking callable returning the analysis response dictionary
+            state_machine: StateMachine the callable advances; its stage and
+                events become the job's progress
+
+        Returns:
+            The queued Job
+        """
+        job = Job(uuid.uuid4().hex, state_machine)
+        if state_machine is not None:
+            state_machine.add_listener(job.record)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_finished()
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Job by id, or None if unknown or evicted."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pending_count(self) -> int:
+        """Number of jobs queued or running."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.done)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, fn: Callable[[], Dict]):
+        """Worker body: run the callable and record its outcome."""
+        job.status = "running"
+        job.started_at = datetime.utcnow().isoformat()
+        try:
+            result = fn()
+            job.result = result
+            job.errors = list(result.get("errors", []))
+            job.status = "failed" if result.get("status") == "failed" else "complete"
+        except Exception as e:
+            print(f"Warning: Analysis job {job.job_id} failed: {e}")
+            job.errors = [f"Analysis failed: {str(e)}"]
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+            with self._lock:
+                self._evict_finished()
+
+    def _evict_finished(self):
+        """Drop the oldest finished jobs beyond the retention limit (lock held)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+
+# Global instance
+_job_queue = None
+
+def get_job_queue() -> JobQueue:
+    """Get the global job queue instance."""
+    global _job_queue
+    if _job_queue is None:
+        from backend.config import config
+        _job_queue = JobQueue(max_workers=config.job_workers, max_finished_jobs=config.job_history)
+    return _job_queue
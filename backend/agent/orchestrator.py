@@ -1,22 +1,102 @@
 """Agent orchestrator that controls the full docking analysis workflow."""
 
+import hashlib
+import multiprocessing
+import os
+import tarfile
 import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+
+import numpy as np
+
 from backend.agent.state_machine import StateMachine
+from backend.tools.docking_archive import (
+    MemberTooLargeError,
+    can_reopen_members,
+    is_archive,
+    iter_archive_members,
+    iter_archive_streams,
+    read_members,
+)
 from backend.tools.docking_parser import DockingParser
+from backend.tools.fingerprints import FingerprintSet, InteractionFingerprinter
+from backend.tools.interactions import InteractionAnalyzer
 from backend.tools.ranking import LigandRanker
+from backend.tools.rescoring import VinaRescorer, parse_weights
 from backend.tools.report_writer import ReportWriter
 from backend.tools.visualization import VisualizationGenerator
 from backend.tools.solana_attestation import SolanaAttestationTool
 
 
+# Below this many files a process pool costs more than it saves
+PARALLEL_PARSE_MIN_FILES = 32
+# Parse progress events per batch; a 10k-file upload reports every 100 files
+PARSE_PROGRESS_EVENTS = 100
+# Ranked ligands sent with the early ranking event
+RANKING_EVENT_LIGANDS = 10
+# Archive members parsed per batch; also how often archive progress is reported
+ARCHIVE_PARSE_BATCH = 256
+# Member bytes held for one pool batch; large members flush the batch early
+ARCHIVE_BATCH_BYTES = 64 * 1024 * 1024
+
+_worker_parser = None
+
+
+def _pool_context():
+    """Start method for parse pools: the API process runs threads, which fork does not copy safely."""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _parse_docking_file(file_path, include_coordinates=False):
+    """Parse one docking file inside a pool worker process."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = DockingParser()
+    return _worker_parser.parse_vina_output(file_path, include_coordinates)
+
+
+def _parse_docking_member(file_path, content, include_coordinates=False):
+    """Parse one archive member's content inside a pool worker process."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = DockingParser()
+    return _worker_parser.parse_vina_content(content, file_path, include_coordinates)
+
+
 class DockingAnalysisOrchestrator:
     """Main orchestrator for the docking analysis agent."""
 
-    def __init__(self, config=None, groq_api_key=None, enable_solana=False):
+    def __init__(self, config=None, groq_api_key=None, enable_solana=False,
+                 parse_workers=None, parse_chunksize=None, parse_cache=None,
+                 ranking_top_k=None, receptor_file=None, receptor_cache=None, content_hashes=None):
         self.state_machine = StateMachine()
         self.parser = DockingParser()
-        self.ranker = LigandRanker()
+        # Parallel parsing is opt-in: 1 worker keeps the serial loop
+        self.parse_workers = parse_workers or (config.parse_workers if config else 1)
+        self.parse_chunksize = parse_chunksize or (config.parse_chunksize if config else 0)
+        self.parse_cache = parse_cache
+        # File path -> SHA-256 computed while uploading; spares the cache a re-read
+        self.content_hashes = content_hashes or {}
+        # Uncompressed size cap per archive member, as for an uploaded file
+        self.max_member_bytes = config.upload_max_file_bytes if config else None
+        # Keep only the best K ligands for large virtual screens (0 keeps all)
+        self.ranking_top_k = ranking_top_k or (config.ranking_top_k if config else 0)
+        # Interactions and rescoring need a receptor and ligand coordinates
+        self.receptor_file = receptor_file
+        self.include_coordinates = receptor_file is not None
+        self.interaction_analyzer = InteractionAnalyzer(receptor_cache=receptor_cache)
+        self._receptor_failed = False
+        # Rescored ranking falls back to ΔG in rank_ligands without a usable receptor
+        self.ranker = LigandRanker(
+            cluster_rmsd=config.cluster_rmsd,
+            rank_key=config.ranking_key,
+            pareto_objectives=config.pareto_objectives,
+        ) if config else LigandRanker()
+        self.rescoring_weights = parse_weights(config.rescoring_weights) if config else None
         self.report_writer = ReportWriter(groq_api_key=groq_api_key)
         self.visualizer = VisualizationGenerator()
         # Enable real Solana if requested and configured
@@ -47,20 +127,23 @@ class DockingAnalysisOrchestrator:
                 self.state_machine.state.add_validation_error(error)
             return {"status": "failed", "errors": self.state_machine.state.validation_errors, "analysis_id": analysis_id}
 
-        # Step 3: Generate visualizations
+        # Step 3: Extract interactions for ranked ligands (requires a receptor)
+        self.extract_interactions(self.state_machine.state.parsed_docking_results)
+
+        # Step 4: Generate visualizations
         self.generate_visualizations(
             self.state_machine.state.ranked_ligands,
             self.state_machine.state.interactions
         )
 
-        # Step 4: Generate report
+        # Step 5: Generate report
         report = self.generate_report(
             self.state_machine.state.ranked_ligands,
             self.state_machine.state.interactions,
             self.state_machine.state.visualization_paths
         )
 
-        # Step 5: Attest to Solana (optional)
+        # Step 6: Attest to Solana (optional)
         attestation_result = None
         if enable_attestation:
             attestation_result = self.attest_to_solana({
@@ -72,11 +155,15 @@ class DockingAnalysisOrchestrator:
             "status": "complete",
             "analysis_id": analysis_id,
             "ranked_ligands": self.state_machine.state.ranked_ligands,
+            "ranking_summary": self.state_machine.state.ranking_summary,
+            "warnings": self.state_machine.state.warnings,
             "interactions": self.state_machine.state.interactions,
+            "interaction_fingerprints": self.state_machine.state.interaction_fingerprints,
             "visualizations": self.state_machine.state.visualization_paths,
             "report": report,
             "attestation": attestation_result,
             "pdbqt_files": self._get_pdbqt_content(self.state_machine.state.ranked_ligands),
+            "parsed_docking_results": self.state_machine.state.parsed_docking_results,
         }
 
     def validate_input(self, docking_input):
@@ -93,7 +180,8 @@ class DockingAnalysisOrchestrator:
                 self.state_machine.state.add_validation_error(f"Invalid file path type: {type(file_path)}")
                 continue
 
-            if not self.parser.validate_format(file_path):
+            # Archive members are validated one by one as they are parsed
+            if not (self.parser.validate_format(file_path) or is_archive(file_path)):
                 self.state_machine.state.add_validation_error(f"Unsupported file format: {file_path}")
                 continue
 
@@ -107,9 +195,12 @@ class DockingAnalysisOrchestrator:
             self.state_machine.state.add_validation_error("Invalid state transition to parsing")
             return
 
-        for file_path in self.state_machine.state.raw_files:
-            parsed_result = self.parser.parse_vina_output(file_path)
+        raw_files = self.state_machine.state.raw_files
+        parsed_results = self._parse_files([path for path in raw_files if not is_archive(path)])
+        for archive_path in filter(is_archive, raw_files):
+            parsed_results.extend(self._parse_archive(archive_path))
 
+        for parsed_result in parsed_results:
             if "error" in parsed_result:
                 self.state_machine.state.add_validation_error(parsed_result["error"])
             else:
@@ -120,13 +211,247 @@ class DockingAnalysisOrchestrator:
         else:
             self.state_machine.transition_to("parsed")
 
+    def _parse_files(self, raw_files):
+        """Parse files in input order, serving repeated content from the cache."""
+        if self.parse_cache is None:
+            return self._parse_uncached(raw_files)
+
+        results = [None] * len(raw_files)
+        keys = [None] * len(raw_files)
+        missing = []
+
+        for idx, file_path in enumerate(raw_files):
+            try:
+                keys[idx] = self.parse_cache.content_key(
+                    file_path, self.include_coordinates, self.content_hashes.get(file_path)
+                )
+                results[idx] = self.parse_cache.get(keys[idx], file_path)
+            except OSError:
+                # Unreadable files fall through so the parser reports them
+                pass
+            if results[idx] is None:
+                missing.append(idx)
+
+        cached = len(raw_files) - len(missing)
+        if cached:
+            self.state_machine.emit("parse_progress", {"parsed": cached, "total": len(raw_files), "cached": cached})
+
+        parsed = self._parse_uncached([raw_files[idx] for idx in missing], cached, len(raw_files))
+        for idx, parsed_result in zip(missing, parsed):
+            results[idx] = parsed_result
+            if keys[idx] is not None:
+                self.parse_cache.put(keys[idx], parsed_result)
+
+        return results
+
+    def _parse_progress(self, parsed, total, cached=0):
+        """Emit per-file parse progress, about PARSE_PROGRESS_EVENTS times per batch."""
+        step = max(1, total // PARSE_PROGRESS_EVENTS)
+        if parsed % step == 0 or parsed == total:
+            self.state_machine.emit("parse_progress", {"parsed": parsed, "total": total, "cached": cached})
+
+    def _parse_uncached(self, raw_files, cached=0, total=None):
+        """Parse files with DockingParser, in parallel for large batches.
+
+        ``cached`` files of a batch of ``total`` were already served by the
+        parse cache; progress counts them as parsed.
+        """
+        total = len(raw_files) if total is None else total
+        if self.parse_workers > 1 and len(raw_files) >= PARALLEL_PARSE_MIN_FILES:
+            return self._parse_files_parallel(raw_files, cached, total)
+        return self._parse_files_serial(raw_files, cached, total)
+
+    def _parse_files_serial(self, raw_files, cached, total):
+        """Parse files one by one in this process."""
+        results = []
+        for path in raw_files:
+            results.append(self.parser.parse_vina_output(path, self.include_coordinates))
+            self._parse_progress(cached + len(results), total, cached)
+        return results
+
+    def _parse_files_parallel(self, raw_files, cached, total):
+        """Parse files across a process pool, preserving input order."""
+        chunksize = self.parse_chunksize
+        if chunksize <= 0:
+            # Roughly four chunks per worker balances load against IPC overhead
+            chunksize = max(1, len(raw_files) // (self.parse_workers * 4))
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=_pool_context()) as executor:
+                # Executor.map yields results in submission order
+                parse_file = partial(_parse_docking_file, include_coordinates=self.include_coordinates)
+                results = []
+                for parsed_result in executor.map(parse_file, raw_files, chunksize=chunksize):
+                    results.append(parsed_result)
+                    self._parse_progress(cached + len(results), total, cached)
+                return results
+        except Exception as e:
+            print(f"Warning: Parallel parsing failed, falling back to serial: {e}")
+            return self._parse_files_serial(raw_files, cached, total)
+
+    def _parse_archive(self, archive_path):
+        """Parse the docking outputs of an archive as they stream out of it.
+
+        Members are never extracted to disk. Each is checked against the
+        supported extensions and served from the parse cache when its content
+        was seen before. Without a process pool every member is hashed and
+        parsed while it is read; with one, members are read into batches of
+        at most ARCHIVE_PARSE_BATCH members and ARCHIVE_BATCH_BYTES bytes,
+        and large batches are parsed across the pool.
+        """
+        name = os.path.basename(archive_path)
+        try:
+            if self.parse_workers > 1:
+                results, cached = self._parse_archive_batches(archive_path, name)
+            else:
+                results, cached = self._parse_archive_streamed(archive_path, name)
+        except (OSError, ValueError, zipfile.BadZipFile, tarfile.TarError) as e:
+            return [{"error": f"Failed to read archive {name}: {str(e)}"}]
+
+        if not results:
+            return [{"error": f"No docking files found in {name}"}]
+        self.state_machine.emit("parse_progress", {
+            "parsed": len(results), "total": len(results), "cached": cached, "archive": name
+        })
+        return results
+
+    def _parse_archive_streamed(self, archive_path, name):
+        """Parse archive members one by one in this process; returns (results, cached)."""
+        results = []
+        cached = 0
+        # Zip members are hashed first and parsed only on a cache miss; tar
+        # streams are read once, so their members are hashed while parsing
+        reopen = can_reopen_members(archive_path)
+
+        for file_path, open_member in iter_archive_streams(archive_path, self.max_member_bytes):
+            key = hit = None
+            use_cache = self.parse_cache is not None and self.parser.validate_format(file_path)
+            if use_cache and reopen:
+                with open_member() as reader:
+                    key = self.parse_cache.content_key(file_path, self.include_coordinates, reader.hexdigest())
+                hit = self.parse_cache.get(key, file_path)
+
+            if hit is not None:
+                results.append(hit)
+                cached += 1
+            else:
+                # Unsupported members are reported by _parse_member_stream
+                with open_member() as reader:
+                    parsed_result = self._parse_member_stream(reader, file_path)
+                    if use_cache and key is None:
+                        key = self.parse_cache.content_key(file_path, self.include_coordinates, reader.hexdigest())
+                results.append(parsed_result)
+                if key is not None:
+                    self.parse_cache.put(key, parsed_result)
+
+            if len(results) % ARCHIVE_PARSE_BATCH == 0:
+                self.state_machine.emit("parse_progress", {
+                    "parsed": len(results), "total": None, "cached": cached, "archive": name
+                })
+        return results, cached
+
+    def _parse_archive_batches(self, archive_path, name):
+        """Parse archive members in batches across a process pool; returns (results, cached)."""
+        results = []
+        batch = []
+        batch_bytes = 0
+        cached = 0
+
+        # One pool for the whole archive; workers start with the first large batch
+        with ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=_pool_context()) as executor:
+            for file_path, content in iter_archive_members(archive_path, self.max_member_bytes):
+                key = hit = None
+                if self.parse_cache is not None and self.parser.validate_format(file_path):
+                    key = self.parse_cache.content_key(
+                        file_path, self.include_coordinates, hashlib.sha256(content).hexdigest()
+                    )
+                    hit = self.parse_cache.get(key, file_path)
+
+                if hit is not None:
+                    results.append(hit)
+                    cached += 1
+                else:
+                    # Unsupported members are reported by the parser
+                    batch.append((len(results), file_path, content, key))
+                    batch_bytes += len(content)
+                    results.append(None)
+
+                if len(results) % ARCHIVE_PARSE_BATCH == 0 or batch_bytes >= ARCHIVE_BATCH_BYTES:
+                    self._parse_member_batch(batch, results, executor)
+                    batch = []
+                    batch_bytes = 0
+                if len(results) % ARCHIVE_PARSE_BATCH == 0:
+                    self.state_machine.emit("parse_progress", {
+                        "parsed": len(results), "total": None, "cached": cached, "archive": name
+                    })
+
+            self._parse_member_batch(batch, results, executor)
+        return results, cached
+
+    def _parse_member_stream(self, reader, file_path):
+        """Parse an archive member while it is read, like DockingParser.parse_vina_content."""
+        if not self.parser.validate_format(file_path):
+            return {"error": f"Unsupported file format: {file_path}"}
+
+        try:
+            return self.parser.parse_vina_stream(reader.lines(), file_path, self.include_coordinates)
+        except MemberTooLargeError:
+            # Fails the whole archive, as when members are read into memory
+            raise
+        except Exception as e:
+            return {"error": f"Failed to parse {file_path}: {str(e)}"}
+
+    def _parse_member_batch(self, batch, results, executor):
+        """Parse (result index, path, content, cache key) members into ``results``."""
+        if not batch:
+            return
+        _, paths, contents, _ = zip(*batch)
+        parsed = None
+        if executor is not None and len(batch) >= PARALLEL_PARSE_MIN_FILES:
+            chunksize = self.parse_chunksize or max(1, len(batch) // (self.parse_workers * 4))
+            try:
+                parse_member = partial(_parse_docking_member, include_coordinates=self.include_coordinates)
+                parsed = list(executor.map(parse_member, paths, contents, chunksize=chunksize))
+            except Exception as e:
+                print(f"Warning: Parallel parsing failed, falling back to serial: {e}")
+        if parsed is None:
+            parsed = [self.parser.parse_vina_content(content, path, self.include_coordinates)
+                      for path, content in zip(paths, contents)]
+
+        for (idx, _, _, key), parsed_result in zip(batch, parsed):
+            results[idx] = parsed_result
+            if key is not None:
+                self.parse_cache.put(key, parsed_result)
+
     def rank_ligands(self, parsed_data):
         """Rank ligands based on binding affinity."""
         if not self.state_machine.transition_to("ranking"):
             self.state_machine.state.add_validation_error("Invalid state transition to ranking")
             return {"ranked_ligands": [], "errors": ["State transition failed"]}
 
-        ranking_result = self.ranker.rank_by_binding_affinity(parsed_data)
+        if self.receptor_file and self.ranker.rescorer is None:
+            receptor = self._load_receptor()
+            if receptor is not None:
+                self.ranker.receptor = receptor
+                self.ranker.rescorer = VinaRescorer(receptor, weights=self.rescoring_weights)
+
+        if self.ranker.rank_key == "rescored_affinity" and self.ranker.rescorer is None:
+            # No receptor, or it failed to prepare: rank by docking score rather than fail
+            self.ranker.rank_key = "binding_affinity"
+            self.state_machine.state.add_warning(
+                "Ranking by rescored affinity requires a receptor; ranked by binding affinity instead"
+            )
+
+        if self.ranking_top_k > 0:
+            ranking_result = self.ranker.rank_top_k(parsed_data, self.ranking_top_k)
+            if not ranking_result["errors"]:
+                self.state_machine.state.ranking_summary = {
+                    "total_ligands_seen": ranking_result["total_ligands_seen"],
+                    "ranked_ligands_kept": len(ranking_result["ranked_ligands"]),
+                    "affinity_stats": ranking_result["affinity_stats"],
+                }
+        else:
+            ranking_result = self.ranker.rank_by_binding_affinity(parsed_data)
 
         if ranking_result["errors"]:
             for error in ranking_result["errors"]:
@@ -134,6 +459,12 @@ class DockingAnalysisOrchestrator:
             self.state_machine.transition_to("failed")
         else:
             self.state_machine.state.set_ranked_ligands(ranking_result["ranked_ligands"])
+            # Ranking is ready long before interactions, plots and the report
+            self.state_machine.emit("ranking", {
+                "ranking_summary": self.state_machine.state.ranking_summary,
+                "total_ligands": len(ranking_result["ranked_ligands"]),
+                "top_ligands": ranking_result["ranked_ligands"][:RANKING_EVENT_LIGANDS],
+            })
             # Don't transition to complete yet - allow visualization and reporting
             # self.state_machine.transition_to("complete")
 
@@ -141,8 +472,67 @@ class DockingAnalysisOrchestrator:
 
     def extract_interactions(self, parsed_data):
         """Extract molecular interactions from docking poses."""
-        # Not implemented in this scope
-        pass
+        if not self.receptor_file or self._load_receptor() is None:
+            return {}
+
+        parsed_by_path = {result["file_path"]: result for result in parsed_data}
+        fingerprinter = InteractionFingerprinter(self.interaction_analyzer.receptor.residue_labels())
+        interactions = {}
+        fingerprints = []
+
+        # Analyze the best pose of every ranked ligand
+        for ligand in self.state_machine.state.ranked_ligands:
+            pose_data = self._best_pose_data(ligand, parsed_by_path.get(ligand["file_path"]))
+            if pose_data is None:
+                continue
+
+            profile = self.interaction_analyzer.analyze_pose(pose_data)
+            profile["summary"] = self.interaction_analyzer.summarize_interactions(profile)
+            interactions[ligand["ligand_name"]] = profile
+            fingerprints.append(fingerprinter.encode(self.interaction_analyzer.interaction_residues(profile)))
+
+        fingerprint_set = FingerprintSet(
+            residues=fingerprinter.residues,
+            ligand_names=list(interactions),
+            pose_ids=[profile["pose_id"] for profile in interactions.values()],
+            words=np.array(fingerprints, dtype=np.uint64).reshape(len(fingerprints), fingerprinter.num_words),
+        )
+        self.state_machine.state.set_interactions(interactions, fingerprint_set)
+        return interactions
+
+    def _load_receptor(self):
+        """Prepare the receptor once (or serve it from the receptor cache)."""
+        if self.interaction_analyzer.receptor is None and not self._receptor_failed:
+            try:
+                self.interaction_analyzer.load_receptor(self.receptor_file)
+            except Exception as e:
+                # Receptor-based steps are optional - log but don't fail
+                self._receptor_failed = True
+                self.state_machine.state.add_validation_error(f"Receptor preparation failed: {str(e)}")
+        return self.interaction_analyzer.receptor
+
+    def _best_pose_data(self, ligand, parsed_result):
+        """Coordinate arrays of a ranked ligand's best pose, if parsed."""
+        if not parsed_result or parsed_result.get("pose_arrays") is None:
+            return None
+
+        arrays = parsed_result["pose_arrays"]
+        pose_ids = [pose["pose_id"] for pose in parsed_result["poses"]]
+        pose_index = pose_ids.index(ligand["pose_id"])
+        if pose_index >= arrays.num_poses:
+            return None
+
+        rows = arrays.pose_slice(pose_index)
+        if rows.start == rows.stop:
+            # MODEL block without atoms
+            return None
+        return {
+            "ligand_name": ligand["ligand_name"],
+            "pose_id": ligand["pose_id"],
+            "coordinates": arrays.coordinates[rows],
+            "atom_types": arrays.atom_types[rows],
+            "charges": arrays.charges[rows],
+        }
 
     def generate_visualizations(self, parsed_data, interactions):
         """Generate molecular visualization outputs."""
@@ -192,7 +582,18 @@ class DockingAnalysisOrchestrator:
             }
         }
 
-        report_md = self.report_writer.compose_report(analysis_data)
+        # Stream report text to listeners as it is written
+        on_token = on_reset = None
+        if self.state_machine.listeners:
+            on_token = lambda text: self.state_machine.emit("report_token", {"text": text})
+
+            def on_reset(text):
+                self.state_machine.state.add_warning(
+                    "LLM discussion stream was interrupted; the report uses the template discussion"
+                )
+                self.state_machine.emit("report_reset", {"text": text})
+
+        report_md = self.report_writer.compose_report(analysis_data, on_token=on_token, on_reset=on_reset)
         self.state_machine.state.set_final_report(report_md)
         # Don't transition to complete yet - allow attestation
         # self.state_machine.transition_to("complete")
@@ -242,10 +643,20 @@ class DockingAnalysisOrchestrator:
     def _get_pdbqt_content(self, ranked_ligands):
         """Read PDBQT file content for 3D visualization."""
         pdbqt_data = {}
-        for ligand in ranked_ligands[:5]:  # Top 5 only
+        top_ligands = ranked_ligands[:5]  # Top 5 only
+        # Members of uploaded archives are read back in one pass per archive
+        try:
+            members = read_members([ligand["file_path"] for ligand in top_ligands
+                                    if (ligand.get("file_path") or "").endswith(".pdbqt")])
+        except Exception as e:
+            print(f"Error reading PDBQT from archive: {e}")
+            members = {}
+        for ligand in top_ligands:
             ligand_name = ligand.get("ligand_name")
             file_path = ligand.get("file_path")
-            if file_path and file_path.endswith(".pdbqt"):
+            if file_path in members:
+                pdbqt_data[ligand_name] = members[file_path].decode("utf-8", "replace")
+            elif file_path and file_path.endswith(".pdbqt"):
                 try:
                     with open(file_path, "r") as f:
                         pdbqt_data[ligand_name] = f.read()
@@ -8,14 +8,17 @@ class AnalysisState:
         self.raw_files = []
         self.parsed_docking_results = []
         self.ranked_ligands = []
+        self.ranking_summary = None
         self.best_poses = []
         self.interactions = {}
+        self.interaction_fingerprints = None
         self.visualization_paths = []
         self.final_report_md = None
         self.analysis_hash = None
         self.report_hash = None
         self.attestation_tx = None
         self.validation_errors = []
+        self.warnings = []
         self.current_stage = "initialized"
 
     def add_raw_file(self, file_path):
@@ -31,6 +34,11 @@ class AnalysisState:
         self.ranked_ligands = ranked_ligands
         self.best_poses = ranked_ligands  # Best poses are the ranked ligands
 
+    def set_interactions(self, interactions, fingerprints=None):
+        """Store per-ligand interaction profiles (and their fingerprints) in state."""
+        self.interactions = interactions
+        self.interaction_fingerprints = fingerprints
+
     def set_visualization_paths(self, visualization_paths):
         """Store visualization output paths in state."""
         self.visualization_paths = visualization_paths
@@ -49,6 +57,10 @@ class AnalysisState:
         """Record a validation error."""
         self.validation_errors.append(error)
 
+    def add_warning(self, warning):
+        """Record a problem the analysis worked around."""
+        self.warnings.append(warning)
+
     def has_errors(self):
         """Check if any validation errors exist."""
         return len(self.validation_errors) > 0
@@ -70,12 +82,27 @@ class StateMachine:
             "attesting": ["attested", "complete", "failed"],
             "attested": ["complete"],
         }
+        # Callables notified of transitions and progress, as (event, data)
+        self.listeners = []
+
+    def add_listener(self, listener):
+        """Register a callable receiving (event, data) for every emitted event."""
+        self.listeners.append(listener)
+
+    def emit(self, event, data):
+        """Notify listeners of an event; a failing listener never stops the analysis."""
+        for listener in self.listeners:
+            try:
+                listener(event, data)
+            except Exception as e:
+                print(f"Warning: State listener failed on {event}: {e}")
 
     def transition_to(self, next_stage):
         """Transition to the next analysis stage."""
         current = self.state.current_stage
         if next_stage in self.allowed_transitions.get(current, []):
             self.state.current_stage = next_stage
+            self.emit("stage", {"stage": next_stage, "previous": current})
             return True
         return False
 
@@ -1,75 +1,64 @@
 """API routes for the DockSight AI backend."""
 
+import asyncio
+import json
 import os
-import tempfile
 import shutil
-from pathlib import Path
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from functools import partial
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
 
+from backend.agent.job_queue import get_job_queue
 from backend.agent.orchestrator import DockingAnalysisOrchestrator
 from backend.config import config
 from backend.storage.analysis_store import get_store
+from backend.storage.parse_cache import get_parse_cache
+from backend.storage.receptor_cache import get_receptor_cache
+from backend.storage.upload_spool import UploadError, UploadSpool
+from backend.tools.docking_archive import ARCHIVE_EXTENSIONS
+from backend.tools.ranking import LigandRanker
+from backend.tools.ranking_engine import PoseTable
 
 
 router = APIRouter()
 
+# How often a job event stream checks for new events (seconds)
+JOB_EVENT_POLL_SECONDS = 0.1
 
-@router.post("/analyze")
-async def analyze_docking_results(files: List[UploadFile] = File(...)):
+# Docking outputs, uploaded one by one or packed in a .zip/.tar.gz
+LIGAND_EXTENSIONS = (".pdbqt", ".log") + ARCHIVE_EXTENSIONS
+RECEPTOR_EXTENSIONS = (".pdbqt", ".pdb")
+
+# /analyze reads its multipart body itself; describe it for the API docs
+ANALYZE_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["files"],
+                    "properties": {
+                        "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                        "receptor": {"type": "string", "format": "binary"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+def _run_pipeline(orchestrator, temp_dir, temp_files, uploaded_files):
     """
-    Analyze docking results from uploaded files.
+    Blocking part of /analyze: run the pipeline and store its result.
     
-    Accepts multiple .pdbqt or .log files and runs the complete
-    docking analysis pipeline.
+    Runs on a worker thread (never the event loop) and removes the
+    uploaded files when done.
     """
-    if not files:
-        raise HTTPException(status_code=400, detail="No files provided")
-    
-    # Validate file extensions
-    allowed_extensions = {".pdbqt", ".log"}
-    for file in files:
-        ext = Path(file.filename).suffix.lower()
-        if ext not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type: {file.filename}. Only .pdbqt and .log files are allowed."
-            )
-    
-    # Create temporary directory for uploaded files
-    temp_dir = tempfile.mkdtemp(prefix="docksight_")
-    temp_files = []
-    
     try:
-        # Save uploaded files to temporary directory
-        for file in files:
-            temp_path = os.path.join(temp_dir, file.filename)
-            with open(temp_path, "wb") as f:
-                content = await file.read()
-                f.write(content)
-            temp_files.append(temp_path)
-        
-        # Check for Groq API key
-        groq_api_key = config.groq_api_key
-        if not groq_api_key:
-            return {
-                "status": "failed",
-                "errors": ["GROQ_API_KEY not configured. LLM-based report generation unavailable."],
-                "ranked_ligands": [],
-                "interactions": {},
-                "visualizations": [],
-                "report": "",
-                "attestation": None,
-            }
-        
-        # Initialize orchestrator with Groq API key
-        enable_solana = os.getenv("ENABLE_SOLANA_ATTESTATION", "false").lower() == "true"
-        orchestrator = DockingAnalysisOrchestrator(
-            config=config,
-            groq_api_key=groq_api_key,
-            enable_solana=enable_solana
-        )
-        
         # Run analysis
         result = orchestrator.run_analysis(
             docking_input=temp_files,
@@ -87,6 +76,14 @@ async def analyze_docking_results(files: List[UploadFile] = File(...)):
             "pdbqt_files": result.get("pdbqt_files", {}),
         }
         
+        # Top-K ranking reports the size and distribution of the full screen
+        if result.get("ranking_summary"):
+            response["ranking_summary"] = result["ranking_summary"]
+        
+        # Steps that fell back to a default (e.g. ranking without a receptor)
+        if result.get("warnings"):
+            response["warnings"] = result["warnings"]
+        
         # Include errors if present
         if "errors" in result:
             response["errors"] = result["errors"]
@@ -100,22 +97,23 @@ async def analyze_docking_results(files: List[UploadFile] = File(...)):
             **response,
             "analysis_id": analysis_id,
             "metadata": {
-                "uploaded_files": [f.filename for f in files],
-                "file_count": len(files)
+                "uploaded_files": uploaded_files,
+                "file_count": len(uploaded_files)
             }
         }
         
         try:
             store.save_analysis(analysis_id, storage_data)
+            if result.get("parsed_docking_results"):
+                store.save_pose_store(analysis_id, result["parsed_docking_results"])
+            if result.get("interaction_fingerprints") is not None:
+                store.save_fingerprints(analysis_id, result["interaction_fingerprints"])
             response["analysis_id"] = analysis_id
         except Exception as e:
             # Don't fail the request if storage fails
             print(f"Warning: Failed to save analysis to storage: {e}")
         
         return response
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
     
     finally:
         # Cleanup temporary files
@@ -123,6 +121,194 @@ async def analyze_docking_results(files: List[UploadFile] = File(...)):
             shutil.rmtree(temp_dir)
 
 
+@router.post("/analyze", openapi_extra=ANALYZE_REQUEST_BODY)
+async def analyze_docking_results(request: Request, mode: str = Query("sync")):
+    """
+    Analyze docking results from uploaded files.
+    
+    Accepts multiple .pdbqt or .log files, or .zip/.tar.gz archives of
+    them, and runs the complete docking analysis pipeline. Archive
+    members are parsed straight out of the archive, never extracted. An optional receptor .pdbqt/.pdb file
+    enables interaction analysis of the best poses.
+    
+    The multipart body is streamed straight to a spool directory as it
+    arrives (never buffered whole in memory), with per-request and
+    per-file size limits (413) and files hashed while they are written.
+    
+    With ``mode=job`` the analysis is queued and a job id is returned
+    at once (202); poll ``GET /api/jobs/{job_id}`` for its stage and
+    result, or follow ``GET /api/jobs/{job_id}/events`` for live
+    progress. The default ``mode=sync`` waits for the result, running
+    the pipeline on a worker thread so other requests are still served.
+    """
+    if mode not in ("sync", "job"):
+        raise HTTPException(status_code=400, detail=f"Invalid mode: {mode}. Use 'sync' or 'job'.")
+    
+    # Refuse oversized requests before reading any of the body
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > config.upload_max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Upload exceeds the {config.upload_max_bytes // (1024 * 1024)} MB request limit"
+        )
+    
+    # Uploads are streamed to their own spool directory; extensions are
+    # validated from the part headers before anything is written
+    spool = UploadSpool(
+        allowed_extensions={"files": LIGAND_EXTENSIONS, "receptor": RECEPTOR_EXTENSIONS},
+        spool_dir=config.upload_spool_dir,
+        max_request_bytes=config.upload_max_bytes,
+        max_file_bytes=config.upload_max_file_bytes,
+        hash_files=config.upload_hash_files
+    )
+    # Once the pipeline owns the uploads it removes them itself
+    handed_off = False
+    
+    try:
+        try:
+            await spool.receive(request.headers.get("content-type", ""), request.stream())
+        except UploadError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        
+        files = spool.files_for("files")
+        if not files:
+            raise HTTPException(status_code=400, detail="No files provided")
+        
+        # Kept in its own folder so it never clashes with a ligand file name
+        receptors = spool.files_for("receptor")
+        receptor_path = receptors[0].path if receptors else None
+        
+        # Check for Groq API key
+        groq_api_key = config.groq_api_key
+        if not groq_api_key:
+            return {
+                "status": "failed",
+                "errors": ["GROQ_API_KEY not configured. LLM-based report generation unavailable."],
+                "ranked_ligands": [],
+                "interactions": {},
+                "visualizations": [],
+                "report": "",
+                "attestation": None,
+            }
+        
+        # Initialize orchestrator with Groq API key
+        enable_solana = os.getenv("ENABLE_SOLANA_ATTESTATION", "false").lower() == "true"
+        orchestrator = DockingAnalysisOrchestrator(
+            config=config,
+            groq_api_key=groq_api_key,
+            enable_solana=enable_solana,
+            parse_cache=get_parse_cache(),
+            receptor_file=receptor_path,
+            receptor_cache=get_receptor_cache(),
+            content_hashes=spool.content_hashes()
+        )
+        
+        pipeline = partial(
+            _run_pipeline, orchestrator, spool.directory, [f.path for f in files], [f.filename for f in files]
+        )
+        handed_off = True
+        
+        if mode == "job":
+            job = get_job_queue().submit(pipeline, orchestrator.state_machine)
+            return JSONResponse(status_code=202, content={
+                "job_id": job.job_id,
+                "status": job.status,
+                "stage": job.stage,
+                "status_url": f"/api/jobs/{job.job_id}",
+                "events_url": f"/api/jobs/{job.job_id}/events",
+            })
+        
+        return await run_in_threadpool(pipeline)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    
+    finally:
+        # Cleanup uploads the pipeline never received
+        if not handed_off:
+            spool.cleanup()
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Status of a queued analysis.
+    
+    Args:
+        job_id: Identifier returned by POST /api/analyze?mode=job
+    
+    Returns:
+        Job status, the pipeline stage it reached and, once finished,
+        the analysis response
+    """
+    job = get_job_queue().get(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job.to_dict()
+
+
+def _sse(event_id, event, data):
+    """Format one server-sent event."""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _job_event_stream(job, cursor, request):
+    """Yield a job's events from ``cursor`` on, then a final ``done`` event."""
+    while True:
+        # Read the status first: every event of a finished job is recorded
+        done = job.done
+        events = job.events[cursor:]
+        for event, data in events:
+            yield _sse(cursor, event, data)
+            cursor += 1
+        
+        if done:
+            yield _sse(cursor, "done", job.to_dict(include_result=False))
+            return
+        if await request.is_disconnected():
+            return
+        await asyncio.sleep(JOB_EVENT_POLL_SECONDS)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """
+    Server-sent event stream of a queued analysis.
+    
+    Events: ``stage`` (state machine transitions), ``parse_progress``
+    (files parsed so far), ``ranking`` (summary and top ligands, sent as
+    soon as ranking finishes), ``report_token`` (report text as it is
+    written), ``report_reset`` (the report text so far, replacing what was
+    received, when an interrupted LLM discussion is abandoned) and a final ``done`` with the job status. Reconnecting
+    clients resume after the ``Last-Event-ID`` they received.
+    
+    Args:
+        job_id: Identifier returned by POST /api/analyze?mode=job
+    
+    Returns:
+        text/event-stream response
+    """
+    job = get_job_queue().get(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    try:
+        cursor = int(request.headers.get("last-event-id", -1)) + 1
+    except ValueError:
+        cursor = 0
+    
+    return StreamingResponse(
+        _job_event_stream(job, max(cursor, 0), request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -204,12 +390,18 @@ async def list_analyses(
 
 
 @router.get("/analyses/{analysis_id}")
-async def get_analysis(analysis_id: str):
+async def get_analysis(
+    analysis_id: str,
+    max_affinity: Optional[float] = Query(None),
+    limit: Optional[int] = Query(None, ge=1)
+):
     """
     Retrieve a specific analysis by ID.
     
     Args:
         analysis_id: The analysis identifier
+        max_affinity: Only return ranked ligands with ΔG at or below this (kcal/mol)
+        limit: Maximum number of ranked ligands to return
     
     Returns:
         Complete analysis data
@@ -220,9 +412,150 @@ async def get_analysis(analysis_id: str):
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
+    if max_affinity is not None or limit is not None:
+        ranked_ligands = analysis.get("ranked_ligands", [])
+        analysis["ranked_ligands_total"] = len(ranked_ligands)
+        if max_affinity is not None:
+            ranked_ligands = LigandRanker().filter_by_threshold(ranked_ligands, max_affinity)
+        analysis["ranked_ligands"] = ranked_ligands[:limit] if limit else ranked_ligands
+    
     return analysis
 
 
+@router.get("/analyses/{analysis_id}/compare")
+async def compare_ligands(
+    analysis_id: str,
+    reference: str = Query(...),
+    candidates: Optional[str] = Query(None)
+):
+    """
+    Compare a reference ligand against other ligands of an analysis.
+    
+    Args:
+        analysis_id: The analysis identifier
+        reference: Name of the reference ligand
+        candidates: Comma-separated ligand names (default: all other ligands)
+    
+    Returns:
+        Reference ligand and per-candidate comparisons
+    """
+    store = get_store()
+    analysis = store.get_analysis(analysis_id)
+    
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    ligands_by_name = {l["ligand_name"]: l for l in analysis.get("ranked_ligands", [])}
+    
+    if reference not in ligands_by_name:
+        raise HTTPException(status_code=404, detail=f"Ligand not found: {reference}")
+    
+    if candidates:
+        names = candidates.split(',')
+        missing = [name for name in names if name not in ligands_by_name]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Ligand not found: {', '.join(missing)}")
+    else:
+        names = [name for name in ligands_by_name if name != reference]
+    
+    return LigandRanker().compare_ligands(
+        ligands_by_name[reference],
+        [ligands_by_name[name] for name in names]
+    )
+
+
+@router.get("/analyses/{analysis_id}/similar")
+async def find_similar_poses(
+    analysis_id: str,
+    ligand: str = Query(...),
+    limit: int = Query(10, ge=1, le=1000),
+    min_score: float = Query(0.0, ge=0.0, le=1.0)
+):
+    """
+    Find stored poses with interaction fingerprints similar to a ligand's best pose.
+    
+    Args:
+        analysis_id: Analysis holding the reference ligand
+        ligand: Name of the reference ligand
+        limit: Maximum number of hits
+        min_score: Minimum Tanimoto similarity
+    
+    Returns:
+        Reference and hits across all analyses on the same receptor
+    """
+    store = get_store()
+    
+    if not store.get_analysis(analysis_id):
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    hits = store.find_similar_poses(analysis_id, ligand, limit=limit, min_score=min_score)
+    if hits is None:
+        raise HTTPException(status_code=404, detail=f"No interaction fingerprint for ligand: {ligand}")
+    
+    return {
+        "reference": {"analysis_id": analysis_id, "ligand_name": ligand},
+        "hits": hits,
+        "count": len(hits)
+    }
+
+
+@router.post("/analyses/consensus")
+async def rank_consensus(request: dict):
+    """
+    Consensus ranking of ligands across stored analyses.
+
+    Each analysis is one run (e.g. the same library docked against another
+    receptor conformation); ligands are matched by name.
+
+    Args:
+        request: Dictionary with 'analysis_ids' (at least two), optional
+            'method' (mean_rank, min_rank, rank_product or z_score) and 'limit'
+
+    Returns:
+        Ligands ordered by consensus score, with per-run affinity and rank
+    """
+    analysis_ids = request.get("analysis_ids") or []
+    if len(set(analysis_ids)) < 2:
+        raise HTTPException(status_code=400, detail="At least two distinct analysis_ids are required")
+    limit = request.get("limit")
+    if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit < 1):
+        raise HTTPException(status_code=400, detail=f"Invalid limit: {limit!r}. Use a positive integer.")
+
+    store = get_store()
+    results_by_run = {}
+    for analysis_id in dict.fromkeys(analysis_ids):
+        reader = store.open_pose_store(analysis_id)
+        if reader is not None:
+            with reader:
+                results_by_run[analysis_id] = PoseTable.from_pose_store(reader, coordinates=False)
+            continue
+
+        # Older analyses without a pose store: best pose of each ligand
+        analysis = store.get_analysis(analysis_id)
+        if not analysis:
+            raise HTTPException(status_code=404, detail=f"Analysis not found: {analysis_id}")
+        results_by_run[analysis_id] = [
+            {
+                "ligand_name": ligand["ligand_name"],
+                "file_path": ligand.get("file_path"),
+                "poses": [{"pose_id": ligand.get("pose_id", 1), "binding_affinity": ligand["binding_affinity"]}],
+            }
+            for ligand in analysis.get("ranked_ligands", [])
+        ]
+
+    result = LigandRanker().rank_consensus(results_by_run, method=request.get("method", "rank_product"))
+    if result["errors"]:
+        raise HTTPException(status_code=400, detail="; ".join(result["errors"]))
+
+    ranked_ligands = result["ranked_ligands"]
+    return {
+        "method": result["method"],
+        "runs": result["runs"],
+        "ranked_ligands": ranked_ligands[:limit] if limit else ranked_ligands,
+        "ranked_ligands_total": len(ranked_ligands),
+    }
+
+
 @router.delete("/analyses/{analysis_id}")
 async def delete_analysis(analysis_id: str):
     """
@@ -0,0 +1,124 @@
+"""Benchmark: analysis history operations with 10^4 stored analyses, JSON vs SQLite."""
+
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.storage.analysis_store import AnalysisStore
+from backend.storage.sqlite_store import SQLiteAnalysisStore
+
+NUM_ANALYSES = 10_000
+# History sizes at which JSON store save and statistics times are compared
+SAVE_SCALES = (1_000, 100_000)
+TIMED_SAVES = 50
+PROJECTS = ["EGFR", "BRD4", "HSP90", "KRAS", ""]
+TAGS = ["kinase", "lead", "fragment", "retest", "covalent"]
+
+
+def make_analysis(idx):
+    """Small analysis with a few ranked ligands and rotating tags/projects."""
+    return {
+        "timestamp": f"2026-{1 + idx % 12:02d}-{1 + idx % 28:02d}T{idx % 24:02d}:00:{idx % 60:02d}.{idx:06d}",
+        "ranked_ligands": [
+            {"ligand_name": f"ZINC{idx:08d}_{rank}", "binding_affinity": -5.0 - (idx * 7 + rank) % 50 / 10}
+            for rank in range(3)
+        ],
+        "attestation": {"success": idx % 3 == 0, "transaction_signature": None},
+        "metadata": {"uploaded_files": [f"ZINC{idx:08d}.pdbqt"]},
+        "tags": [TAGS[idx % len(TAGS)]] if idx % 2 else [],
+        "project": PROJECTS[idx % len(PROJECTS)],
+    }
+
+
+def fill_json(store):
+    """Write the JSON store directly; saving one by one would take minutes."""
+    index = []
+    for idx in range(NUM_ANALYSES):
+        data = make_analysis(idx)
+        store._apply_defaults(data)
+        with open(store.storage_dir / f"bench_{idx}.json", "w") as f:
+            json.dump(data, f)
+        index.insert(0, store._build_index_entry(f"bench_{idx}", data))
+    store._save_index(index)
+
+
+def fill_sqlite(store):
+    conn = store._connect()
+    with conn:
+        for idx in range(NUM_ANALYSES):
+            data = make_analysis(idx)
+            store._apply_defaults(data)
+            store._write(f"bench_{idx}", data)
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<30} {elapsed * 1000:9.2f} ms")
+
+
+def main():
+    """Time History page queries and saves on a full store."""
+    print("=" * 60)
+    print("ANALYSIS STORE BENCHMARK")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_bench_")
+    try:
+        stores = {
+            "json": AnalysisStore(storage_dir=os.path.join(temp_dir, "json")),
+            "sqlite": SQLiteAnalysisStore(storage_dir=os.path.join(temp_dir, "sqlite")),
+        }
+        fill_json(stores["json"])
+        # Reopen so the index is loaded from the snapshot written directly
+        stores["json"] = AnalysisStore(storage_dir=os.path.join(temp_dir, "json"))
+        fill_sqlite(stores["sqlite"])
+
+        for name, store in stores.items():
+            print(f"\n{name} ({NUM_ANALYSES} analyses):")
+            timed("list first page", lambda: store.list_analyses(limit=50), repeat=20)
+            timed("list page 100", lambda: store.list_analyses(limit=50, offset=5000), repeat=20)
+            timed("filter project + tag", lambda: store.list_analyses(limit=50, tags=["lead"], project="brd4"),
+                  repeat=20)
+            timed("search", lambda: store.list_analyses(limit=50, search="ZINC00001"), repeat=20)
+            timed("statistics", store.get_statistics, repeat=20)
+            def save_next(store=store, new_ids=itertools.count(NUM_ANALYSES)):
+                idx = next(new_ids)
+                store.save_analysis(f"new_{idx}", make_analysis(idx))
+
+            timed("save", save_next, repeat=TIMED_SAVES)
+            timed("update metadata", lambda: store.update_metadata("bench_10", {"tags": ["lead"]}), repeat=20)
+
+        print("\njson save and statistics time by history size:")
+        for scale in SAVE_SCALES:
+            scale_dir = os.path.join(temp_dir, f"json_{scale}")
+            store = AnalysisStore(storage_dir=scale_dir)
+            entries = []
+            for idx in range(scale):
+                data = make_analysis(idx)
+                store._apply_defaults(data)
+                entries.append(store._build_index_entry(f"bench_{idx}", data))
+            store._save_index(entries[::-1])
+            store = AnalysisStore(storage_dir=scale_dir)
+
+            def save_next(store=store, new_ids=itertools.count(scale)):
+                idx = next(new_ids)
+                store.save_analysis(f"new_{idx}", make_analysis(idx))
+
+            timed(f"save at {scale} analyses", save_next, repeat=TIMED_SAVES)
+            timed(f"statistics at {scale} analyses", store.get_statistics, repeat=20)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: streaming Vina parser vs. the original read-all parser."""
+
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.tools.docking_parser import DockingParser
+
+
+def legacy_parse(file_path):
+    """Original implementation: f.read(), uncompiled regex, two passes."""
+    with open(file_path, "r") as f:
+        content = f.read()
+
+    poses = []
+    pattern = r"^\s+(\d+)\s+([-\d.]+)\s+([-\d.]+)\s+([-\d.]+)"
+    for line in content.split("\n"):
+        match = re.match(pattern, line)
+        if match:
+            poses.append({
+                "pose_id": int(match.group(1)),
+                "binding_affinity": float(match.group(2)),
+            })
+
+    if not poses:
+        pose_id = 0
+        pattern = r"REMARK VINA RESULT:\s+([-\d.]+)"
+        for line in content.split("\n"):
+            match = re.search(pattern, line)
+            if match:
+                pose_id += 1
+                poses.append({
+                    "pose_id": pose_id,
+                    "binding_affinity": float(match.group(1)),
+                })
+
+    return poses
+
+
+def write_mock_pdbqt(path, num_models, atoms_per_model):
+    """Write a synthetic multi-model PDBQT file."""
+    with open(path, "w") as f:
+        for model in range(1, num_models + 1):
+            f.write(f"MODEL {model}\n")
+            f.write(f"REMARK VINA RESULT:    {-12.0 + model * 0.001:.3f}      0.000      0.000\n")
+            f.write("REMARK  Name = benchmark_ligand\n")
+            for atom in range(1, atoms_per_model + 1):
+                f.write(
+                    f"ATOM  {atom:5d}  C   UNL     1    "
+                    f"{atom * 0.1:8.3f}{atom * 0.2:8.3f}{atom * 0.3:8.3f}"
+                    f"  1.00  0.00     0.000 C \n"
+                )
+            f.write("ENDMDL\n")
+
+
+def measure(label, func, *args):
+    """Time a call and record its peak traced memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<10} {elapsed:8.3f} s   peak {peak / 1e6:8.1f} MB")
+    return result
+
+
+def main():
+    """Run the parser benchmark over increasing file sizes."""
+    print("=" * 60)
+    print("DOCKING PARSER BENCHMARK")
+    print("=" * 60)
+
+    parser = DockingParser()
+
+    for num_models in (1_000, 10_000, 50_000):
+        fd, path = tempfile.mkstemp(suffix=".pdbqt")
+        os.close(fd)
+        try:
+            write_mock_pdbqt(path, num_models, atoms_per_model=30)
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"\n{num_models} models ({size_mb:.1f} MB)")
+
+            legacy = measure("legacy", legacy_parse, path)
+            streamed = measure("streaming", parser.parse_vina_output, path)
+            measure("+coords", parser.parse_vina_output, path, True)
+
+            streamed_scores = [
+                {"pose_id": p["pose_id"], "binding_affinity": p["binding_affinity"]}
+                for p in streamed["poses"]
+            ]
+            if streamed_scores == legacy:
+                print("  ✓ Outputs identical")
+            else:
+                print("  ✗ Outputs differ")
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
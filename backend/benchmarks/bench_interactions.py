@@ -0,0 +1,128 @@
+"""Benchmark: interaction analysis cost vs. receptor size and batching."""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.tools.interactions import InteractionAnalyzer, ReceptorIndex
+from backend.tools.pose_arrays import ATOM_TYPE_CODES
+
+# Roughly protein-like packing: one heavy atom per ~20 cubic Angstroms
+ATOMS_PER_CUBIC_ANGSTROM = 0.05
+LIGAND_ATOMS = 40
+POSES = 200
+
+RECEPTOR_TYPES = ("C", "C", "C", "N", "OA", "OA", "SA")
+RESIDUES = ("LEU", "VAL", "SER", "ASP", "LYS", "GLU", "PHE")
+LIGAND_TYPES = ("C", "C", "A", "N", "NA", "OA", "HD")
+
+
+def make_receptor(num_atoms, rng):
+    """Random receptor at constant density, so the box grows with size."""
+    side = (num_atoms / ATOMS_PER_CUBIC_ANGSTROM) ** (1 / 3)
+    residue_ids = np.arange(num_atoms) // 8
+    return ReceptorIndex(
+        coordinates=rng.uniform(0.0, side, (num_atoms, 3)),
+        atom_types=[RECEPTOR_TYPES[i % len(RECEPTOR_TYPES)] for i in range(num_atoms)],
+        charges=rng.uniform(-0.4, 0.4, num_atoms),
+        residue_names=[RESIDUES[r % len(RESIDUES)] for r in residue_ids],
+        residue_ids=residue_ids.tolist(),
+    ), side
+
+
+def make_poses(side, rng):
+    """Compact ligand poses placed at random points inside the receptor box."""
+    codes = np.array(
+        [ATOM_TYPE_CODES[LIGAND_TYPES[i % len(LIGAND_TYPES)]] for i in range(LIGAND_ATOMS)], dtype=np.uint8
+    )
+    poses = []
+    for pose_id in range(1, POSES + 1):
+        center = rng.uniform(5.0, side - 5.0, 3)
+        poses.append({
+            "ligand_name": "bench",
+            "pose_id": pose_id,
+            "coordinates": (center + rng.normal(0.0, 2.5, (LIGAND_ATOMS, 3))).astype(np.float32),
+            "atom_types": codes,
+            "charges": rng.uniform(-0.5, 0.5, LIGAND_ATOMS).astype(np.float32),
+        })
+    return poses
+
+
+def brute_force_pairs(receptor, coordinates):
+    """Reference: full ligand x receptor distance matrix."""
+    distances = np.linalg.norm(coordinates[:, None, :] - receptor.coordinates[None, :, :], axis=2)
+    return np.nonzero(distances <= 4.5)
+
+
+def stack(poses):
+    """Stack pose dicts into ragged arrays with offsets."""
+    offsets = np.zeros(len(poses) + 1, dtype=np.int64)
+    np.cumsum([len(p["coordinates"]) for p in poses], out=offsets[1:])
+    return (
+        np.concatenate([p["coordinates"] for p in poses]),
+        np.concatenate([p["atom_types"] for p in poses]),
+        np.concatenate([p["charges"] for p in poses]),
+        offsets,
+    )
+
+
+def bench_batching(rng):
+    """Per-pose dicts vs. one batched call over a 10k atom receptor."""
+    print(f"\n{'poses':>8} {'per-pose':>10} {'batched':>10} {'speedup':>8}")
+    receptor, side = make_receptor(10_000, rng)
+    analyzer = InteractionAnalyzer(receptor=receptor)
+
+    for num_batches in (1, 10, 50):
+        poses = [pose for _ in range(num_batches) for pose in make_poses(side, rng)]
+
+        start = time.perf_counter()
+        for pose in poses:
+            analyzer.analyze_pose(pose)
+        loop_time = time.perf_counter() - start
+
+        arrays = stack(poses)
+        start = time.perf_counter()
+        analyzer.analyze_poses(*arrays)
+        batch_time = time.perf_counter() - start
+
+        print(f"{len(poses):>8} {loop_time:9.3f}s {batch_time:9.3f}s {loop_time / batch_time:7.1f}x")
+
+
+def main():
+    """Time per-pose analysis for receptors of 1k to 100k atoms, then batching."""
+    print("=" * 60)
+    print("INTERACTION ANALYSIS BENCHMARK")
+    print("=" * 60)
+    print(f"\n{'atoms':>8} {'index':>9} {'kd-tree/pose':>14} {'brute/pose':>12}")
+
+    rng = np.random.default_rng(0)
+    for num_atoms in (1_000, 10_000, 100_000):
+        start = time.perf_counter()
+        receptor, side = make_receptor(num_atoms, rng)
+        index_time = time.perf_counter() - start
+
+        poses = make_poses(side, rng)
+        analyzer = InteractionAnalyzer(receptor=receptor)
+        start = time.perf_counter()
+        for pose in poses:
+            analyzer.analyze_pose(pose)
+        tree_time = (time.perf_counter() - start) / POSES
+
+        sample = poses[:20]
+        start = time.perf_counter()
+        for pose in sample:
+            brute_force_pairs(receptor, pose["coordinates"].astype(np.float64))
+        brute_time = (time.perf_counter() - start) / len(sample)
+
+        print(f"{num_atoms:>8} {index_time:8.3f}s {tree_time * 1e3:12.2f}ms {brute_time * 1e3:10.2f}ms")
+
+    bench_batching(rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: blocked pose RMSD clustering for large virtual screens."""
+
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.tools.pose_arrays import PoseArrays
+from backend.tools.pose_clustering import DEFAULT_BLOCK_LIGANDS, cluster_pose_table
+from backend.tools.ranking_engine import PoseTable, rank_pose_table
+
+POSES_PER_LIGAND = 20
+ATOMS_PER_POSE = 24
+
+
+def make_table(num_ligands, rng):
+    """PoseTable whose pose arrays are views into one coordinate block."""
+    num_poses = num_ligands * POSES_PER_LIGAND
+    atoms = ATOMS_PER_POSE * POSES_PER_LIGAND
+
+    # A few binding modes per ligand, jittered per pose
+    modes = rng.normal(0.0, 4.0, (num_ligands, POSES_PER_LIGAND, 1, 3)).astype(np.float32)
+    modes[:, 1::2] = modes[:, :1]
+    shape = rng.normal(0.0, 2.0, (num_ligands, 1, ATOMS_PER_POSE, 3)).astype(np.float32)
+    coordinates = (modes + shape).reshape(-1, 3)
+    del modes, shape
+
+    model_offsets = np.arange(0, atoms + 1, ATOMS_PER_POSE, dtype=np.int64)
+    empty = np.zeros(atoms, dtype=np.float32)
+    pose_arrays = [
+        PoseArrays(coordinates[idx * atoms:(idx + 1) * atoms], empty, empty, model_offsets)
+        for idx in range(num_ligands)
+    ]
+    names = [f"ZINC{idx:08d}" for idx in range(num_ligands)]
+    return PoseTable(
+        ligand_names=names,
+        file_paths=names,
+        pose_offsets=np.arange(0, num_poses + 1, POSES_PER_LIGAND, dtype=np.int64),
+        pose_ids=np.tile(np.arange(1, POSES_PER_LIGAND + 1, dtype=np.int64), num_ligands),
+        affinities=np.sort(rng.uniform(-12.0, -4.0, (num_ligands, POSES_PER_LIGAND)), axis=1).ravel(),
+        rmsd_lb=np.zeros(num_poses),
+        pose_arrays=pose_arrays,
+    )
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    """Cluster 20 poses for 10^3 to 10^5 ligands."""
+    print("=" * 60)
+    print("POSE CLUSTERING BENCHMARK")
+    print("=" * 60)
+
+    block_bytes = DEFAULT_BLOCK_LIGANDS * POSES_PER_LIGAND * (ATOMS_PER_POSE * 3 + 2 * POSES_PER_LIGAND) * 8
+    print(f"\n{POSES_PER_LIGAND} poses x {ATOMS_PER_POSE} atoms per ligand; "
+          f"RMSD block working set ~{block_bytes / 2**20:.0f} MB")
+    print(f"\n{'ligands':>8} {'cluster':>9} {'rank':>8} {'ligands/s':>11} {'peak RSS':>10}")
+
+    rng = np.random.default_rng(0)
+    for num_ligands in (1_000, 10_000, 100_000):
+        table = make_table(num_ligands, rng)
+
+        start = time.perf_counter()
+        clusters = cluster_pose_table(table)
+        cluster_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rank_pose_table(table, clusters)
+        rank_time = time.perf_counter() - start
+
+        print(f"{num_ligands:>8} {cluster_time:8.2f}s {rank_time:7.2f}s "
+              f"{num_ligands / cluster_time:11,.0f} {peak_rss_mb():8.0f}MB")
+        del table, clusters
+
+
+if __name__ == "__main__":
+    main()
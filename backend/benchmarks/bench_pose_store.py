@@ -0,0 +1,88 @@
+"""Benchmark: reloading parsed results from .dsp vs. indented JSON."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.storage.pose_store import PoseStoreReader, write_pose_store
+
+
+def make_parsed_results(num_ligands, poses_per_ligand):
+    """Build synthetic DockingParser output."""
+    rng = np.random.default_rng(0)
+    affinities = np.round(rng.uniform(-12.0, -4.0, num_ligands * poses_per_ligand), 1).tolist()
+    results = []
+    for lig in range(num_ligands):
+        base = lig * poses_per_ligand
+        results.append({
+            "ligand_name": f"ZINC{lig:08d}",
+            "file_path": f"/screen/ZINC{lig:08d}.pdbqt",
+            "poses": [
+                {
+                    "pose_id": pose + 1,
+                    "binding_affinity": affinities[base + pose],
+                    "rmsd_lb": float(pose),
+                    "rmsd_ub": float(pose) * 1.5,
+                }
+                for pose in range(poses_per_ligand)
+            ],
+            "num_poses": poses_per_ligand,
+        })
+    return results
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"  {label:<28} {time.perf_counter() - start:9.4f} s")
+    return result
+
+
+def main():
+    """Compare reload times for a 1M-pose screen."""
+    print("=" * 60)
+    print("POSE STORE BENCHMARK (100k ligands x 10 poses)")
+    print("=" * 60 + "\n")
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_bench_")
+    try:
+        results = make_parsed_results(100_000, 10)
+        json_path = os.path.join(temp_dir, "results.json")
+        dsp_path = os.path.join(temp_dir, "results.dsp")
+
+        def write_json():
+            with open(json_path, "w") as f:
+                json.dump(results, f, indent=2)
+
+        def load_json():
+            with open(json_path) as f:
+                return json.load(f)
+
+        def open_dsp():
+            reader = PoseStoreReader(dsp_path)
+            # Touch a column so the comparison includes a real read
+            best = float(reader.affinities.min())
+            reader.close()
+            return best
+
+        timed("write JSON", write_json)
+        timed("write .dsp", write_pose_store, dsp_path, results)
+        print(f"\n  JSON size {os.path.getsize(json_path) / 1e6:8.1f} MB")
+        print(f"  .dsp size {os.path.getsize(dsp_path) / 1e6:8.1f} MB\n")
+
+        timed("reload JSON", load_json)
+        timed("reload .dsp (mmap + min)", open_dsp)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
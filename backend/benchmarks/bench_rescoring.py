@@ -0,0 +1,64 @@
+"""Benchmark: Vina-like rescoring throughput vs. receptor size."""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.benchmarks.bench_interactions import LIGAND_ATOMS, LIGAND_TYPES, make_receptor
+from backend.tools.pose_arrays import ATOM_TYPE_CODES
+from backend.tools.rescoring import VinaRescorer
+
+POSES = 5_000
+
+
+def make_stacked_poses(side, rng):
+    """Stacked compact poses at random points inside the receptor box."""
+    centers = rng.uniform(5.0, side - 5.0, (POSES, 1, 3))
+    coordinates = (centers + rng.normal(0.0, 2.5, (POSES, LIGAND_ATOMS, 3))).reshape(-1, 3)
+    codes = np.array(
+        [ATOM_TYPE_CODES[LIGAND_TYPES[i % len(LIGAND_TYPES)]] for i in range(LIGAND_ATOMS)], dtype=np.uint8
+    )
+    return (
+        coordinates.astype(np.float32),
+        np.tile(codes, POSES),
+        rng.uniform(-0.5, 0.5, POSES * LIGAND_ATOMS).astype(np.float32),
+        np.arange(0, POSES * LIGAND_ATOMS + 1, LIGAND_ATOMS, dtype=np.int64),
+    )
+
+
+def main():
+    """Rescore 5k poses of 40 atoms against receptors of 1k to 100k atoms."""
+    print("=" * 60)
+    print("RESCORING BENCHMARK")
+    print("=" * 60)
+    print(f"\n{'atoms':>8} {'setup':>8} {'rescore':>9} {'poses/s':>9} {'reweight':>10}")
+
+    rng = np.random.default_rng(0)
+    for num_atoms in (1_000, 10_000, 100_000):
+        receptor, side = make_receptor(num_atoms, rng)
+        arrays = make_stacked_poses(side, rng)
+
+        start = time.perf_counter()
+        rescorer = VinaRescorer(receptor)
+        setup_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        terms = rescorer.term_sums(*arrays)
+        rescore_time = time.perf_counter() - start
+
+        # Trying other weights reuses the per-pose term sums
+        start = time.perf_counter()
+        terms @ rescorer.weight_vector
+        reweight_time = time.perf_counter() - start
+
+        print(f"{num_atoms:>8} {setup_time:7.3f}s {rescore_time:8.3f}s {POSES / rescore_time:9,.0f} "
+              f"{reweight_time * 1e3:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,114 @@ class Config:
         """Get Solana network (mainnet/devnet/testnet)."""
         return os.getenv("SOLANA_NETWORK", "devnet")
 
+    @property
+    def parse_workers(self):
+        """Get number of worker processes used to parse docking files."""
+        return int(os.getenv("DOCKSIGHT_PARSE_WORKERS", "1"))
+
+    @property
+    def parse_chunksize(self):
+        """Get number of files submitted to a parse worker per task."""
+        return int(os.getenv("DOCKSIGHT_PARSE_CHUNKSIZE", "0"))
+
+    @property
+    def parse_cache_dir(self):
+        """Get directory for the on-disk parse cache."""
+        return os.getenv("DOCKSIGHT_PARSE_CACHE_DIR", "outputs/parse_cache")
+
+    @property
+    def parse_cache_max_bytes(self):
+        """Get size budget of the on-disk parse cache in bytes."""
+        return int(os.getenv("DOCKSIGHT_PARSE_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+    @property
+    def parse_cache_memory_bytes(self):
+        """Get size budget of the in-memory parse cache tier in bytes."""
+        return int(os.getenv("DOCKSIGHT_PARSE_CACHE_MEMORY_MB", "256")) * 1024 * 1024
+
+    @property
+    def receptor_cache_dir(self):
+        """Get directory for prepared receptor indexes."""
+        return os.getenv("DOCKSIGHT_RECEPTOR_CACHE_DIR", "outputs/receptor_cache")
+
+    @property
+    def receptor_cache_max_bytes(self):
+        """Get size budget of the on-disk receptor cache in bytes."""
+        return int(os.getenv("DOCKSIGHT_RECEPTOR_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+    @property
+    def ranking_top_k(self):
+        """Get number of ligands kept by ranking (0 keeps all)."""
+        return int(os.getenv("DOCKSIGHT_RANKING_TOP_K", "0"))
+
+    @property
+    def cluster_rmsd(self):
+        """Get RMSD cutoff (Angstroms) used to cluster poses of a ligand."""
+        return float(os.getenv("DOCKSIGHT_CLUSTER_RMSD", "2.0"))
+
+    @property
+    def ranking_key(self):
+        """Get value ligands are ranked by (binding_affinity, rescored_affinity or pareto)."""
+        return os.getenv("DOCKSIGHT_RANKING_KEY", "binding_affinity")
+
+    @property
+    def pareto_objectives(self):
+        """Get objectives of the Pareto ranking mode."""
+        value = os.getenv(
+            "DOCKSIGHT_PARETO_OBJECTIVES", "binding_affinity,ligand_efficiency,cluster_size,interaction_count"
+        )
+        return tuple(name.strip() for name in value.split(",") if name.strip())
+
+    @property
+    def rescoring_weights(self):
+        """Get Vina term weight overrides such as "gauss1=-0.03,repulsion=0.9"."""
+        return os.getenv("DOCKSIGHT_RESCORING_WEIGHTS", "")
+
+    @property
+    def job_workers(self):
+        """Get number of worker threads running queued analyses."""
+        return int(os.getenv("DOCKSIGHT_JOB_WORKERS", "2"))
+
+    @property
+    def job_history(self):
+        """Get number of finished jobs kept for status polling."""
+        return int(os.getenv("DOCKSIGHT_JOB_HISTORY", "100"))
+
+    @property
+    def upload_spool_dir(self):
+        """Get directory uploads are streamed to (empty uses the system temp dir)."""
+        return os.getenv("DOCKSIGHT_UPLOAD_SPOOL_DIR", "")
+
+    @property
+    def upload_max_bytes(self):
+        """Get size limit of one upload request in bytes."""
+        return int(os.getenv("DOCKSIGHT_UPLOAD_MAX_MB", "4096")) * 1024 * 1024
+
+    @property
+    def upload_max_file_bytes(self):
+        """Get size limit of one uploaded file in bytes."""
+        return int(os.getenv("DOCKSIGHT_UPLOAD_MAX_FILE_MB", "1024")) * 1024 * 1024
+
+    @property
+    def upload_hash_files(self):
+        """Get whether uploads are hashed while they are written."""
+        return os.getenv("DOCKSIGHT_UPLOAD_HASH", "true").lower() == "true"
+
+    @property
+    def storage_backend(self):
+        """Get analysis storage backend: "json" (files) or "sqlite"."""
+        return os.getenv("DOCKSIGHT_STORAGE_BACKEND", "json").lower()
+
+    @property
+    def index_compact_records(self):
+        """Get journal records after which the JSON index is compacted."""
+        return int(os.getenv("DOCKSIGHT_INDEX_COMPACT_RECORDS", "10000"))
+
+    @property
+    def analysis_cache_max_bytes(self):
+        """Get memory budget of the JSON store's cache of full analyses in bytes."""
+        return int(os.getenv("DOCKSIGHT_ANALYSIS_CACHE_MB", "64")) * 1024 * 1024
+
     def validate(self):
         """Validate that required configuration is present."""
         errors = []
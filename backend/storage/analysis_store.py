@@ -2,39 +2,457 @@
 Analysis storage using JSON files for persistence.
 Stores all analysis results for historical access.
 """
+import heapq
+import itertools
 import json
 import os
+import shutil
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Optional
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, run a single worker
+    fcntl = None
+
+from backend.storage.pose_store import PoseStoreReader, write_pose_store
+from backend.tools.fingerprints import FingerprintSet, search_fingerprint_sets
+
+
+# Journal records written before the index is compacted into a new snapshot
+DEFAULT_COMPACT_AFTER = 10_000
+# Memory budget for full analyses kept by get_analysis (JSON file bytes)
+DEFAULT_ANALYSIS_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def _stat(path: Path):
+    """(inode, mtime, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+@contextmanager
+def _atomic_path(path: Path):
+    """
+    Yield a temporary sibling of ``path`` to write, then rename it into place.
+    
+    Readers see the old file or the new one, never a partial write, and a
+    crash mid-write leaves the old file intact.
+    """
+    # Same suffix, since some writers (np.savez) add their own
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp{path.suffix}")
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def _write_json(path: Path, data, indent: Optional[int] = None):
+    """Write JSON atomically and durably (fsync before the rename)."""
+    with _atomic_path(path) as temp_path:
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class IndexStatistics:
+    """
+    Aggregates behind ``get_statistics``, kept up to date entry by entry.
+    
+    Totals are counters and tags and projects are multisets, so adding or
+    removing an index entry costs O(tags). The best candidate comes from a
+    heap ordered by affinity, then recency; removed or replaced entries
+    stay in the heap and are popped once they reach the top.
+    """
+    
+    def __init__(self, entries=()):
+        self.analyses = 0
+        self.ligands = 0
+        self.verified = 0
+        self.tags = Counter()
+        self.projects = Counter()
+        # analysis_id -> (current entry, position); later positions are more recent
+        self._live = {}
+        self._positions = itertools.count()
+        # (affinity, -position, push order, entry); push order keeps dicts from being compared
+        self._best = []
+        self._pushes = itertools.count()
+        # Oldest first, like the store's view
+        for entry in entries:
+            self.add(entry)
+    
+    def add(self, entry: Dict, position: Optional[int] = None):
+        """Count a new index entry, as the most recent unless ``position`` is given."""
+        if position is None:
+            position = next(self._positions)
+        self._live[entry['analysis_id']] = (entry, position)
+        self.analyses += 1
+        self.ligands += entry['ligand_count']
+        if entry['attestation']['verified']:
+            self.verified += 1
+        self.tags.update(entry.get('tags', []))
+        if entry.get('project'):
+            self.projects[entry['project']] += 1
+        
+        # 0.0 counts as no affinity, as it always has
+        if entry['top_candidate'] and entry['top_candidate']['affinity']:
+            heapq.heappush(
+                self._best,
+                (float(entry['top_candidate']['affinity']), -position, next(self._pushes), entry)
+            )
+    
+    def remove(self, entry: Dict) -> int:
+        """Uncount an index entry; returns its position."""
+        _, position = self._live.pop(entry['analysis_id'])
+        self.analyses -= 1
+        self.ligands -= entry['ligand_count']
+        if entry['attestation']['verified']:
+            self.verified -= 1
+        for tag in entry.get('tags', []):
+            self._discard(self.tags, tag)
+        if entry.get('project'):
+            self._discard(self.projects, entry['project'])
+        
+        # Drop stale heap items once they outnumber the live ones
+        if len(self._best) > 2 * len(self._live) + 64:
+            self._best = [item for item in self._best if self._is_live(item[3])]
+            heapq.heapify(self._best)
+        return position
+    
+    def replace(self, old: Dict, new: Dict):
+        """Recount an entry whose metadata changed, keeping its position."""
+        self.add(new, self.remove(old))
+    
+    @staticmethod
+    def _discard(counter: Counter, key):
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+    
+    def _is_live(self, entry: Dict) -> bool:
+        live = self._live.get(entry['analysis_id'])
+        return live is not None and live[0] is entry
+    
+    def best_candidate(self) -> Optional[Dict]:
+        """Top candidate with the lowest affinity, the most recent on ties."""
+        while self._best:
+            entry = self._best[0][3]
+            if self._is_live(entry):
+                return {
+                    'name': entry['top_candidate']['name'],
+                    'affinity': entry['top_candidate']['affinity'],
+                    'analysis_id': entry['analysis_id'],
+                    'timestamp': entry['timestamp']
+                }
+            heapq.heappop(self._best)
+        return None
+
 
 class AnalysisStore:
-    """Manages persistent storage of analysis results."""
+    """
+    Manages persistent storage of analysis results.
+    
+    The index is an ``index.json`` snapshot plus an append-only journal of
+    the changes since (one JSON record per line), so saves, deletes and
+    metadata updates append one line instead of rewriting the index. The
+    index is served from memory, rebuilt at startup by replaying the
+    journal over the snapshot, and compacted into a new snapshot in the
+    background every ``compact_after`` records.
+    
+    Several processes (e.g. uvicorn workers) can share a storage directory.
+    Index changes are made under an exclusive ``flock`` on ``index.lock``
+    and reads under a shared one; each process catches up on the others'
+    changes by reading the journal past the point it has seen. Analysis
+    files are written to a temporary file and renamed into place.
+    
+    Reads are served from memory: the listed index is rebuilt only when the
+    view changes, and recently read analyses sit in an LRU bounded by
+    ``analysis_cache_bytes``. A cached analysis is valid while its index
+    entry is the one it was read with; every save, update or delete,
+    from any process, replaces or drops that entry.
+    """
     
-    def __init__(self, storage_dir: str = "outputs/analyses"):
+    def __init__(
+        self,
+        storage_dir: str = "outputs/analyses",
+        compact_after: int = DEFAULT_COMPACT_AFTER,
+        analysis_cache_bytes: int = DEFAULT_ANALYSIS_CACHE_BYTES
+    ):
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self.index_file = self.storage_dir / "index.json"
+        self.journal_file = self.storage_dir / "index.journal.jsonl"
+        # Journal being folded into a snapshot; replayed too until it is
+        self.compacting_file = self.storage_dir / "index.journal.compacting.jsonl"
+        self.lock_file = self.storage_dir / "index.lock"
+        # Held for the whole of a compaction, so a dead one can be told from a running one
+        self.compaction_lock_file = self.storage_dir / "index.compaction.lock"
+        self.compact_after = max(1, compact_after)
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        # analysis_id -> index entry, oldest first
+        self._entries = OrderedDict()
+        self._statistics = IndexStatistics()
+        self._journal_records = 0
+        # Journal bytes applied to the view, and the on-disk state it reflects
+        self._journal_offset = 0
+        self._disk_state = None
+        self._compaction = None
+        # Bumped on every change to the view; the listed index is rebuilt when it moves
+        self._generation = 0
+        self._index_cache = (-1, [])
+        # analysis_id -> (index entry it was read with, analysis, size in bytes), least recent first
+        self.analysis_cache_bytes = analysis_cache_bytes
+        self._analyses = OrderedDict()
+        self._analyses_bytes = 0
         self._ensure_index()
     
     def _ensure_index(self):
-        """Ensure index file exists."""
-        if not self.index_file.exists():
-            self._save_index([])
+        """Ensure index file exists and load the index into memory."""
+        with self._locked(exclusive=True):
+            if not self.index_file.exists():
+                self._save_index([])
+            if self.compacting_file.exists():
+                # Left by a compaction that died (or one still running elsewhere)
+                self._start_compaction()
     
-    def _load_index(self) -> List[Dict]:
-        """Load the analysis index."""
+    @contextmanager
+    def _locked(self, exclusive: bool = False):
+        """
+        Hold the index lock, with the in-memory index brought up to date.
+        
+        Nested use keeps the outermost lock; do not nest an exclusive
+        section inside a shared one.
+        """
+        with self._lock:
+            outermost = self._lock_depth == 0
+            fd = None
+            if outermost:
+                # Opened per use so forked workers never share the lock
+                fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._lock_depth += 1
+            try:
+                if outermost:
+                    self._refresh()
+                yield
+            finally:
+                self._lock_depth -= 1
+                if fd is not None:
+                    os.close(fd)
+    
+    def _current_disk_state(self):
+        """Snapshot and rotated-journal identity; a change means a compaction happened."""
+        return _stat(self.index_file), _stat(self.compacting_file)
+    
+    def _refresh(self):
+        """Apply index changes made by other processes (lock held)."""
+        disk_state = self._current_disk_state()
+        if disk_state != self._disk_state:
+            self._disk_state = disk_state
+            self._entries, self._journal_records, self._journal_offset = self._load_view()
+            self._statistics = IndexStatistics(self._entries.values())
+            self._generation += 1
+            # Every entry was replaced, so no cached analysis can be valid
+            self._analyses.clear()
+            self._analyses_bytes = 0
+            return
+        
+        journal_stat = _stat(self.journal_file)
+        if journal_stat is None or journal_stat[2] <= self._journal_offset:
+            return
+        with open(self.journal_file, 'rb') as f:
+            f.seek(self._journal_offset)
+            data = f.read()
+        # Only whole lines; a line without its newline is a torn append
+        end = data.rfind(b"\n") + 1
+        self._journal_records += self._replay(self._entries, data[:end], self._statistics)
+        self._journal_offset += end
+        self._generation += 1
+    
+    def _load_view(self):
+        """
+        Replay the journals over the snapshot.
+        
+        Returns:
+            (OrderedDict of analysis_id -> entry, oldest first; journal
+            record count; bytes of the current journal applied)
+        """
+        entries = OrderedDict()
         try:
             with open(self.index_file, 'r') as f:
-                return json.load(f)
+                snapshot = json.load(f)
         except Exception:
-            return []
+            snapshot = []
+        # The snapshot lists the most recent first
+        for entry in reversed(snapshot):
+            entries[entry['analysis_id']] = entry
+        
+        records = 0
+        offset = 0
+        for journal_file in (self.compacting_file, self.journal_file):
+            try:
+                with open(journal_file, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            end = data.rfind(b"\n") + 1
+            records += self._replay(entries, data[:end])
+            if journal_file == self.journal_file:
+                offset = end
+        return entries, records, offset
+    
+    @classmethod
+    def _replay(cls, entries: OrderedDict, data: bytes, statistics: Optional[IndexStatistics] = None) -> int:
+        """Apply journal lines to an in-memory index (and its statistics); returns records applied."""
+        records = 0
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn line of an append cut short by a crash
+                continue
+            cls._apply(entries, record, statistics)
+            records += 1
+        return records
+    
+    @staticmethod
+    def _apply(entries: OrderedDict, record: Dict, statistics: Optional[IndexStatistics] = None):
+        """Apply one journal record to an in-memory index (and its statistics)."""
+        if record['op'] == 'save':
+            entry = record['entry']
+            # Re-saved analyses move to the most recent position
+            old = entries.pop(entry['analysis_id'], None)
+            entries[entry['analysis_id']] = entry
+            if statistics is not None:
+                if old is not None:
+                    statistics.remove(old)
+                statistics.add(entry)
+        elif record['op'] == 'delete':
+            old = entries.pop(record['analysis_id'], None)
+            if statistics is not None and old is not None:
+                statistics.remove(old)
+        elif record['op'] == 'update':
+            entry = entries.get(record['analysis_id'])
+            if entry is not None:
+                # Replaced rather than mutated so snapshots being written stay fixed
+                updated = {**entry, **record['fields']}
+                entries[record['analysis_id']] = updated
+                if statistics is not None:
+                    statistics.replace(entry, updated)
+    
+    def _drop_torn_tail(self):
+        """Cut off a torn last journal line so appends start on a fresh line (exclusive lock held)."""
+        journal_stat = _stat(self.journal_file)
+        if journal_stat is not None and journal_stat[2] > self._journal_offset:
+            os.truncate(self.journal_file, self._journal_offset)
+    
+    def _journal(self, record: Dict):
+        """Append one index change to the journal and apply it in memory (exclusive lock held)."""
+        self._drop_torn_tail()
+        line = (json.dumps(record) + "\n").encode()
+        with open(self.journal_file, 'ab') as f:
+            f.write(line)
+        self._journal_offset += len(line)
+        self._apply(self._entries, record, self._statistics)
+        self._journal_records += 1
+        self._generation += 1
+        if self._journal_records >= self.compact_after:
+            self._start_compaction()
+    
+    def _start_compaction(self):
+        """Rotate the journal and snapshot the index in the background (exclusive lock held)."""
+        if self._compaction is not None:
+            return
+        compaction_fd = os.open(self.compaction_lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(compaction_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Another process is compacting
+                os.close(compaction_fd)
+                return
+        
+        self._drop_torn_tail()
+        if self.compacting_file.exists():
+            # A compaction died; the newer records follow its rotated journal
+            if self.journal_file.exists():
+                with open(self.journal_file, 'rb') as src, open(self.compacting_file, 'ab') as dst:
+                    shutil.copyfileobj(src, dst)
+                self.journal_file.unlink()
+        elif self.journal_file.exists():
+            os.replace(self.journal_file, self.compacting_file)
+        else:
+            os.close(compaction_fd)
+            return
+        
+        snapshot = list(reversed(self._entries.values()))
+        self._journal_records = 0
+        self._journal_offset = 0
+        # The view already holds everything rotated; no reload needed
+        self._disk_state = self._current_disk_state()
+        self._compaction = threading.Thread(
+            target=self._compact, args=(snapshot, compaction_fd), name="docksight-index-compaction"
+        )
+        self._compaction.start()
+    
+    def _compact(self, snapshot: List[Dict], compaction_fd: int):
+        """Write a snapshot covering the rotated journal, then drop that journal."""
+        try:
+            # The slow part runs without the index lock
+            temp_file = self.index_file.with_name(f".{self.index_file.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                with open(temp_file, 'w') as f:
+                    json.dump(snapshot, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                with self._locked(exclusive=True):
+                    os.replace(temp_file, self.index_file)
+                    self.compacting_file.unlink()
+                    self._disk_state = self._current_disk_state()
+            finally:
+                if temp_file.exists():
+                    temp_file.unlink()
+        except Exception as e:
+            print(f"Warning: Index compaction failed: {e}")
+        finally:
+            os.close(compaction_fd)
+            with self._lock:
+                self._compaction = None
+    
+    def compact(self):
+        """Compact the journal into the snapshot now and wait for it."""
+        with self._locked(exclusive=True):
+            if self._journal_records:
+                self._start_compaction()
+            compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+    
+    def _load_index(self) -> List[Dict]:
+        """The analysis index, most recent first (shared between calls; do not modify)."""
+        with self._locked():
+            generation, index = self._index_cache
+            if generation != self._generation:
+                index = list(reversed(self._entries.values()))
+                self._index_cache = (self._generation, index)
+            return index
     
     def _save_index(self, index: List[Dict]):
-        """Save the analysis index."""
-        with open(self.index_file, 'w') as f:
-            json.dump(index, f, indent=2)
+        """Write an index snapshot, replacing the old one in a single rename."""
+        _write_json(self.index_file, index)
     
     def save_analysis(self, analysis_id: str, data: Dict) -> Dict:
         """
@@ -47,6 +465,21 @@ class AnalysisStore:
         Returns:
             Metadata about the saved analysis
         """
+        self._apply_defaults(data)
+        
+        # Save full analysis data (outside the index lock, so saves run in parallel)
+        _write_json(self.storage_dir / f"{analysis_id}.json", data, indent=2)
+        
+        index_entry = self._build_index_entry(analysis_id, data)
+        
+        # Update index (replaces any existing entry, now the most recent)
+        with self._locked(exclusive=True):
+            self._journal({'op': 'save', 'entry': index_entry})
+        
+        return index_entry
+    
+    def _apply_defaults(self, data: Dict):
+        """Fill in the timestamp and empty tags, notes and project."""
         # Add timestamp if not present
         if 'timestamp' not in data:
             data['timestamp'] = datetime.utcnow().isoformat()
@@ -58,13 +491,9 @@ class AnalysisStore:
             data['notes'] = ''
         if 'project' not in data:
             data['project'] = ''
-        
-        # Save full analysis data
-        analysis_file = self.storage_dir / f"{analysis_id}.json"
-        with open(analysis_file, 'w') as f:
-            json.dump(data, f, indent=2)
-        
-        # Create index entry
+    
+    def _build_index_entry(self, analysis_id: str, data: Dict) -> Dict:
+        """Metadata entry listed for an analysis."""
         ranked_ligands = data.get('ranked_ligands', [])
         top_candidate = ranked_ligands[0] if ranked_ligands else None
         
@@ -90,14 +519,6 @@ class AnalysisStore:
             'notes': data.get('notes', '')
         }
         
-        # Update index
-        index = self._load_index()
-        # Remove existing entry if present
-        index = [e for e in index if e['analysis_id'] != analysis_id]
-        # Add new entry at the beginning (most recent first)
-        index.insert(0, index_entry)
-        self._save_index(index)
-        
         return index_entry
     
     def get_analysis(self, analysis_id: str) -> Optional[Dict]:
@@ -108,17 +529,151 @@ class AnalysisStore:
             analysis_id: The analysis identifier
         
         Returns:
-            Complete analysis data or None if not found
+            Complete analysis data or None if not found. Cached analyses
+            are returned as a shallow copy; treat nested values as read-only.
         """
+        with self._locked():
+            entry = self._entries.get(analysis_id)
+            cached = self._analyses.get(analysis_id)
+            if cached is not None and cached[0] is entry:
+                self._analyses.move_to_end(analysis_id)
+                return dict(cached[1])
+        
         analysis_file = self.storage_dir / f"{analysis_id}.json"
         if not analysis_file.exists():
             return None
         
         try:
-            with open(analysis_file, 'r') as f:
-                return json.load(f)
+            with open(analysis_file, 'rb') as f:
+                raw = f.read()
+            analysis = json.loads(raw)
         except Exception:
             return None
+        
+        if entry is not None:
+            with self._lock:
+                self._remember_analysis(analysis_id, entry, dict(analysis), len(raw))
+        return analysis
+    
+    def _remember_analysis(self, analysis_id: str, entry: Dict, analysis: Dict, size: int):
+        """Insert into the analysis LRU, evicting the least recently used."""
+        cached = self._analyses.pop(analysis_id, None)
+        if cached is not None:
+            self._analyses_bytes -= cached[2]
+        if size > self.analysis_cache_bytes:
+            return
+        self._analyses[analysis_id] = (entry, analysis, size)
+        self._analyses_bytes += size
+        while self._analyses_bytes > self.analysis_cache_bytes:
+            _, (_, _, evicted_size) = self._analyses.popitem(last=False)
+            self._analyses_bytes -= evicted_size
+    
+    def save_pose_store(self, analysis_id: str, parsed_results: List[Dict]) -> Dict:
+        """
+        Save parsed docking results in the binary pose store format.
+        
+        Args:
+            analysis_id: The analysis identifier
+            parsed_results: DockingParser outputs for the analysis
+        
+        Returns:
+            Summary with ligand, pose and atom counts
+        """
+        with _atomic_path(self.storage_dir / f"{analysis_id}.dsp") as temp_path:
+            return write_pose_store(str(temp_path), parsed_results)
+    
+    def open_pose_store(self, analysis_id: str) -> Optional[PoseStoreReader]:
+        """
+        Memory-map the pose store of an analysis.
+        
+        Args:
+            analysis_id: The analysis identifier
+        
+        Returns:
+            PoseStoreReader (caller closes it) or None if not found
+        """
+        pose_store_file = self.storage_dir / f"{analysis_id}.dsp"
+        if not pose_store_file.exists():
+            return None
+        
+        try:
+            return PoseStoreReader(str(pose_store_file))
+        except Exception:
+            return None
+    
+    def save_fingerprints(self, analysis_id: str, fingerprints: FingerprintSet):
+        """
+        Save the interaction fingerprints of an analysis.
+        
+        Args:
+            analysis_id: The analysis identifier
+            fingerprints: FingerprintSet of the analysis' best poses
+        """
+        with _atomic_path(self.storage_dir / f"{analysis_id}.ifp.npz") as temp_path:
+            fingerprints.save(str(temp_path))
+    
+    def load_fingerprints(self, analysis_id: str) -> Optional[FingerprintSet]:
+        """
+        Load the interaction fingerprints of an analysis.
+        
+        Args:
+            analysis_id: The analysis identifier
+        
+        Returns:
+            FingerprintSet or None if the analysis has none
+        """
+        fingerprint_file = self.storage_dir / f"{analysis_id}.ifp.npz"
+        if not fingerprint_file.exists():
+            return None
+        
+        try:
+            return FingerprintSet.load(str(fingerprint_file))
+        except Exception:
+            return None
+    
+    def find_similar_poses(
+        self,
+        analysis_id: str,
+        ligand_name: str,
+        limit: int = 10,
+        min_score: float = 0.0
+    ) -> Optional[List[Dict]]:
+        """
+        Find the stored best poses most similar to a reference pose.
+        
+        Searches every stored analysis whose fingerprints share the
+        reference's residue layout (i.e. the same receptor). The reference
+        itself is not among the hits.
+        
+        Args:
+            analysis_id: Analysis holding the reference ligand
+            ligand_name: Reference ligand
+            limit: Maximum number of hits
+            min_score: Minimum Tanimoto similarity
+        
+        Returns:
+            Hits sorted by Tanimoto score, or None if the reference has no fingerprint
+        """
+        reference = self.load_fingerprints(analysis_id)
+        query = reference.fingerprint(ligand_name) if reference else None
+        if query is None:
+            return None
+        
+        fingerprint_sets = (
+            (aid, self.load_fingerprints(aid)) for aid in self._analysis_ids()
+        )
+        return search_fingerprint_sets(
+            query,
+            reference.vocabulary_key,
+            ((aid, fps) for aid, fps in fingerprint_sets if fps is not None),
+            limit=limit,
+            min_score=min_score,
+            exclude=(analysis_id, ligand_name)
+        )
+    
+    def _analysis_ids(self) -> List[str]:
+        """IDs of all stored analyses, most recent first."""
+        return [entry['analysis_id'] for entry in self._load_index()]
     
     def list_analyses(
         self, 
@@ -187,19 +742,29 @@ class AnalysisStore:
         """
         analysis_file = self.storage_dir / f"{analysis_id}.json"
         
-        if not analysis_file.exists():
-            return False
-        
-        # Remove file
-        analysis_file.unlink()
-        
-        # Update index
-        index = self._load_index()
-        index = [e for e in index if e['analysis_id'] != analysis_id]
-        self._save_index(index)
+        with self._locked(exclusive=True):
+            if not analysis_file.exists():
+                return False
+            
+            # Remove file
+            analysis_file.unlink()
+            self._delete_sidecars(analysis_id)
+            
+            # Update index
+            self._journal({'op': 'delete', 'analysis_id': analysis_id})
+            cached = self._analyses.pop(analysis_id, None)
+            if cached is not None:
+                self._analyses_bytes -= cached[2]
         
         return True
     
+    def _delete_sidecars(self, analysis_id: str):
+        """Remove the pose store and fingerprints of an analysis."""
+        for suffix in (".dsp", ".ifp.npz"):
+            sidecar_file = self.storage_dir / f"{analysis_id}{suffix}"
+            if sidecar_file.exists():
+                sidecar_file.unlink()
+    
     def update_metadata(self, analysis_id: str, updates: Dict) -> bool:
         """
         Update analysis metadata (tags, project, notes).
@@ -211,55 +776,38 @@ class AnalysisStore:
         Returns:
             True if updated, False if not found
         """
-        # Load full analysis
-        analysis = self.get_analysis(analysis_id)
-        if not analysis:
-            return False
-        
-        # Update fields
-        if 'tags' in updates:
-            analysis['tags'] = updates['tags']
-        if 'project' in updates:
-            analysis['project'] = updates['project']
-        if 'notes' in updates:
-            analysis['notes'] = updates['notes']
-        
-        # Save back
-        analysis_file = self.storage_dir / f"{analysis_id}.json"
-        with open(analysis_file, 'w') as f:
-            json.dump(analysis, f, indent=2)
-        
-        # Update index
-        index = self._load_index()
-        for entry in index:
-            if entry['analysis_id'] == analysis_id:
-                if 'tags' in updates:
-                    entry['tags'] = updates['tags']
-                if 'project' in updates:
-                    entry['project'] = updates['project']
-                if 'notes' in updates:
-                    entry['notes'] = updates['notes']
-                break
-        
-        self._save_index(index)
+        # Held across read-modify-write so concurrent updates are not lost
+        with self._locked(exclusive=True):
+            # Load full analysis
+            analysis = self.get_analysis(analysis_id)
+            if not analysis:
+                return False
+            
+            # Update fields
+            if 'tags' in updates:
+                analysis['tags'] = updates['tags']
+            if 'project' in updates:
+                analysis['project'] = updates['project']
+            if 'notes' in updates:
+                analysis['notes'] = updates['notes']
+            
+            # Save back
+            _write_json(self.storage_dir / f"{analysis_id}.json", analysis, indent=2)
+            
+            # Update index
+            fields = {field: updates[field] for field in ('tags', 'project', 'notes') if field in updates}
+            self._journal({'op': 'update', 'analysis_id': analysis_id, 'fields': fields})
         return True
     
     def get_all_tags(self) -> List[str]:
         """Get all unique tags across all analyses."""
-        index = self._load_index()
-        all_tags = set()
-        for entry in index:
-            all_tags.update(entry.get('tags', []))
-        return sorted(list(all_tags))
+        with self._locked():
+            return sorted(self._statistics.tags)
     
     def get_all_projects(self) -> List[str]:
         """Get all unique project names."""
-        index = self._load_index()
-        projects = set()
-        for entry in index:
-            if entry.get('project'):
-                projects.add(entry['project'])
-        return sorted(list(projects))
+        with self._locked():
+            return sorted(self._statistics.projects)
     
     def get_statistics(self) -> Dict:
         """
@@ -268,45 +816,17 @@ class AnalysisStore:
         Returns:
             Statistics dictionary
         """
-        index = self._load_index()
-        
-        if not index:
+        # Maintained as the index changes, so this does not scan it
+        with self._locked():
+            statistics = self._statistics
             return {
-                'total_analyses': 0,
-                'total_ligands_tested': 0,
-                'verified_analyses': 0,
-                'best_overall_candidate': None,
-                'total_projects': 0,
-                'total_tags': 0
+                'total_analyses': statistics.analyses,
+                'total_ligands_tested': statistics.ligands,
+                'verified_analyses': statistics.verified,
+                'best_overall_candidate': statistics.best_candidate(),
+                'total_projects': len(statistics.projects),
+                'total_tags': len(statistics.tags)
             }
-        
-        total_ligands = sum(e['ligand_count'] for e in index)
-        verified = sum(1 for e in index if e['attestation']['verified'])
-        
-        # Find best candidate across all analyses
-        best_candidate = None
-        best_affinity = 0
-        
-        for entry in index:
-            if entry['top_candidate'] and entry['top_candidate']['affinity']:
-                affinity = float(entry['top_candidate']['affinity'])
-                if best_candidate is None or affinity < best_affinity:
-                    best_affinity = affinity
-                    best_candidate = {
-                        'name': entry['top_candidate']['name'],
-                        'affinity': entry['top_candidate']['affinity'],
-                        'analysis_id': entry['analysis_id'],
-                        'timestamp': entry['timestamp']
-                    }
-        
-        return {
-            'total_analyses': len(index),
-            'total_ligands_tested': total_ligands,
-            'verified_analyses': verified,
-            'best_overall_candidate': best_candidate,
-            'total_projects': len(self.get_all_projects()),
-            'total_tags': len(self.get_all_tags())
-        }
 
 
 # Global instance
@@ -316,5 +836,13 @@ def get_store() -> AnalysisStore:
     """Get the global analysis store instance."""
     global _store
     if _store is None:
-        _store = AnalysisStore()
+        from backend.config import config
+        if config.storage_backend == "sqlite":
+            from backend.storage.sqlite_store import SQLiteAnalysisStore
+            _store = SQLiteAnalysisStore()
+        else:
+            _store = AnalysisStore(
+                compact_after=config.index_compact_records,
+                analysis_cache_bytes=config.analysis_cache_max_bytes
+            )
     return _store
@@ -0,0 +1,325 @@
+"""
+Parse-result cache keyed by the SHA-256 of docking file content.
+Re-uploaded files are served from memory or disk without re-parsing.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# Bump when the parser output schema changes so stale entries are ignored
+CACHE_FORMAT_VERSION = 1
+
+# Rough in-memory size of one pose dict (dict plus its float/int values)
+POSE_ENTRY_BYTES = 300
+
+
+def hash_file(file_path: str) -> str:
+    """
+    SHA-256 of a file's content, read in chunks.
+
+    Matches SolanaAttestationTool.hash_input_files for a single file.
+    """
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def evict_lru_files(cache_dir: Path, max_bytes: int, pattern: str = "*.pkl") -> int:
+    """
+    Delete the least recently used cache files until under a byte budget.
+
+    Readers bump a file's mtime on every hit, so mtime order is LRU order.
+
+    Returns:
+        Bytes left in the cache directory
+    """
+    entries = []
+    for path in cache_dir.glob(pattern):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    entries.sort(key=lambda e: e[0])
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+    return total
+
+
+def _entry_bytes(entry: Dict) -> int:
+    """Approximate memory held by a cache entry, dominated by its pose arrays."""
+    size = POSE_ENTRY_BYTES * len(entry["poses"])
+    if entry.get("pose_arrays") is not None:
+        size += entry["pose_arrays"].nbytes
+    return size
+
+
+class PickleCache:
+    """
+    Two-tier cache of pickled values: a memory LRU bounded by entries and
+    bytes, over a directory of ``<key>.pkl`` files bounded by bytes.
+
+    Shared by request threads; a lock guards the memory tier, the byte
+    counts and the hit/miss counters, while pickle I/O runs outside it.
+    Subclasses build keys and values and count hits and misses.
+    """
+
+    # Named in warnings about failed writes
+    description = "cache"
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_memory_entries: int,
+        max_disk_bytes: int,
+        max_memory_bytes: Optional[int] = None
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._lock = threading.Lock()
+        # key -> (value, approximate bytes), least recently used first
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.pkl"))
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Remove all cached entries from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for path in self.cache_dir.glob("*.pkl"):
+                path.unlink(missing_ok=True)
+            self._disk_bytes = 0
+
+    def _memory_size(self, value) -> int:
+        """Approximate memory held by a value; only counted against ``max_memory_bytes``."""
+        return 0
+
+    def _recall(self, key: str):
+        """Value in the memory tier (now the most recently used), or None."""
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is None:
+                return None
+            self._memory.move_to_end(key)
+            return cached[0]
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _remember(self, key: str, value):
+        """Insert into the memory tier, evicting the least recently used."""
+        size = self._memory_size(value) if self.max_memory_bytes is not None else 0
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous[1]
+            if self.max_memory_bytes is not None and size > self.max_memory_bytes:
+                # Served from the disk tier instead
+                return
+            self._memory[key] = (value, size)
+            self._memory_bytes += size
+            while len(self._memory) > self.max_memory_entries or (
+                self.max_memory_bytes is not None and self._memory_bytes > self.max_memory_bytes
+            ):
+                _, (_, evicted_size) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted_size
+
+    def _read_disk(self, key: str):
+        """Load a value from the disk tier, or None."""
+        path = self.cache_dir / f"{key}.pkl"
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            # Bump mtime so eviction treats it as recently used
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt entry: drop it and treat as a miss
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, key: str, value):
+        """Persist a value atomically, then enforce the disk budget."""
+        path = self.cache_dir / f"{key}.pkl"
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Replace and count under the lock so concurrent writers of one key count it once
+            with self._lock:
+                previous = path.stat().st_size if path.exists() else 0
+                os.replace(temp_path, path)
+                temp_path = None
+                self._disk_bytes += path.stat().st_size - previous
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._disk_bytes = evict_lru_files(self.cache_dir, self.max_disk_bytes)
+        except OSError as e:
+            print(f"Warning: Failed to write {self.description} entry: {e}")
+        finally:
+            if temp_path is not None:
+                # The dump or replace failed; don't leave the partial file behind
+                Path(temp_path).unlink(missing_ok=True)
+
+
+class ParseCache(PickleCache):
+    """Two-tier (size-bounded memory LRU + size-bounded disk) cache of parsed docking files."""
+
+    description = "parse cache"
+
+    def __init__(
+        self,
+        cache_dir: str = "outputs/parse_cache",
+        max_memory_entries: int = 1024,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        max_memory_bytes: int = 256 * 1024 * 1024
+    ):
+        # Entries with coordinates hold full PoseArrays, so count bytes as well as entries
+        super().__init__(cache_dir, max_memory_entries, max_disk_bytes, max_memory_bytes)
+
+    def content_key(
+        self,
+        file_path: str,
+        include_coordinates: bool = False,
+        content_hash: Optional[str] = None
+    ) -> str:
+        """
+        Build the cache key for a file.
+
+        Args:
+            file_path: Path to the docking file
+            include_coordinates: Whether the entry holds pose arrays
+            content_hash: SHA-256 of the file if already known (e.g. hashed
+                while uploading), which skips reading the file again
+
+        Returns:
+            Content hash, suffixed when coordinate arrays are cached
+        """
+        key = f"v{CACHE_FORMAT_VERSION}-{content_hash or hash_file(file_path)}"
+        return f"{key}-coords" if include_coordinates else key
+
+    def get(self, key: str, file_path: str) -> Optional[Dict]:
+        """
+        Look up a parse result by content key.
+
+        The ligand name and file path are derived from ``file_path`` so the
+        same content uploaded under another name gets the right metadata.
+
+        Args:
+            key: Key returned by content_key
+            file_path: Path the caller is parsing
+
+        Returns:
+            Parse result identical to DockingParser output, or None on a miss
+        """
+        entry = self._recall(key)
+        if entry is None:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        self._count(entry is not None)
+        if entry is None:
+            return None
+
+        result = {
+            "ligand_name": os.path.splitext(os.path.basename(file_path))[0],
+            "file_path": file_path,
+            # Copy pose dicts so callers cannot mutate the cached entry
+            "poses": [dict(pose) for pose in entry["poses"]],
+            "num_poses": len(entry["poses"]),
+        }
+        if "pose_arrays" in entry:
+            result["pose_arrays"] = entry["pose_arrays"]
+        return result
+
+    def put(self, key: str, parsed_result: Dict):
+        """
+        Store the content-derived part of a successful parse result.
+
+        Args:
+            key: Key returned by content_key
+            parsed_result: DockingParser output without an "error" key
+        """
+        if "error" in parsed_result:
+            return
+
+        entry = {"poses": [dict(pose) for pose in parsed_result["poses"]]}
+        if "pose_arrays" in parsed_result:
+            entry["pose_arrays"] = parsed_result["pose_arrays"]
+
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def parse(self, parser, file_path: str, include_coordinates: bool = False) -> Dict:
+        """
+        Parse a file through the cache.
+
+        Args:
+            parser: DockingParser used on a miss
+            file_path: Path to the docking file
+            include_coordinates: Passed through to the parser
+
+        Returns:
+            Parse result dictionary
+        """
+        if not parser.validate_format(file_path):
+            return parser.parse_vina_output(file_path, include_coordinates)
+
+        try:
+            key = self.content_key(file_path, include_coordinates)
+        except OSError:
+            # Let the parser report missing/unreadable files
+            return parser.parse_vina_output(file_path, include_coordinates)
+
+        cached = self.get(key, file_path)
+        if cached is not None:
+            return cached
+
+        result = parser.parse_vina_output(file_path, include_coordinates)
+        self.put(key, result)
+        return result
+
+    def _memory_size(self, entry: Dict) -> int:
+        return _entry_bytes(entry)
+
+
+# Global instance
+_parse_cache = None
+
+def get_parse_cache() -> ParseCache:
+    """Get the global parse cache instance."""
+    global _parse_cache
+    if _parse_cache is None:
+        from backend.config import config
+        _parse_cache = ParseCache(
+            cache_dir=config.parse_cache_dir,
+            max_disk_bytes=config.parse_cache_max_bytes,
+            max_memory_bytes=config.parse_cache_memory_bytes
+        )
+    return _parse_cache
@@ -0,0 +1,277 @@
+"""
+Columnar binary store (.dsp) for parsed docking results.
+
+Layout (little-endian):
+
+    header        magic "DSPOSE01", version, flags, counts
+    section table (offset, nbytes) per section, in SECTIONS order
+    sections      each starting on a 64-byte boundary
+
+Every section is a flat array, so a reader can memory-map the file and
+expose the columns as NumPy views without copying or decoding.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend.tools.pose_arrays import PoseArrays
+
+
+MAGIC = b"DSPOSE01"
+FORMAT_VERSION = 1
+FLAG_COORDINATES = 1
+ALIGNMENT = 64
+
+# magic, version, flags, n_ligands, n_poses, n_atoms
+HEADER = struct.Struct("<8sIIQQQ")
+
+# Section name -> dtype. Order is part of the on-disk format.
+SECTIONS = (
+    ("name_offsets", np.uint64),    # (n_ligands + 1,) into name_blob
+    ("name_blob", np.uint8),        # UTF-8 ligand names
+    ("path_offsets", np.uint64),    # (n_ligands + 1,) into path_blob
+    ("path_blob", np.uint8),        # UTF-8 source file paths
+    ("pose_offsets", np.int64),     # (n_ligands + 1,) ligand -> pose rows
+    ("pose_ids", np.int32),         # (n_poses,)
+    ("affinities", np.float32),     # (n_poses,) kcal/mol
+    ("rmsd_lb", np.float32),        # (n_poses,)
+    ("rmsd_ub", np.float32),        # (n_poses,)
+    ("atom_offsets", np.int64),     # (n_poses + 1,) pose -> atom rows
+    ("coordinates", np.float32),    # (n_atoms, 3)
+    ("charges", np.float32),        # (n_atoms,)
+    ("atom_types", np.uint8),       # (n_atoms,)
+)
+
+SECTION_TABLE = struct.Struct("<" + "QQ" * len(SECTIONS))
+
+
+def _string_table(values):
+    """Encode strings into (offsets, blob) arrays."""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return offsets, blob
+
+
+def write_pose_store(path: str, parsed_results: List[Dict]) -> Dict:
+    """
+    Write parsed docking results to a .dsp file.
+
+    Coordinate blocks are written when any result carries "pose_arrays";
+    poses without arrays get zero atoms.
+
+    Args:
+        path: Destination file path
+        parsed_results: DockingParser outputs (results with "error" are skipped)
+
+    Returns:
+        Summary with ligand, pose and atom counts
+    """
+    results = [r for r in parsed_results if "error" not in r]
+    poses = [pose for r in results for pose in r.get("poses", [])]
+    n_poses = len(poses)
+
+    pose_counts = [len(r.get("poses", [])) for r in results]
+    pose_offsets = np.zeros(len(results) + 1, dtype=np.int64)
+    np.cumsum(pose_counts, out=pose_offsets[1:])
+
+    name_offsets, name_blob = _string_table(r.get("ligand_name") or "" for r in results)
+    path_offsets, path_blob = _string_table(r.get("file_path") or "" for r in results)
+
+    columns = {
+        "name_offsets": name_offsets,
+        "name_blob": name_blob,
+        "path_offsets": path_offsets,
+        "path_blob": path_blob,
+        "pose_offsets": pose_offsets,
+        "pose_ids": np.fromiter((p["pose_id"] for p in poses), dtype=np.int32, count=n_poses),
+        "affinities": np.fromiter((p["binding_affinity"] for p in poses), dtype=np.float32, count=n_poses),
+        "rmsd_lb": np.fromiter((p.get("rmsd_lb", 0.0) for p in poses), dtype=np.float32, count=n_poses),
+        "rmsd_ub": np.fromiter((p.get("rmsd_ub", 0.0) for p in poses), dtype=np.float32, count=n_poses),
+    }
+
+    flags = 0
+    if any(r.get("pose_arrays") is not None for r in results):
+        flags |= FLAG_COORDINATES
+        atom_counts = np.zeros(n_poses, dtype=np.int64)
+        blocks = []
+        for r, first_pose, pose_count in zip(results, pose_offsets[:-1], pose_counts):
+            arrays = r.get("pose_arrays")
+            if arrays is None:
+                continue
+            # Only MODEL blocks that have a matching scored pose are stored
+            usable = min(arrays.num_poses, pose_count)
+            if usable == 0:
+                continue
+            rows = slice(int(arrays.model_offsets[0]), int(arrays.model_offsets[usable]))
+            atom_counts[first_pose:first_pose + usable] = np.diff(arrays.model_offsets[:usable + 1])
+            blocks.append((arrays.coordinates[rows], arrays.charges[rows], arrays.atom_types[rows]))
+
+        atom_offsets = np.zeros(n_poses + 1, dtype=np.int64)
+        np.cumsum(atom_counts, out=atom_offsets[1:])
+        columns["atom_offsets"] = atom_offsets
+        columns["coordinates"] = (
+            np.concatenate([b[0] for b in blocks]) if blocks else np.zeros((0, 3), dtype=np.float32)
+        )
+        columns["charges"] = np.concatenate([b[1] for b in blocks]) if blocks else np.zeros(0, dtype=np.float32)
+        columns["atom_types"] = np.concatenate([b[2] for b in blocks]) if blocks else np.zeros(0, dtype=np.uint8)
+
+    n_atoms = len(columns["coordinates"]) if flags & FLAG_COORDINATES else 0
+
+    # Lay out sections after the header and section table
+    table = []
+    position = HEADER.size + SECTION_TABLE.size
+    payloads = []
+    for name, dtype in SECTIONS:
+        data = columns.get(name)
+        data = np.ascontiguousarray(data if data is not None else np.zeros(0), dtype=dtype)
+        position = -(-position // ALIGNMENT) * ALIGNMENT
+        table.extend((position, data.nbytes))
+        payloads.append((position, data))
+        position += data.nbytes
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(results), n_poses, n_atoms))
+            f.write(SECTION_TABLE.pack(*table))
+            for offset, data in payloads:
+                f.write(b"\0" * (offset - f.tell()))
+                f.write(data.tobytes())
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    return {"ligands": len(results), "poses": n_poses, "atoms": n_atoms}
+
+
+class PoseStoreReader:
+    """Memory-mapped, zero-copy reader for .dsp files."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"Not a pose store file: {path}")
+
+        magic, version, flags, n_ligands, n_poses, n_atoms = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a pose store file: {path}")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported pose store version {version}: {path}")
+
+        self.flags = flags
+        self.num_ligands = n_ligands
+        self.num_poses = n_poses
+        self.num_atoms = n_atoms
+
+        table = SECTION_TABLE.unpack_from(self._mmap, HEADER.size)
+        for idx, (name, dtype) in enumerate(SECTIONS):
+            offset, nbytes = table[2 * idx], table[2 * idx + 1]
+            count = nbytes // np.dtype(dtype).itemsize
+            view = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offset)
+            setattr(self, name, view)
+
+        if self.has_coordinates:
+            self.coordinates = self.coordinates.reshape(-1, 3)
+
+    @property
+    def has_coordinates(self) -> bool:
+        """Whether the file contains coordinate blocks."""
+        return bool(self.flags & FLAG_COORDINATES)
+
+    def ligand_name(self, ligand_index: int) -> str:
+        """Decode one ligand name."""
+        start, end = self.name_offsets[ligand_index], self.name_offsets[ligand_index + 1]
+        return self.name_blob[start:end].tobytes().decode("utf-8")
+
+    def ligand_names(self) -> List[str]:
+        """Decode all ligand names."""
+        blob = self.name_blob.tobytes()
+        offsets = self.name_offsets.tolist()
+        return [blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def file_path(self, ligand_index: int) -> str:
+        """Decode one source file path."""
+        start, end = self.path_offsets[ligand_index], self.path_offsets[ligand_index + 1]
+        return self.path_blob[start:end].tobytes().decode("utf-8")
+
+    def ligand_poses(self, ligand_index: int) -> slice:
+        """Pose rows belonging to a ligand."""
+        return slice(int(self.pose_offsets[ligand_index]), int(self.pose_offsets[ligand_index + 1]))
+
+    def pose_arrays(self, ligand_index: int) -> Optional[PoseArrays]:
+        """Coordinate arrays of one ligand as views into the file."""
+        if not self.has_coordinates:
+            return None
+        poses = self.ligand_poses(ligand_index)
+        model_offsets = self.atom_offsets[poses.start:poses.stop + 1]
+        if len(model_offsets) < 2 or model_offsets[0] == model_offsets[-1]:
+            return None
+        rows = slice(int(model_offsets[0]), int(model_offsets[-1]))
+        return PoseArrays(
+            coordinates=self.coordinates[rows],
+            charges=self.charges[rows],
+            atom_types=self.atom_types[rows],
+            model_offsets=model_offsets - model_offsets[0],
+        )
+
+    def to_parsed_results(self) -> List[Dict]:
+        """Rebuild DockingParser-style result dictionaries."""
+        pose_ids = self.pose_ids.tolist()
+        affinities = self.affinities.astype(np.float64).round(4).tolist()
+        rmsd_lb = self.rmsd_lb.astype(np.float64).round(4).tolist()
+        rmsd_ub = self.rmsd_ub.astype(np.float64).round(4).tolist()
+
+        results = []
+        for idx, name in enumerate(self.ligand_names()):
+            poses = self.ligand_poses(idx)
+            result = {
+                "ligand_name": name,
+                "file_path": self.file_path(idx),
+                "poses": [
+                    {
+                        "pose_id": pose_ids[row],
+                        "binding_affinity": affinities[row],
+                        "rmsd_lb": rmsd_lb[row],
+                        "rmsd_ub": rmsd_ub[row],
+                    }
+                    for row in range(poses.start, poses.stop)
+                ],
+                "num_poses": poses.stop - poses.start,
+            }
+            if self.has_coordinates:
+                result["pose_arrays"] = self.pose_arrays(idx)
+            results.append(result)
+        return results
+
+    def close(self):
+        """Release the memory map and file handle."""
+        # Views must be dropped before the mmap can be closed
+        for name, _ in SECTIONS:
+            self.__dict__.pop(name, None)
+        try:
+            self._mmap.close()
+        except (AttributeError, BufferError):
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,73 @@
+"""
+Prepared receptor cache keyed by the SHA-256 of receptor file content.
+Atom typing and the KD-tree are built once per receptor and shared by
+every pose and every analysis that docks against it.
+"""
+from backend.storage.parse_cache import PickleCache, hash_file
+from backend.tools.interactions import ReceptorIndex
+
+
+# Bump when receptor typing changes so stale entries are ignored
+RECEPTOR_CACHE_VERSION = 2
+
+
+class ReceptorCache(PickleCache):
+    """Two-tier (memory LRU + size-bounded disk) cache of prepared ReceptorIndex objects."""
+
+    description = "receptor cache"
+
+    def __init__(
+        self,
+        cache_dir: str = "outputs/receptor_cache",
+        max_memory_entries: int = 8,
+        max_disk_bytes: int = 1024 * 1024 * 1024
+    ):
+        # Receptors can hold 10^5 atoms, so only a few are kept in memory; each
+        # pickle includes the KD-tree, so the disk tier is bounded like the parse cache's
+        super().__init__(cache_dir, max_memory_entries, max_disk_bytes)
+
+    def content_key(self, file_path: str) -> str:
+        """Cache key for a receptor file."""
+        return f"v{RECEPTOR_CACHE_VERSION}-{hash_file(file_path)}"
+
+    def prepare(self, file_path: str) -> ReceptorIndex:
+        """
+        Return the prepared index for a receptor, building it on a miss.
+
+        Args:
+            file_path: Receptor PDBQT (or PDB) file
+
+        Returns:
+            ReceptorIndex shared with other callers; treat it as read-only
+        """
+        key = self.content_key(file_path)
+
+        receptor = self._recall(key)
+        if receptor is not None:
+            self._count(hit=True)
+            return receptor
+
+        # Loading and building happen outside the lock; a concurrent miss may build twice
+        receptor = self._read_disk(key)
+        self._count(hit=receptor is not None)
+        if receptor is None:
+            receptor = ReceptorIndex.from_pdbqt(file_path)
+            self._write_disk(key, receptor)
+
+        self._remember(key, receptor)
+        return receptor
+
+
+# Global instance
+_receptor_cache = None
+
+def get_receptor_cache() -> ReceptorCache:
+    """Get the global receptor cache instance."""
+    global _receptor_cache
+    if _receptor_cache is None:
+        from backend.config import config
+        _receptor_cache = ReceptorCache(
+            cache_dir=config.receptor_cache_dir,
+            max_disk_bytes=config.receptor_cache_max_bytes
+        )
+    return _receptor_cache
@@ -0,0 +1,375 @@
+"""
+Analysis storage backed by SQLite in WAL mode.
+Listing, filtering, pagination and statistics run as indexed queries
+instead of loading and scanning a JSON index.
+"""
+import json
+import sqlite3
+import threading
+from typing import List, Dict, Optional
+
+from backend.storage.analysis_store import AnalysisStore
+
+
+# Recorded in PRAGMA user_version once the schema exists and the aggregates are seeded
+SCHEMA_VERSION = 1
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS analyses (
+        analysis_id TEXT PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        project TEXT NOT NULL DEFAULT '',
+        top_candidate TEXT,
+        top_affinity REAL,
+        ligand_count INTEGER NOT NULL DEFAULT 0,
+        verified INTEGER NOT NULL DEFAULT 0,
+        entry TEXT NOT NULL,
+        data TEXT NOT NULL,
+        saved_seq INTEGER NOT NULL DEFAULT 0
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_analyses_saved_seq ON analyses (saved_seq DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_analyses_project_seq ON analyses (project COLLATE NOCASE, saved_seq DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_analyses_top_affinity_seq ON analyses (top_affinity, saved_seq DESC) "
+    "WHERE top_affinity IS NOT NULL",
+    """CREATE TABLE IF NOT EXISTS analysis_tags (
+        tag TEXT NOT NULL,
+        analysis_id TEXT NOT NULL REFERENCES analyses (analysis_id) ON DELETE CASCADE,
+        PRIMARY KEY (tag, analysis_id)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_analysis_tags_analysis ON analysis_tags (analysis_id)",
+    # Aggregates kept by triggers, so statistics never scan the analyses
+    """CREATE TABLE IF NOT EXISTS analysis_totals (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        analyses INTEGER NOT NULL,
+        ligands INTEGER NOT NULL,
+        verified INTEGER NOT NULL
+    )""",
+    "CREATE TABLE IF NOT EXISTS project_counts (project TEXT PRIMARY KEY, analyses INTEGER NOT NULL) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS tag_counts (tag TEXT PRIMARY KEY, analyses INTEGER NOT NULL) WITHOUT ROWID",
+    """CREATE TRIGGER IF NOT EXISTS analyses_counts_insert AFTER INSERT ON analyses BEGIN
+        UPDATE analysis_totals SET analyses = analyses + 1, ligands = ligands + NEW.ligand_count,
+            verified = verified + NEW.verified;
+        INSERT OR IGNORE INTO project_counts (project, analyses) SELECT NEW.project, 0 WHERE NEW.project != '';
+        UPDATE project_counts SET analyses = analyses + 1 WHERE project = NEW.project;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS analyses_counts_delete AFTER DELETE ON analyses BEGIN
+        UPDATE analysis_totals SET analyses = analyses - 1, ligands = ligands - OLD.ligand_count,
+            verified = verified - OLD.verified;
+        UPDATE project_counts SET analyses = analyses - 1 WHERE project = OLD.project;
+        DELETE FROM project_counts WHERE project = OLD.project AND analyses <= 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS analyses_counts_update AFTER UPDATE OF project, ligand_count, verified ON analyses BEGIN
+        UPDATE analysis_totals SET ligands = ligands - OLD.ligand_count + NEW.ligand_count,
+            verified = verified - OLD.verified + NEW.verified;
+        UPDATE project_counts SET analyses = analyses - 1 WHERE project = OLD.project;
+        DELETE FROM project_counts WHERE project = OLD.project AND analyses <= 0;
+        INSERT OR IGNORE INTO project_counts (project, analyses) SELECT NEW.project, 0 WHERE NEW.project != '';
+        UPDATE project_counts SET analyses = analyses + 1 WHERE project = NEW.project;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS analysis_tags_counts_insert AFTER INSERT ON analysis_tags BEGIN
+        INSERT OR IGNORE INTO tag_counts (tag, analyses) VALUES (NEW.tag, 0);
+        UPDATE tag_counts SET analyses = analyses + 1 WHERE tag = NEW.tag;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS analysis_tags_counts_delete AFTER DELETE ON analysis_tags BEGIN
+        UPDATE tag_counts SET analyses = analyses - 1 WHERE tag = OLD.tag;
+        DELETE FROM tag_counts WHERE tag = OLD.tag AND analyses <= 0;
+    END""",
+)
+
+# Most recently saved first, like the JSON store; metadata updates keep their place
+ORDER_BY_RECENT = "ORDER BY saved_seq DESC"
+
+
+class SQLiteAnalysisStore(AnalysisStore):
+    """
+    AnalysisStore keeping analyses and their index in one SQLite database.
+
+    Full analyses are stored as JSON next to the indexed columns, so every
+    write is a single transaction. Pose stores and fingerprints stay as
+    files in ``storage_dir``. Each thread gets its own connection; WAL mode
+    lets readers run alongside a writer, across processes too.
+    """
+
+    def __init__(self, storage_dir: str = "outputs/analyses", db_file: str = "analyses.db"):
+        self.db_path = None
+        self.db_file = db_file
+        self._local = threading.local()
+        # Rows are read straight from the database; no analysis cache
+        super().__init__(storage_dir, analysis_cache_bytes=0)
+
+    def _ensure_index(self):
+        """Create the schema, importing an existing JSON store on first use."""
+        self.db_path = str(self.storage_dir / self.db_file)
+        conn = self._connect()
+        with conn:
+            # One process creates the schema; the others wait here and find it in place
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._create_schema(conn)
+        if (self.index_file.exists() or self.journal_file.exists()) and not conn.execute("SELECT 1 FROM analyses LIMIT 1").fetchone():
+            self._import_json_store()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connection of the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL with NORMAL sync is durable against application crashes
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        """Create missing tables, indexes and triggers and seed the aggregates (transaction held)."""
+        for statement in SCHEMA:
+            conn.execute(statement)
+
+        # Count what is already stored; the triggers keep the aggregates from here on
+        conn.execute(
+            "INSERT OR REPLACE INTO analysis_totals (id, analyses, ligands, verified) "
+            "SELECT 0, COUNT(*), COALESCE(SUM(ligand_count), 0), COALESCE(SUM(verified), 0) FROM analyses"
+        )
+        conn.execute("DELETE FROM project_counts")
+        conn.execute(
+            "INSERT INTO project_counts (project, analyses) "
+            "SELECT project, COUNT(*) FROM analyses WHERE project != '' GROUP BY project"
+        )
+        conn.execute("DELETE FROM tag_counts")
+        conn.execute("INSERT INTO tag_counts (tag, analyses) SELECT tag, COUNT(*) FROM analysis_tags GROUP BY tag")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _import_json_store(self):
+        """Copy analyses saved by the JSON store into the database."""
+        # Oldest first, so ties in timestamp keep their order
+        entries, _, _ = self._load_view()
+        for entry in entries.values():
+            data = super().get_analysis(entry['analysis_id'])
+            if data is not None:
+                self.save_analysis(entry['analysis_id'], data)
+
+    def _write(self, analysis_id: str, data: Dict, keep_position: bool = False) -> Dict:
+        """
+        Insert or replace an analysis row and its tags (transaction held).
+
+        A saved row becomes the most recent; with ``keep_position`` an
+        existing row keeps its place in listings (metadata updates).
+        """
+        index_entry = self._build_index_entry(analysis_id, data)
+        top_candidate = index_entry['top_candidate'] or {}
+        values = (
+            index_entry['timestamp'],
+            index_entry['project'] or '',
+            top_candidate.get('name'),
+            top_candidate.get('affinity'),
+            index_entry['ligand_count'],
+            int(bool(index_entry['attestation']['verified'])),
+            json.dumps(index_entry),
+            json.dumps(data),
+        )
+        conn = self._connect()
+        if keep_position:
+            conn.execute(
+                "UPDATE analyses SET timestamp = ?, project = ?, top_candidate = ?, top_affinity = ?, "
+                "ligand_count = ?, verified = ?, entry = ?, data = ? WHERE analysis_id = ?",
+                values + (analysis_id,)
+            )
+        else:
+            # Delete first rather than INSERT OR REPLACE, whose implicit delete skips the count triggers
+            conn.execute("DELETE FROM analyses WHERE analysis_id = ?", (analysis_id,))
+            conn.execute(
+                "INSERT INTO analyses (analysis_id, timestamp, project, top_candidate, top_affinity, "
+                "ligand_count, verified, entry, data, saved_seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, "
+                "(SELECT COALESCE(MAX(saved_seq), 0) + 1 FROM analyses))",
+                (analysis_id,) + values
+            )
+        conn.execute("DELETE FROM analysis_tags WHERE analysis_id = ?", (analysis_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO analysis_tags (tag, analysis_id) VALUES (?, ?)",
+            [(tag, analysis_id) for tag in index_entry['tags']]
+        )
+        return index_entry
+
+    def save_analysis(self, analysis_id: str, data: Dict) -> Dict:
+        """
+        Save a complete analysis result.
+
+        Args:
+            analysis_id: Unique identifier for the analysis
+            data: Complete analysis data including results, report, etc.
+
+        Returns:
+            Metadata about the saved analysis
+        """
+        self._apply_defaults(data)
+        with self._connect():
+            return self._write(analysis_id, data)
+
+    def get_analysis(self, analysis_id: str) -> Optional[Dict]:
+        """
+        Retrieve a specific analysis by ID.
+
+        Args:
+            analysis_id: The analysis identifier
+
+        Returns:
+            Complete analysis data or None if not found
+        """
+        row = self._connect().execute(
+            "SELECT data FROM analyses WHERE analysis_id = ?", (analysis_id,)
+        ).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def _load_index(self) -> List[Dict]:
+        """All index entries, most recent first."""
+        return self.list_analyses()
+
+    def _analysis_ids(self) -> List[str]:
+        """IDs of all stored analyses, most recent first."""
+        rows = self._connect().execute(f"SELECT analysis_id FROM analyses {ORDER_BY_RECENT}")
+        return [row['analysis_id'] for row in rows]
+
+    def list_analyses(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        search: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        project: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        List all analyses (metadata only) with optional filtering.
+
+        Args:
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+            search: Search term for ligand names or analysis ID
+            tags: Filter by tags (any match)
+            project: Filter by project name
+
+        Returns:
+            List of analysis metadata entries
+        """
+        clauses = []
+        params = []
+
+        if search:
+            # Substring match, case-insensitive like the JSON store; % and _ are literal
+            pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            clauses.append(
+                "(analysis_id LIKE ? ESCAPE '\\' OR top_candidate LIKE ? ESCAPE '\\' "
+                "OR project LIKE ? ESCAPE '\\')"
+            )
+            params += [pattern] * 3
+
+        if tags:
+            clauses.append(
+                "analysis_id IN (SELECT analysis_id FROM analysis_tags "
+                f"WHERE tag IN ({', '.join('?' * len(tags))}))"
+            )
+            params += tags
+
+        if project:
+            clauses.append("project = ? COLLATE NOCASE")
+            params.append(project)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT entry FROM analyses {where} {ORDER_BY_RECENT} LIMIT ? OFFSET ?",
+            params + [limit if limit else -1, offset]
+        )
+        return [json.loads(row['entry']) for row in rows]
+
+    def delete_analysis(self, analysis_id: str) -> bool:
+        """
+        Delete an analysis.
+
+        Args:
+            analysis_id: The analysis identifier
+
+        Returns:
+            True if deleted, False if not found
+        """
+        with self._connect() as conn:
+            deleted = conn.execute("DELETE FROM analyses WHERE analysis_id = ?", (analysis_id,)).rowcount
+        if not deleted:
+            return False
+
+        self._delete_sidecars(analysis_id)
+        return True
+
+    def update_metadata(self, analysis_id: str, updates: Dict) -> bool:
+        """
+        Update analysis metadata (tags, project, notes).
+
+        Args:
+            analysis_id: The analysis identifier
+            updates: Dictionary with 'tags', 'project', and/or 'notes'
+
+        Returns:
+            True if updated, False if not found
+        """
+        conn = self._connect()
+        with conn:
+            # Take the write lock before reading so concurrent updates serialize
+            conn.execute("BEGIN IMMEDIATE")
+            analysis = self.get_analysis(analysis_id)
+            if not analysis:
+                return False
+
+            for field in ('tags', 'project', 'notes'):
+                if field in updates:
+                    analysis[field] = updates[field]
+            self._write(analysis_id, analysis, keep_position=True)
+        return True
+
+    def get_all_tags(self) -> List[str]:
+        """Get all unique tags across all analyses."""
+        rows = self._connect().execute("SELECT tag FROM tag_counts ORDER BY tag")
+        return [row['tag'] for row in rows]
+
+    def get_all_projects(self) -> List[str]:
+        """Get all unique project names."""
+        rows = self._connect().execute("SELECT project FROM project_counts ORDER BY project")
+        return [row['project'] for row in rows]
+
+    def get_statistics(self) -> Dict:
+        """
+        Get overall statistics across all analyses.
+
+        Returns:
+            Statistics dictionary
+        """
+        conn = self._connect()
+        # Trigger-maintained aggregates: a few rows read whatever the store's size
+        totals = conn.execute(
+            "SELECT analyses, ligands, verified, "
+            "(SELECT COUNT(*) FROM project_counts) AS projects, "
+            "(SELECT COUNT(*) FROM tag_counts) AS tags "
+            "FROM analysis_totals WHERE id = 0"
+        ).fetchone()
+
+        # Lowest ΔG through the partial affinity index, most recently saved on ties
+        # (0.0 counts as unset, as before)
+        best = conn.execute(
+            "SELECT analysis_id, timestamp, top_candidate, top_affinity FROM analyses "
+            "WHERE top_affinity IS NOT NULL AND top_affinity != 0 "
+            "ORDER BY top_affinity, saved_seq DESC LIMIT 1"
+        ).fetchone()
+
+        return {
+            'total_analyses': totals['analyses'],
+            'total_ligands_tested': totals['ligands'],
+            'verified_analyses': totals['verified'],
+            'best_overall_candidate': {
+                'name': best['top_candidate'],
+                'affinity': best['top_affinity'],
+                'analysis_id': best['analysis_id'],
+                'timestamp': best['timestamp']
+            } if best else None,
+            'total_projects': totals['projects'],
+            'total_tags': totals['tags']
+        }
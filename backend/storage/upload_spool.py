@@ -0,0 +1,224 @@
+"""
+Streaming multipart ingest that writes uploads straight to a spool directory.
+The request body is parsed chunk by chunk as it arrives, so peak memory is
+one network chunk per request whatever the size of the upload.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import AsyncIterable, Dict, List, Optional, Sequence
+
+from multipart.multipart import MultipartParser, parse_options_header
+
+
+# Non-file form fields are small options, never data
+MAX_FIELD_BYTES = 64 * 1024
+
+
+class UploadError(Exception):
+    """Rejected upload; ``status_code`` is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SpooledFile:
+    """An uploaded file written to the spool directory."""
+
+    def __init__(self, field_name: str, filename: str, path: str):
+        self.field_name = field_name
+        self.filename = filename
+        self.path = path
+        self.size = 0
+        # SHA-256 hex digest of the content, when hashing is enabled
+        self.sha256 = None
+
+
+class UploadSpool:
+    """
+    Receives one multipart request into its own spool directory.
+
+    Each file field gets a subdirectory, so a receptor never clashes with a
+    ligand of the same name. Extensions are checked from the part headers,
+    before any data is written, and size limits are enforced while the body
+    streams in.
+    """
+
+    def __init__(
+        self,
+        allowed_extensions: Dict[str, Sequence[str]],
+        spool_dir: Optional[str] = None,
+        max_request_bytes: int = 4096 * 1024 * 1024,
+        max_file_bytes: int = 1024 * 1024 * 1024,
+        hash_files: bool = True
+    ):
+        # Field name -> accepted extensions; file fields not listed are rejected
+        self.allowed_extensions = {
+            field: tuple(ext.lower() for ext in extensions)
+            for field, extensions in allowed_extensions.items()
+        }
+        self.max_request_bytes = max_request_bytes
+        self.max_file_bytes = max_file_bytes
+        self.hash_files = hash_files
+        if spool_dir:
+            Path(spool_dir).mkdir(parents=True, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix="docksight_", dir=spool_dir or None)
+        self.files = []
+        self.fields = {}
+        self.received_bytes = 0
+
+        # Part being parsed
+        self._headers = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._file = None
+        self._handle = None
+        self._hasher = None
+        self._field_name = None
+        self._field_value = None
+
+    async def receive(self, content_type: str, chunks: AsyncIterable[bytes]) -> List[SpooledFile]:
+        """
+        Parse a multipart/form-data body and spool its files.
+
+        Args:
+            content_type: Content-Type header of the request
+            chunks: Body chunks as they arrive (e.g. ``request.stream()``)
+
+        Returns:
+            Spooled files in upload order
+
+        Raises:
+            UploadError: Malformed body (400) or a size limit exceeded (413)
+        """
+        mime_type, options = parse_options_header(content_type or "")
+        boundary = options.get(b"boundary")
+        if mime_type != b"multipart/form-data" or not boundary:
+            raise UploadError("Expected a multipart/form-data upload")
+
+        parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+        try:
+            async for chunk in chunks:
+                self.received_bytes += len(chunk)
+                if self.received_bytes > self.max_request_bytes:
+                    raise UploadError(
+                        f"Upload exceeds the {self.max_request_bytes // (1024 * 1024)} MB request limit",
+                        status_code=413
+                    )
+                parser.write(chunk)
+            parser.finalize()
+        except UploadError:
+            raise
+        except Exception as e:
+            raise UploadError(f"Malformed multipart upload: {str(e)}")
+        finally:
+            self._close_file()
+
+        return self.files
+
+    def files_for(self, field_name: str) -> List[SpooledFile]:
+        """Spooled files of one form field, in upload order."""
+        return [f for f in self.files if f.field_name == field_name]
+
+    def content_hashes(self) -> Dict[str, str]:
+        """File path -> SHA-256 of every hashed upload."""
+        return {f.path: f.sha256 for f in self.files if f.sha256 is not None}
+
+    def cleanup(self):
+        """Remove the spool directory and everything in it."""
+        self._close_file()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        field_name = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+
+        if filename is None:
+            self._field_name, self._field_value = field_name, b""
+            return
+        # Browsers send an empty filename for an optional file left unset
+        filename = os.path.basename(filename.decode("utf-8", "replace").replace("\\", "/"))
+        if not filename:
+            return
+
+        extensions = self.allowed_extensions.get(field_name)
+        if extensions is None:
+            raise UploadError(f"Unexpected file field: {field_name}")
+        # endswith rather than the suffix so ".tar.gz" matches as a whole
+        if not filename.lower().endswith(extensions):
+            allowed = ", ".join(extensions[:-1])
+            allowed = f"{allowed} and {extensions[-1]}" if allowed else extensions[-1]
+            raise UploadError(f"Invalid file type: {filename}. Only {allowed} files are allowed.")
+
+        field_dir = os.path.join(self.directory, field_name)
+        os.makedirs(field_dir, exist_ok=True)
+        path = os.path.join(field_dir, filename)
+        if os.path.exists(path):
+            raise UploadError(f"Duplicate file name: {filename}")
+
+        self._file = SpooledFile(field_name, filename, path)
+        self._handle = open(path, "wb")
+        self._hasher = hashlib.sha256() if self.hash_files else None
+
+    def _on_part_data(self, data, start, end):
+        if self._handle is not None:
+            self._file.size += end - start
+            if self._file.size > self.max_file_bytes:
+                raise UploadError(
+                    f"{self._file.filename} exceeds the {self.max_file_bytes // (1024 * 1024)} MB file limit",
+                    status_code=413
+                )
+            # memoryview avoids copying the chunk before it reaches the disk
+            piece = memoryview(data)[start:end]
+            self._handle.write(piece)
+            if self._hasher is not None:
+                self._hasher.update(piece)
+        elif self._field_value is not None:
+            self._field_value += data[start:end]
+            if len(self._field_value) > MAX_FIELD_BYTES:
+                raise UploadError(f"Form field {self._field_name} is too large", status_code=413)
+
+    def _on_part_end(self):
+        if self._handle is not None:
+            if self._hasher is not None:
+                self._file.sha256 = self._hasher.hexdigest()
+            self.files.append(self._file)
+            self._close_file()
+        elif self._field_value is not None:
+            self.fields[self._field_name] = self._field_value.decode("utf-8", "replace")
+            self._field_name = self._field_value = None
+
+    def _close_file(self):
+        """Close the file being written, if any."""
+        if self._handle is not None:
+            self._handle.close()
+        self._handle = None
+        self._file = None
+        self._hasher = None
@@ -0,0 +1,255 @@
+"""Test script for concurrent-safe analysis storage validation."""
+
+import sys
+import os
+import multiprocessing
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.storage.analysis_store import AnalysisStore
+
+NUM_PROCESSES = 4
+SAVES_PER_PROCESS = 60
+# Small enough that compactions rotate the journal while others write
+STRESS_COMPACT_AFTER = 25
+
+
+def _analysis(worker, idx):
+    return {
+        "timestamp": f"2026-03-01T{worker:02d}:{idx // 60:02d}:{idx % 60:02d}",
+        "ranked_ligands": [{"ligand_name": f"w{worker}_lig{idx}", "binding_affinity": -5.0 - idx / 100}],
+        "report": "x" * 2000,
+    }
+
+
+def _save_worker(storage_dir, worker, count, start, results):
+    """One uvicorn-worker stand-in: save, tag and delete analyses in a shared directory."""
+    store = AnalysisStore(storage_dir=storage_dir, compact_after=STRESS_COMPACT_AFTER)
+    start.wait()
+    began = time.perf_counter()
+    for idx in range(count):
+        store.save_analysis(f"w{worker}_{idx:03d}", _analysis(worker, idx))
+        if idx % 10 == 0:
+            store.update_metadata(f"w{worker}_{idx:03d}", {"tags": [f"worker_{worker}"]})
+        if idx % 20 == 5:
+            store.delete_analysis(f"w{worker}_{idx:03d}")
+    elapsed = time.perf_counter() - began
+    # Let a running compaction finish before the process exits
+    store.compact()
+    results.put((worker, began, elapsed))
+
+
+def _run_workers(storage_dir, workers, count):
+    """Run workers in separate processes; returns saves per second over the whole run."""
+    context = multiprocessing.get_context("spawn")
+    start = context.Event()
+    results = context.Queue()
+    processes = [
+        context.Process(target=_save_worker, args=(storage_dir, worker, count, start, results))
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    # Give every worker time to import and open the store
+    time.sleep(1.0)
+    start.set()
+    timings = [results.get(timeout=120) for _ in processes]
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0, f"worker exited with {process.exitcode}"
+    wall = max(began + elapsed for _, began, elapsed in timings) - min(began for _, began, _ in timings)
+    return workers * count / wall
+
+
+def _expected_ids(workers, count):
+    return {
+        f"w{worker}_{idx:03d}" for worker in range(workers) for idx in range(count) if idx % 20 != 5
+    }
+
+
+def test_parallel_saves_not_lost():
+    """Test N processes saving in parallel lose no entries and throughput holds up."""
+    print("=" * 60)
+    print("TEST 1: Parallel Saves Across Processes")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        total = NUM_PROCESSES * SAVES_PER_PROCESS
+        serial_dir = os.path.join(temp_dir, "serial")
+        parallel_dir = os.path.join(temp_dir, "parallel")
+        serial = _run_workers(serial_dir, 1, total)
+        parallel = _run_workers(parallel_dir, NUM_PROCESSES, SAVES_PER_PROCESS)
+        print(f"\n1 process: {serial:.0f} saves/s, {NUM_PROCESSES} processes: {parallel:.0f} saves/s")
+
+        store = AnalysisStore(storage_dir=parallel_dir)
+        listed = store.list_analyses()
+        ids = [entry["analysis_id"] for entry in listed]
+        print(f"Listed {len(ids)} analyses")
+        assert len(ids) == len(set(ids))
+        assert set(ids) == _expected_ids(NUM_PROCESSES, SAVES_PER_PROCESS)
+
+        for entry in listed:
+            idx = int(entry["analysis_id"].split("_")[1])
+            worker = entry["analysis_id"].split("_")[0][1:]
+            assert entry["tags"] == ([f"worker_{worker}"] if idx % 10 == 0 else [])
+            assert store.get_analysis(entry["analysis_id"])["tags"] == entry["tags"]
+
+        # No half-written files were left behind
+        leftovers = [name for name in os.listdir(parallel_dir) if name.endswith(".tmp") or ".tmp." in name]
+        assert leftovers == []
+        assert not store.compacting_file.exists()
+        # Locking must not serialize the file writes themselves; on a single
+        # core the workers only timeslice, so there is nothing to compare
+        if (os.cpu_count() or 1) > 1:
+            assert parallel > serial * 0.5
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_stores_share_changes():
+    """Test two stores on one directory see each other's writes without a restart."""
+    print("=" * 60)
+    print("TEST 2: Shared Index Between Stores")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        first = AnalysisStore(storage_dir=temp_dir, compact_after=5)
+        second = AnalysisStore(storage_dir=temp_dir, compact_after=5)
+
+        for idx in range(4):
+            first.save_analysis(f"a{idx}", _analysis(0, idx))
+        assert [e["analysis_id"] for e in second.list_analyses()] == ["a3", "a2", "a1", "a0"]
+
+        second.delete_analysis("a1")
+        second.update_metadata("a2", {"project": "EGFR"})
+        # Crosses the compaction threshold; the snapshot is replaced under the first store
+        second.save_analysis("a4", _analysis(1, 4))
+        second.compact()
+        assert [e["analysis_id"] for e in first.list_analyses()] == ["a4", "a3", "a2", "a0"]
+        assert first.list_analyses(project="egfr")[0]["analysis_id"] == "a2"
+
+        # A writer that died mid-append leaves a torn line; the next append is not glued to it
+        with open(first.journal_file, "a") as f:
+            f.write('{"op": "save", "entry": {"analysis_id": "torn"')
+        first.save_analysis("a5", _analysis(0, 5))
+        ids = [e["analysis_id"] for e in second.list_analyses()]
+        print(f"\nAfter torn append: {ids}")
+        assert ids == ["a5", "a4", "a3", "a2", "a0"]
+        assert [e["analysis_id"] for e in AnalysisStore(storage_dir=temp_dir).list_analyses()] == ids
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_failed_write_keeps_old_file():
+    """Test a write that fails midway leaves the previous analysis intact."""
+    print("=" * 60)
+    print("TEST 3: Atomic Analysis Writes")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        store = AnalysisStore(storage_dir=temp_dir)
+        store.save_analysis("a0", _analysis(0, 0))
+        before = store.get_analysis("a0")
+
+        broken = _analysis(0, 1)
+        # Not JSON-serializable: json.dump fails after writing part of the file
+        broken["ranked_ligands"].append({"ligand_name": "bad", "binding_affinity": object()})
+        try:
+            store.save_analysis("a0", broken)
+            raise AssertionError("unserializable analysis was saved")
+        except TypeError as e:
+            print(f"\nWrite failed: {e}")
+
+        assert store.get_analysis("a0") == before
+        assert store.list_analyses()[0]["top_candidate"]["name"] == "w0_lig0"
+        assert sorted(os.listdir(temp_dir)) == sorted(["a0.json", "index.json", "index.journal.jsonl", "index.lock"])
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 3 PASSED\n")
+
+
+def test_read_cache():
+    """Test reads are served from memory and invalidated by writes from any store."""
+    print("=" * 60)
+    print("TEST 4: Read Cache")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        store = AnalysisStore(storage_dir=temp_dir, analysis_cache_bytes=10_000)
+        other = AnalysisStore(storage_dir=temp_dir)
+        for idx in range(3):
+            store.save_analysis(f"a{idx}", _analysis(0, idx))
+
+        # The listed index is reused until something changes
+        index = store._load_index()
+        store.get_statistics()
+        assert store._load_index() is index
+
+        first = store.get_analysis("a0")
+        # Callers may replace top-level fields without touching the cache
+        first["ranked_ligands"] = []
+        os.unlink(os.path.join(temp_dir, "a0.json"))
+        cached = store.get_analysis("a0")
+        print(f"\nServed after its file was removed: {cached['ranked_ligands'][0]['ligand_name']}")
+        assert cached["ranked_ligands"][0]["ligand_name"] == "w0_lig0"
+        store.save_analysis("a0", _analysis(0, 0))
+
+        # A write through another store invalidates both the index and the analysis
+        store.get_analysis("a1")
+        other.update_metadata("a1", {"tags": ["lead"]})
+        assert store.get_analysis("a1")["tags"] == ["lead"]
+        assert store._load_index() is not index
+        assert store.get_all_tags() == ["lead"]
+        other.delete_analysis("a2")
+        assert store.get_analysis("a2") is None
+
+        # Bounded by bytes: each analysis is a bit over 2 KB, so only a few fit
+        for idx in range(10):
+            store.save_analysis(f"b{idx}", _analysis(1, idx))
+            store.get_analysis(f"b{idx}")
+        print(f"Cached: {list(store._analyses)}, {store._analyses_bytes} bytes")
+        assert store._analyses_bytes <= 10_000
+        assert list(store._analyses)[-1] == "b9" and "b0" not in store._analyses
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 4 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("ANALYSIS STORE VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_parallel_saves_not_lost()
+        test_stores_share_changes()
+        test_failed_write_keeps_old_file()
+        test_read_cache()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
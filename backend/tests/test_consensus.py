@@ -0,0 +1,149 @@
+"""Test script for consensus ranking validation."""
+
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.tools.consensus import consensus_scores, join_runs, run_ranks
+from backend.tools.ranking import LigandRanker
+from backend.tools.ranking_engine import PoseTable
+
+
+def _results(affinities):
+    """Parsed results with two poses per ligand; the first holds the given ΔG."""
+    return [
+        {
+            "ligand_name": name,
+            "file_path": f"/mock/{name}.pdbqt",
+            "poses": [{"pose_id": 1, "binding_affinity": affinity},
+                      {"pose_id": 2, "binding_affinity": affinity + 1.0}],
+            "num_poses": 2,
+        }
+        for name, affinity in affinities.items()
+    ]
+
+
+def test_join_runs():
+    """Test the name join against a dictionary reference."""
+    print("=" * 60)
+    print("TEST 1: Joining Runs by Ligand Name")
+    print("=" * 60)
+
+    names, matrix, rows = join_runs([
+        (["a", "b", "c"], [-9.0, -8.0, -7.0]),
+        (["c", "d", "a", "a"], [-6.0, -5.0, -4.0, -10.0]),
+    ])
+    print(f"\nLigands: {names}")
+
+    assert names == ["a", "b", "c", "d"]
+    assert [row.tolist() for row in rows] == [[0, 1, 2], [2, 3, 0, 0]]
+    # A name repeated within a run keeps its best value
+    expected = [[-9.0, -10.0], [-8.0, np.nan], [-7.0, -6.0], [np.nan, -5.0]]
+    assert np.allclose(matrix, expected, equal_nan=True)
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_consensus_scores():
+    """Test every consensus score against a per-ligand loop."""
+    print("=" * 60)
+    print("TEST 2: Consensus Scores")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    values = np.round(rng.uniform(-12.0, -4.0, (200, 4)), 1)
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[0] = np.nan
+    values[0, 2] = -20.0
+
+    scores, ranks = consensus_scores(values)
+    assert np.array_equal(np.isnan(ranks), np.isnan(values))
+    assert run_ranks(np.array([[-5.0], [-7.0], [-5.0], [np.nan]]))[:, 0].tolist()[:3] == [2.0, 1.0, 2.0]
+
+    for ligand in range(len(values)):
+        runs = np.flatnonzero(~np.isnan(values[ligand]))
+        ligand_ranks, sizes, z = [], [], []
+        for run in runs:
+            column = values[:, run]
+            column = column[~np.isnan(column)]
+            ligand_ranks.append(1 + np.count_nonzero(column < values[ligand, run]))
+            sizes.append(len(column))
+            z.append((values[ligand, run] - column.mean()) / column.std())
+        ligand_ranks = np.array(ligand_ranks, dtype=float)
+
+        assert np.allclose(ranks[ligand, runs], ligand_ranks)
+        assert np.isclose(scores["mean_rank"][ligand], ligand_ranks.mean())
+        assert scores["min_rank"][ligand] == ligand_ranks.min()
+        assert np.isclose(scores["rank_product"][ligand], np.prod(ligand_ranks / sizes) ** (1 / len(runs)))
+        assert np.isclose(scores["z_score"][ligand], np.mean(z))
+
+    print(f"\nLigand 0 (one run, best there): {[round(s[0], 3) for s in scores.values()]}")
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_consensus_ranking():
+    """Test LigandRanker consensus ordering and entry fields."""
+    print("=" * 60)
+    print("TEST 3: Consensus Ranking")
+    print("=" * 60)
+
+    runs = {
+        "open": _results({"alpha": -9.0, "beta": -8.0, "gamma": -7.0, "delta": -11.0}),
+        "closed": _results({"alpha": -8.5, "beta": -9.0, "gamma": -6.0}),
+        "holo": PoseTable.from_parsed_results(_results({"alpha": -10.0, "beta": -7.5, "gamma": -7.0})),
+    }
+
+    result = LigandRanker().rank_consensus(runs, method="mean_rank")
+    ranked = result["ranked_ligands"]
+    for ligand in ranked:
+        print(f"\n{ligand['ligand_name']}: mean rank {ligand['mean_rank']}, "
+              f"rank product {ligand['rank_product']}, runs {ligand['runs_present']}")
+
+    assert result["errors"] == [] and result["runs"] == ["open", "closed", "holo"]
+    # "delta" is best in its only run but ranks after ligands docked everywhere
+    assert [ligand["ligand_name"] for ligand in ranked] == ["alpha", "beta", "gamma", "delta"]
+    alpha = ranked[0]
+    assert alpha["consensus_score"] == alpha["mean_rank"] == round(5 / 3, 4)
+    assert alpha["min_rank"] == 1.0 and alpha["binding_affinity"] == -10.0
+    assert alpha["run_affinities"] == [-9.0, -8.5, -10.0] and alpha["run_ranks"] == [2, 2, 1]
+    assert ranked[3]["run_affinities"] == [-11.0, None, None] and ranked[3]["run_ranks"] == [1, None, None]
+
+    by_z = LigandRanker().rank_consensus(runs, method="z_score")["ranked_ligands"]
+    assert by_z[0]["consensus_score"] == by_z[0]["z_score"]
+
+    assert LigandRanker().rank_consensus(runs, method="median")["errors"] == ["Unknown consensus method: median"]
+    assert LigandRanker().rank_consensus({"open": runs["open"]})["errors"] == [
+        "Consensus ranking needs at least two runs"
+    ]
+
+    print("\n✓ Test 3 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("CONSENSUS RANKING VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_join_runs()
+        test_consensus_scores()
+        test_consensus_ranking()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
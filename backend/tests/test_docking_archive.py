@@ -0,0 +1,179 @@
+"""Test script for docking archive reading validation."""
+
+import sys
+import os
+import hashlib
+import io
+import shutil
+import tarfile
+import tempfile
+import zipfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.tools.docking_archive import (
+    MemberTooLargeError,
+    can_reopen_members,
+    is_archive,
+    iter_archive_members,
+    iter_archive_streams,
+    member_path,
+    read_members,
+    split_member_path,
+)
+from backend.tools.docking_parser import DockingParser
+
+SAMPLE_PDBQT = """MODEL 1
+REMARK VINA RESULT:    -9.5      0.000      0.000
+ATOM      1  C   LIG A   1       1.000   2.000   3.000  1.00  0.00     0.000 C
+ENDMDL
+MODEL 2
+REMARK VINA RESULT:    -8.1      1.200      2.400
+ATOM      1  C   LIG A   1       1.500   2.500   3.500  1.00  0.00     0.000 C
+ENDMDL
+"""
+
+MEMBERS = {
+    "screen/lig_a.pdbqt": SAMPLE_PDBQT,
+    "screen/lig_b.log": "   1        -7.20      0.000      0.000\n",
+    "__MACOSX/screen/._lig_a.pdbqt": "resource fork",
+    "screen/.DS_Store": "finder",
+}
+
+
+def _write_zip(path, members):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("screen/", "")
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return path
+
+
+def _write_tar_gz(path, members):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, content in members.items():
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+def test_archive_members():
+    """Test zip and tar.gz members stream out without metadata entries."""
+    print("=" * 60)
+    print("TEST 1: Archive Members")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        parser = DockingParser()
+        for archive_path in (
+            _write_zip(os.path.join(temp_dir, "screen.zip"), MEMBERS),
+            _write_tar_gz(os.path.join(temp_dir, "screen.tar.gz"), MEMBERS),
+        ):
+            assert is_archive(archive_path)
+            members = list(iter_archive_members(archive_path))
+            names = [split_member_path(path)[1] for path, _ in members]
+            print(f"\n{os.path.basename(archive_path)}: {names}")
+            assert names == ["screen/lig_a.pdbqt", "screen/lig_b.log"]
+            assert split_member_path(members[0][0])[0] == archive_path
+
+            parsed = parser.parse_vina_content(members[0][1], members[0][0])
+            assert parsed["ligand_name"] == "lig_a" and parsed["num_poses"] == 2
+            assert parsed["poses"][0]["binding_affinity"] == -9.5
+            assert parser.parse_vina_content(members[1][1], members[1][0])["ligand_name"] == "lig_b"
+
+        assert not is_archive("lig_a.pdbqt")
+        assert split_member_path("/tmp/lig_a.pdbqt") == ("/tmp/lig_a.pdbqt", None)
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_member_limits_and_lookup():
+    """Test oversized members are refused and members can be read back."""
+    print("=" * 60)
+    print("TEST 2: Member Limits and Lookup")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        archive_path = _write_tar_gz(os.path.join(temp_dir, "screen.tgz"), MEMBERS)
+        try:
+            list(iter_archive_members(archive_path, max_member_bytes=64))
+            raise AssertionError("oversized member was read")
+        except MemberTooLargeError as e:
+            print(f"\nRefused: {e}")
+
+        wanted = member_path(archive_path, "screen/lig_a.pdbqt")
+        contents = read_members([wanted, member_path(archive_path, "screen/missing.pdbqt"), "/tmp/plain.pdbqt"])
+        print(f"Read back: {list(contents)}")
+        assert contents == {wanted: SAMPLE_PDBQT.encode()}
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_member_streams():
+    """Test members stream through a hashing reader without being read whole."""
+    print("=" * 60)
+    print("TEST 3: Member Streams")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        parser = DockingParser()
+        expected = hashlib.sha256(SAMPLE_PDBQT.encode()).hexdigest()
+        for archive_path in (
+            _write_zip(os.path.join(temp_dir, "screen.zip"), MEMBERS),
+            _write_tar_gz(os.path.join(temp_dir, "screen.tar.gz"), MEMBERS),
+        ):
+            # The archive stays open while the iteration is alive
+            streams = iter_archive_streams(archive_path)
+            path, open_member = next(streams)
+            with open_member() as reader:
+                parsed = parser.parse_vina_stream(reader.lines(), path)
+                digest = reader.hexdigest()
+            print(f"\n{os.path.basename(archive_path)}: {parsed['num_poses']} poses, {reader.size} bytes")
+            assert parsed["num_poses"] == 2
+            assert digest == expected and reader.size == len(SAMPLE_PDBQT)
+
+            if can_reopen_members(archive_path):
+                # Zip members open again from the start, e.g. hashed first and parsed on a miss
+                with open_member() as reader:
+                    assert reader.hexdigest() == expected
+            streams.close()
+        assert not can_reopen_members(os.path.join(temp_dir, "screen.tar.gz"))
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 3 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("DOCKING ARCHIVE VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_archive_members()
+        test_member_limits_and_lookup()
+        test_member_streams()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
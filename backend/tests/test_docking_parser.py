@@ -4,6 +4,8 @@ import sys
 import os
 import tempfile
 
+import numpy as np
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
@@ -186,6 +188,79 @@ def test_empty_poses():
         os.unlink(temp_path)
 
 
+def test_stream_parsing():
+    """Test single-pass parsing from an iterable of lines."""
+    print("=" * 60)
+    print("TEST 6: Streaming Parser")
+    print("=" * 60)
+    
+    parser = DockingParser()
+    
+    log_result = parser.parse_vina_stream(iter(MOCK_VINA_LOG.splitlines(True)), "compound_123.log")
+    pdbqt_result = parser.parse_vina_stream(iter(MOCK_PDBQT.splitlines(True)), "ligand_456.pdbqt")
+    
+    print(f"\nLog poses: {log_result.get('num_poses')}")
+    print(f"PDBQT poses: {pdbqt_result.get('num_poses')}")
+    
+    assert log_result["ligand_name"] == "compound_123"
+    assert [p["binding_affinity"] for p in log_result["poses"]] == [-8.5, -7.9, -7.2, -6.8, -6.3]
+    assert [p["pose_id"] for p in pdbqt_result["poses"]] == [1, 2, 3]
+    assert [p["binding_affinity"] for p in pdbqt_result["poses"]] == [-9.2, -8.7, -8.1]
+    
+    # Log rows take priority over VINA RESULT remarks in the same stream
+    mixed = MOCK_PDBQT + MOCK_VINA_LOG
+    mixed_result = parser.parse_vina_stream(mixed.splitlines(True), "mixed.pdbqt")
+    assert mixed_result["num_poses"] == 5
+    
+    print("\n✓ Test 6 PASSED\n")
+
+
+def test_coordinate_parsing():
+    """Test ATOM records are collected into per-pose arrays."""
+    print("=" * 60)
+    print("TEST 7: Coordinate Arrays")
+    print("=" * 60)
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.pdbqt', delete=False) as f:
+        f.write(MOCK_PDBQT)
+        temp_path = f.name
+    
+    try:
+        parser = DockingParser()
+        result = parser.parse_vina_output(temp_path, include_coordinates=True)
+        arrays = result["pose_arrays"]
+        
+        print(f"\nPoses: {arrays.num_poses}")
+        print(f"Atoms: {arrays.num_atoms}")
+        print(f"Coordinates shape: {arrays.coordinates.shape} ({arrays.coordinates.dtype})")
+        print(f"Model offsets: {arrays.model_offsets.tolist()}")
+        
+        assert arrays.coordinates.shape == (6, 3)
+        assert arrays.model_offsets.tolist() == [0, 2, 4, 6]
+        assert np.allclose(arrays.pose_coordinates(1)[0], [1.111, 2.222, 3.333])
+        assert arrays.atom_type_names(arrays.pose_atom_types(0)) == ["C", "N"]
+        
+        # An empty MODEL keeps its slot, and a truncated atom line is skipped
+        model_2_atoms = (
+            "ATOM      1  C   LIG     1       1.111   2.222   3.333  1.00  0.00     0.000 C\n"
+            "ATOM      2  N   LIG     1       2.222   3.333   4.444  1.00  0.00     0.000 N\n"
+        )
+        gapped = MOCK_PDBQT.replace(model_2_atoms, "") + "ATOM      9  C   LIG\n"
+        gapped_result = parser.parse_vina_stream(gapped.splitlines(True), "gapped.pdbqt", include_coordinates=True)
+        gapped_arrays = gapped_result["pose_arrays"]
+        print(f"With empty MODEL: {gapped_arrays.model_offsets.tolist()}")
+        assert gapped_result["num_poses"] == gapped_arrays.num_poses
+        assert gapped_arrays.model_offsets.tolist()[:3] == [0, 2, 2]
+
+        # Log files carry no atoms
+        log_result = parser.parse_vina_stream(MOCK_VINA_LOG.splitlines(True), "x.log", include_coordinates=True)
+        assert log_result["pose_arrays"] is None
+    finally:
+        os.unlink(temp_path)
+    
+    print("\n✓ Test 7 PASSED\n")
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 60)
@@ -198,6 +273,8 @@ def main():
         test_invalid_file()
         test_unsupported_format()
         test_empty_poses()
+        test_stream_parsing()
+        test_coordinate_parsing()
         
         print("=" * 60)
         print("ALL TESTS COMPLETED SUCCESSFULLY")
@@ -0,0 +1,218 @@
+"""Test script for interaction fingerprint validation."""
+
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.storage.analysis_store import AnalysisStore
+from backend.tools.fingerprints import (
+    FingerprintSet,
+    InteractionFingerprinter,
+    popcount,
+    search_fingerprint_sets,
+    tanimoto,
+)
+from backend.tools.interactions import InteractionAnalyzer
+
+
+# 30 residues x 3 interaction types = 90 bits, so fingerprints span two words
+RESIDUES = [f"RES{idx}" for idx in range(1, 31)]
+
+MOCK_INTERACTIONS = {
+    "ligand_name": "compound_A",
+    "hydrogen_bonds": [
+        {"donor": "ligand_O1", "acceptor": "RES2_OG", "distance": 2.8},
+        {"donor": "RES30_N", "acceptor": "ligand_N2", "distance": 2.9},
+    ],
+    "hydrophobic_contacts": [
+        {"ligand_atom": "C3", "protein_residue": "RES25", "distance": 3.5},
+    ],
+    "salt_bridges": [
+        {"ligand_atom": "N+4", "protein_residue": "RES2", "distance": 3.2},
+    ],
+}
+
+
+def test_encode_decode():
+    """Test residue x type bits survive packing into uint64 words."""
+    print("=" * 60)
+    print("TEST 1: Encode / Decode")
+    print("=" * 60)
+
+    fingerprinter = InteractionFingerprinter(RESIDUES)
+    pairs = InteractionAnalyzer().interaction_residues(MOCK_INTERACTIONS)
+    words = fingerprinter.encode(pairs)
+
+    print(f"\nPairs: {pairs}")
+    print(f"Words: {[hex(w) for w in words.tolist()]}")
+
+    assert fingerprinter.num_words == 2
+    assert words.dtype == np.uint64
+    assert popcount(words[None, :]).tolist() == [4]
+    assert sorted(fingerprinter.decode(words)) == sorted(set(pairs))
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_tanimoto_scores():
+    """Test Tanimoto similarity against a hand-computed value."""
+    print("=" * 60)
+    print("TEST 2: Tanimoto Scores")
+    print("=" * 60)
+
+    fingerprinter = InteractionFingerprinter(RESIDUES)
+    query = fingerprinter.encode([("hydrogen_bonds", "RES1"), ("hydrophobic_contacts", "RES30")])
+    others = np.array([
+        query,
+        fingerprinter.encode([("hydrogen_bonds", "RES1"), ("salt_bridges", "RES5")]),
+        fingerprinter.encode([("salt_bridges", "RES5")]),
+        fingerprinter.encode([]),
+    ])
+
+    scores = tanimoto(query, others)
+    print(f"\nScores: {scores.tolist()}")
+
+    # |A & B| / |A | B|: 2/2, 1/3, 0/3, 0/2
+    assert np.allclose(scores, [1.0, 1 / 3, 0.0, 0.0])
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_search_across_sets():
+    """Test search ranks hits across sets and skips other receptors."""
+    print("=" * 60)
+    print("TEST 3: Search Across Analyses")
+    print("=" * 60)
+
+    fingerprinter = InteractionFingerprinter(RESIDUES)
+    query = fingerprinter.encode([("hydrogen_bonds", "RES1"), ("hydrophobic_contacts", "RES2")])
+
+    set_a = FingerprintSet(RESIDUES, ["a1", "a2"], [1, 3], np.array([
+        fingerprinter.encode([("hydrogen_bonds", "RES1")]),
+        query,
+    ]))
+    set_b = FingerprintSet(RESIDUES, ["b1"], [2], np.array([
+        fingerprinter.encode([("hydrogen_bonds", "RES1"), ("hydrophobic_contacts", "RES2"), ("salt_bridges", "RES3")]),
+    ]))
+    other_receptor = InteractionFingerprinter(["LYS1", "ASP2"])
+    set_c = FingerprintSet(other_receptor.residues, ["c1"], [1], np.array([
+        other_receptor.encode([("hydrogen_bonds", "LYS1")]),
+    ]))
+
+    hits = search_fingerprint_sets(
+        query, fingerprinter.vocabulary_key,
+        [("A", set_a), ("B", set_b), ("C", set_c)],
+        limit=10
+    )
+    print(f"\nHits: {hits}")
+
+    assert [(h["analysis_id"], h["ligand_name"]) for h in hits] == [("A", "a2"), ("B", "b1"), ("A", "a1")]
+    assert hits[0]["pose_id"] == 3 and hits[0]["tanimoto"] == 1.0
+
+    top = search_fingerprint_sets(query, fingerprinter.vocabulary_key, [("A", set_a), ("B", set_b)], limit=1)
+    assert [h["ligand_name"] for h in top] == ["a2"]
+
+    print("\n✓ Test 3 PASSED\n")
+
+
+def test_store_similarity_search():
+    """Test fingerprints persist with analyses and are searchable."""
+    print("=" * 60)
+    print("TEST 4: Stored Fingerprint Search")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        store = AnalysisStore(storage_dir=temp_dir)
+        fingerprinter = InteractionFingerprinter(RESIDUES)
+        shared = [("hydrogen_bonds", "RES4"), ("salt_bridges", "RES9")]
+
+        for analysis_id, names, pairs in (
+            ("run_1", ["lig_a", "lig_b"], [shared, [("hydrophobic_contacts", "RES20")]]),
+            ("run_2", ["lig_c"], [shared + [("hydrophobic_contacts", "RES4")]]),
+        ):
+            store.save_analysis(analysis_id, {"ranked_ligands": []})
+            store.save_fingerprints(analysis_id, FingerprintSet(
+                RESIDUES, names, [1] * len(names), np.array([fingerprinter.encode(p) for p in pairs])
+            ))
+
+        hits = store.find_similar_poses("run_1", "lig_a", limit=5, min_score=0.1)
+        print(f"\nHits: {hits}")
+
+        # The reference is not its own hit
+        assert [(h["analysis_id"], h["ligand_name"]) for h in hits] == [("run_2", "lig_c")]
+        assert store.find_similar_poses("run_1", "missing") is None
+
+        store.delete_analysis("run_2")
+        assert store.load_fingerprints("run_2") is None
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 4 PASSED\n")
+
+
+def test_profile_comparison_with_fingerprints():
+    """Test profile comparison adds pairwise Tanimoto scores."""
+    print("=" * 60)
+    print("TEST 5: Profile Comparison With Fingerprints")
+    print("=" * 60)
+
+    fingerprinter = InteractionFingerprinter(RESIDUES)
+    analyzer = InteractionAnalyzer()
+    other = {
+        "ligand_name": "compound_B",
+        "hydrogen_bonds": [],
+        "hydrophobic_contacts": [
+            {"ligand_atom": "C1", "protein_residue": "RES25", "distance": 3.9},
+            {"ligand_atom": "C2", "protein_residue": "RES26", "distance": 4.1},
+        ],
+        "salt_bridges": [],
+    }
+    profiles = [
+        {**p, "fingerprint": fingerprinter.encode(analyzer.interaction_residues(p))}
+        for p in (MOCK_INTERACTIONS, other)
+    ]
+
+    comparison = analyzer.compare_interaction_profiles(profiles)
+    print(f"\nComparison: {comparison}")
+
+    assert comparison["most_hydrogen_bonds"] == "compound_A"
+    assert comparison["most_hydrophobic"] == "compound_B"
+    assert comparison["most_diverse"] == "compound_A"
+    # Shared bit: hydrophobic RES25; union of 4 + 2 - 1 bits
+    assert comparison["tanimoto_matrix"] == [[1.0, 0.2], [0.2, 1.0]]
+
+    print("\n✓ Test 5 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("INTERACTION FINGERPRINT VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_encode_decode()
+        test_tanimoto_scores()
+        test_search_across_sets()
+        test_store_similarity_search()
+        test_profile_comparison_with_fingerprints()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
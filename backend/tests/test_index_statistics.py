@@ -0,0 +1,153 @@
+"""Test script for incrementally maintained analysis statistics."""
+
+import sys
+import os
+import random
+import shutil
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.storage.analysis_store import AnalysisStore
+
+PROJECTS = ["EGFR", "BRD4", ""]
+TAGS = ["kinase", "lead", "retest"]
+
+
+def _analysis(rng, idx):
+    # Few distinct affinities, so ties between analyses are common
+    affinity = rng.choice([-9.0, -8.5, -7.0, 0.0, None])
+    return {
+        "timestamp": f"2026-04-01T00:{idx // 60 % 60:02d}:{idx % 60:02d}",
+        "ranked_ligands": [] if affinity is None else [
+            {"ligand_name": f"ZINC{idx:04d}", "binding_affinity": affinity}
+        ] * rng.randint(1, 3),
+        "attestation": {"success": rng.random() < 0.3},
+        "tags": rng.sample(TAGS, rng.randint(0, 2)),
+        "project": rng.choice(PROJECTS),
+    }
+
+
+def _scanned_statistics(store):
+    """Statistics computed by scanning the whole index, most recent first."""
+    index = store.list_analyses()
+    best = None
+    for entry in index:
+        top = entry["top_candidate"]
+        if top and top["affinity"] and (best is None or float(top["affinity"]) < best["affinity"]):
+            best = {
+                "name": top["name"],
+                "affinity": top["affinity"],
+                "analysis_id": entry["analysis_id"],
+                "timestamp": entry["timestamp"],
+            }
+    return {
+        "total_analyses": len(index),
+        "total_ligands_tested": sum(e["ligand_count"] for e in index),
+        "verified_analyses": sum(1 for e in index if e["attestation"]["verified"]),
+        "best_overall_candidate": best,
+        "total_projects": len({e["project"] for e in index if e["project"]}),
+        "total_tags": len({tag for e in index for tag in e["tags"]}),
+    }
+
+
+def test_random_operations():
+    """Test statistics match a full scan after every save, update and delete."""
+    print("=" * 60)
+    print("TEST 1: Statistics Under Random Operations")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        rng = random.Random(7)
+        store = AnalysisStore(storage_dir=temp_dir)
+        assert store.get_statistics() == _scanned_statistics(store)
+
+        for step in range(400):
+            ids = [e["analysis_id"] for e in store.list_analyses()]
+            action = rng.random()
+            if action < 0.5 or not ids:
+                # New analyses and re-saves of existing ones
+                analysis_id = f"a{rng.randrange(150)}"
+                store.save_analysis(analysis_id, _analysis(rng, step))
+            elif action < 0.75:
+                store.update_metadata(rng.choice(ids), {
+                    "tags": rng.sample(TAGS, rng.randint(0, 3)),
+                    "project": rng.choice(PROJECTS),
+                })
+            else:
+                # Often the current best, so the heap has to fall back to the next one
+                best = store.get_statistics()["best_overall_candidate"]
+                if best and rng.random() < 0.5:
+                    store.delete_analysis(best["analysis_id"])
+                else:
+                    store.delete_analysis(rng.choice(ids))
+
+            assert store.get_statistics() == _scanned_statistics(store), f"mismatch at step {step}"
+            assert store.get_all_tags() == sorted({t for e in store.list_analyses() for t in e["tags"]})
+            assert store.get_all_projects() == sorted({e["project"] for e in store.list_analyses() if e["project"]})
+
+        stats = store.get_statistics()
+        print(f"\nAfter 400 operations: {stats}")
+        # Rebuilt from disk, the aggregates come out the same
+        assert AnalysisStore(storage_dir=temp_dir).get_statistics() == stats
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_changes_from_other_store():
+    """Test statistics follow writes made through another store on the same directory."""
+    print("=" * 60)
+    print("TEST 2: Statistics Across Stores")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        rng = random.Random(11)
+        first = AnalysisStore(storage_dir=temp_dir, compact_after=7)
+        second = AnalysisStore(storage_dir=temp_dir, compact_after=7)
+
+        for idx in range(30):
+            writer = first if idx % 2 else second
+            writer.save_analysis(f"a{idx % 12}", _analysis(rng, idx))
+            if idx % 5 == 0:
+                writer.delete_analysis(f"a{rng.randrange(12)}")
+            # The other store catches up by tailing the journal or reloading after compaction
+            reader = second if idx % 2 else first
+            assert reader.get_statistics() == _scanned_statistics(writer)
+
+        first.compact()
+        second.compact()
+        print(f"\nStatistics: {second.get_statistics()}")
+        assert first.get_statistics() == second.get_statistics()
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("INDEX STATISTICS VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_random_operations()
+        test_changes_from_other_store()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
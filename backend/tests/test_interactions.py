@@ -2,11 +2,15 @@
 
 import sys
 import os
+import tempfile
+
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from backend.tools.interactions import InteractionAnalyzer
+from backend.tools.interactions import InteractionAnalyzer, ReceptorIndex
+from backend.tools.pose_arrays import ATOM_TYPE_CODES
 
 
 # Mock pose data with minimal atom coordinates
@@ -345,6 +349,96 @@ def test_distance_calculation():
     print("\n✓ Test 7 COMPLETED\n")
 
 
+# Receptor PDBQT fragment: SER hydroxyl (O-H donor), LEU side chain, ASP carboxylate
+MOCK_RECEPTOR_PDBQT = """\
+ATOM      1  OG  SER A 195      10.000  10.000  13.000  1.00  0.00    -0.398 OA
+ATOM      2  HG  SER A 195      10.000  10.000  12.050  1.00  0.00     0.209 HD
+ATOM      3  CD1 LEU A 203      14.500  10.000  10.000  1.00  0.00     0.000 C 
+ATOM      4  OD1 ASP A 189      10.000   5.900  10.000  1.00  0.00    -0.648 OA
+ATOM      5  O   HOH A 301      10.000  10.000  11.500  1.00  0.00    -0.400 OA
+"""
+
+
+def test_receptor_index_analysis():
+    """Test KD-tree receptor index against parsed pose arrays."""
+    print("=" * 60)
+    print("TEST 8: Receptor Index Interaction Analysis")
+    print("=" * 60)
+    
+    with tempfile.NamedTemporaryFile("w", suffix=".pdbqt", delete=False) as f:
+        f.write(MOCK_RECEPTOR_PDBQT)
+        receptor_path = f.name
+    
+    try:
+        receptor = ReceptorIndex.from_pdbqt(receptor_path)
+    finally:
+        os.unlink(receptor_path)
+    
+    # Water is skipped; SER hydroxyl hydrogen marks OG as a donor
+    assert len(receptor) == 4
+    assert receptor.is_donor.tolist() == [True, False, False, False]
+    assert receptor.charge_sign.tolist() == [0, 0, 0, -1]
+    
+    # Ligand acceptor O under SER OG, aliphatic C near LEU, charged N-H pointing at ASP
+    pose_data = {
+        "ligand_name": "arrays_test",
+        "pose_id": 1,
+        "coordinates": np.array(
+            [[10.0, 10.0, 10.2], [11.0, 10.0, 10.0], [10.0, 8.8, 10.0], [10.0, 7.8, 10.0]],
+            dtype=np.float32
+        ),
+        "atom_types": np.array([ATOM_TYPE_CODES[t] for t in ("OA", "C", "N", "HD")], dtype=np.uint8),
+        "charges": np.array([-0.35, 0.02, 0.45, 0.25], dtype=np.float32),
+    }
+    
+    interactions = InteractionAnalyzer(receptor=receptor).analyze_pose(pose_data)
+    print(f"\nInteractions: {interactions}")
+    
+    hbonds = {(h["donor"], h["acceptor"]): h for h in interactions["hydrogen_bonds"]}
+    assert set(hbonds) == {("SER195_OG", "ligand_O1"), ("ligand_N3", "ASP189_OD1")}
+    assert all(h["angle"] > 170 for h in hbonds.values())
+    
+    assert [c["protein_residue"] for c in interactions["hydrophobic_contacts"]] == ["LEU203"]
+    
+    bridges = interactions["salt_bridges"]
+    assert [(b["ligand_atom"], b["protein_residue"]) for b in bridges] == [("N3", "ASP189")]
+    assert bridges[0]["charge_ligand"] == "+"
+    
+    print("\n✓ Test 8 PASSED\n")
+
+
+MOCK_RECEPTOR_PDB = """\
+ATOM      1  N   HIS A 119      10.000  10.000  10.000  1.00  0.00           N
+HETATM    2 ZN    ZN AA000      12.000  10.000  10.000  1.00  0.00          ZN
+HETATM    3 CL    CL A          14.000  10.000  10.000  1.00  0.00          CL
+"""
+
+
+def test_pdb_receptor_elements():
+    """Test PDB receptors are typed from the element column."""
+    print("=" * 60)
+    print("TEST 9: PDB Receptor Elements")
+    print("=" * 60)
+    
+    with tempfile.NamedTemporaryFile("w", suffix=".pdb", delete=False) as f:
+        f.write(MOCK_RECEPTOR_PDB)
+        receptor_path = f.name
+    
+    try:
+        receptor = ReceptorIndex.from_pdbqt(receptor_path)
+    finally:
+        os.unlink(receptor_path)
+    
+    print(f"\nElements: {receptor.elements.tolist()}, residues: {receptor.residue_ids}")
+    # Two-letter elements are not cut down to their second letter
+    assert receptor.elements.tolist() == ["N", "Zn", "Cl"]
+    assert not receptor.is_acceptor[1]
+    # Hybrid-36 and blank residue numbers
+    assert list(receptor.residue_ids) == [119, 10000, 0]
+    
+    print("\n✓ Test 9 PASSED\n")
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 60)
@@ -359,6 +453,8 @@ def main():
         test_interaction_summary()
         test_interaction_profile_comparison()
         test_distance_calculation()
+        test_receptor_index_analysis()
+        test_pdb_receptor_elements()
         
         print("=" * 60)
         print("ALL TESTS COMPLETED")
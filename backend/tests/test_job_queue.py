@@ -0,0 +1,136 @@
+"""Test script for background analysis job queue validation."""
+
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.agent.job_queue import JobQueue
+from backend.agent.state_machine import StateMachine
+
+
+def _wait(job, timeout=5.0):
+    """Poll until a job finishes, like a client of GET /api/jobs/{id}."""
+    deadline = time.monotonic() + timeout
+    while not job.done:
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.01)
+    return job
+
+
+def test_job_reports_pipeline_stage():
+    """Test a running job reports the stage of its state machine."""
+    print("=" * 60)
+    print("TEST 1: Job Stage Progress")
+    print("=" * 60)
+
+    queue = JobQueue(max_workers=1)
+    state_machine = StateMachine()
+    parsed = threading.Event()
+    release = threading.Event()
+
+    def pipeline():
+        state_machine.transition_to("parsing")
+        state_machine.transition_to("parsed")
+        parsed.set()
+        release.wait(5.0)
+        state_machine.transition_to("ranking")
+        state_machine.transition_to("complete")
+        return {"status": "complete", "analysis_id": "analysis_test", "ranked_ligands": []}
+
+    job = queue.submit(pipeline, state_machine)
+    assert queue.get(job.job_id) is job
+
+    assert parsed.wait(5.0)
+    running = job.to_dict()
+    print(f"\nWhile running: status={running['status']}, stage={running['stage']}")
+    assert running["status"] == "running" and running["stage"] == "parsed"
+    assert "result" not in running and queue.pending_count() == 1
+
+    release.set()
+    finished = _wait(job).to_dict()
+    print(f"Finished: status={finished['status']}, stage={finished['stage']}")
+    assert finished["status"] == "complete" and finished["stage"] == "complete"
+    assert finished["analysis_id"] == "analysis_test"
+    assert finished["result"]["ranked_ligands"] == []
+    assert finished["started_at"] <= finished["finished_at"]
+    # Transitions were recorded for the event stream
+    assert [data["stage"] for event, data in job.events if event == "stage"] == [
+        "parsing", "parsed", "ranking", "complete"
+    ]
+
+    queue.shutdown()
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_failed_jobs():
+    """Test exceptions and failed analyses both mark the job failed."""
+    print("=" * 60)
+    print("TEST 2: Failed Jobs")
+    print("=" * 60)
+
+    queue = JobQueue(max_workers=2)
+
+    def crash():
+        raise RuntimeError("renderer crashed")
+
+    crashed = _wait(queue.submit(crash))
+    invalid = _wait(queue.submit(lambda: {"status": "failed", "errors": ["No docking input provided"]}))
+
+    print(f"\nCrashed: {crashed.errors}")
+    print(f"Invalid input: {invalid.errors}")
+
+    assert crashed.status == "failed" and crashed.errors == ["Analysis failed: renderer crashed"]
+    assert invalid.status == "failed" and invalid.errors == ["No docking input provided"]
+    assert queue.get("missing") is None
+
+    queue.shutdown()
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_finished_job_retention():
+    """Test only the most recent finished jobs are kept."""
+    print("=" * 60)
+    print("TEST 3: Finished Job Retention")
+    print("=" * 60)
+
+    queue = JobQueue(max_workers=1, max_finished_jobs=3)
+    jobs = [_wait(queue.submit(lambda idx=idx: {"status": "complete", "analysis_id": f"a{idx}"}))
+            for idx in range(6)]
+    # Eviction runs when a job finishes, after its own status is final
+    time.sleep(0.05)
+
+    kept = [job.job_id for job in jobs if queue.get(job.job_id) is not None]
+    print(f"\nKept {len(kept)} of {len(jobs)} jobs")
+    assert kept == [job.job_id for job in jobs[-3:]]
+
+    queue.shutdown()
+    print("\n✓ Test 3 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("JOB QUEUE VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_job_reports_pipeline_stage()
+        test_failed_jobs()
+        test_finished_job_retention()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
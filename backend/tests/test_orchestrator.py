@@ -0,0 +1,364 @@
+"""Test script for orchestrator pipeline stages."""
+
+import sys
+import os
+import hashlib
+import json
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import backend.agent.orchestrator as orchestrator_module
+from backend.agent.orchestrator import (
+    DockingAnalysisOrchestrator,
+    ARCHIVE_PARSE_BATCH,
+    PARALLEL_PARSE_MIN_FILES,
+    PARSE_PROGRESS_EVENTS,
+    RANKING_EVENT_LIGANDS,
+)
+from backend.storage.parse_cache import ParseCache
+
+
+def _write_vina_logs(directory, count):
+    """Write `count` small Vina log files and return their paths."""
+    paths = []
+    for idx in range(count):
+        path = os.path.join(directory, f"ligand_{idx:04d}.log")
+        with open(path, "w") as f:
+            f.write(f"   1        {-5.0 - idx * 0.01:.2f}      0.000      0.000\n")
+            f.write(f"   2        {-4.0 - idx * 0.01:.2f}      1.500      2.000\n")
+        paths.append(path)
+    return paths
+
+
+def test_parallel_parsing_order():
+    """Test parallel parsing returns results in input order."""
+    print("=" * 60)
+    print("TEST 1: Parallel Parsing")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        paths = _write_vina_logs(temp_dir, PARALLEL_PARSE_MIN_FILES * 2)
+        
+        serial = DockingAnalysisOrchestrator(parse_workers=1)
+        serial.validate_input(paths)
+        serial.parse_docking_results(paths)
+        
+        parallel = DockingAnalysisOrchestrator(parse_workers=4, parse_chunksize=5)
+        parallel.validate_input(paths)
+        parallel.parse_docking_results(paths)
+        
+        serial_results = serial.state_machine.state.parsed_docking_results
+        parallel_results = parallel.state_machine.state.parsed_docking_results
+        
+        print(f"\nFiles parsed: {len(parallel_results)}")
+        print(f"Stage: {parallel.state_machine.state.current_stage}")
+        
+        assert parallel_results == serial_results
+        assert [r["file_path"] for r in parallel_results] == paths
+        assert parallel.state_machine.state.current_stage == "parsed"
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_parallel_parsing_errors():
+    """Test per-file errors from workers reach validation_errors."""
+    print("=" * 60)
+    print("TEST 2: Parallel Parsing Errors")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        paths = _write_vina_logs(temp_dir, PARALLEL_PARSE_MIN_FILES)
+        bad_path = os.path.join(temp_dir, "empty.log")
+        with open(bad_path, "w") as f:
+            f.write("no poses here\n")
+        paths.insert(3, bad_path)
+        
+        orchestrator = DockingAnalysisOrchestrator(parse_workers=2)
+        orchestrator.validate_input(paths)
+        orchestrator.parse_docking_results(paths)
+        
+        errors = orchestrator.state_machine.state.validation_errors
+        print(f"\nErrors: {errors}")
+        
+        assert errors == [f"No valid poses found in {bad_path}"]
+        assert orchestrator.state_machine.state.current_stage == "failed"
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_cached_parsing():
+    """Test a second analysis of the same files is served from the cache."""
+    print("=" * 60)
+    print("TEST 3: Cached Parsing")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        paths = _write_vina_logs(temp_dir, 5)
+        cache = ParseCache(cache_dir=os.path.join(temp_dir, "cache"))
+        
+        runs = []
+        for _ in range(2):
+            orchestrator = DockingAnalysisOrchestrator(parse_cache=cache)
+            orchestrator.validate_input(paths)
+            orchestrator.parse_docking_results(paths)
+            runs.append(orchestrator.state_machine.state.parsed_docking_results)
+        
+        print(f"\nHits: {cache.hits}, Misses: {cache.misses}")
+        
+        assert cache.hits == 5
+        assert runs[0] == runs[1]
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 3 PASSED\n")
+
+
+def test_progress_events():
+    """Test listeners receive stages, throttled parse progress and early ranking."""
+    print("=" * 60)
+    print("TEST 4: Progress Events")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        paths = _write_vina_logs(temp_dir, 250)
+        cache = ParseCache(cache_dir=os.path.join(temp_dir, "cache"))
+        # Half the batch is already cached
+        cache_warmer = DockingAnalysisOrchestrator(parse_cache=cache)
+        cache_warmer.validate_input(paths[:125])
+        cache_warmer.parse_docking_results(paths[:125])
+        
+        orchestrator = DockingAnalysisOrchestrator(parse_cache=cache)
+        events = []
+        orchestrator.state_machine.add_listener(lambda event, data: events.append((event, data)))
+        orchestrator.validate_input(paths)
+        orchestrator.parse_docking_results(paths)
+        orchestrator.rank_ligands(orchestrator.state_machine.state.parsed_docking_results)
+        
+        stages = [data["stage"] for event, data in events if event == "stage"]
+        progress = [data for event, data in events if event == "parse_progress"]
+        ranking = [data for event, data in events if event == "ranking"]
+        print(f"\nStages: {stages}")
+        print(f"Progress events: {len(progress)}, last: {progress[-1]}")
+        
+        assert stages == ["parsing", "parsed", "ranking"]
+        # Cache hits count as parsed at once (keys are content hashes, so
+        # an identical file later in the batch is a hit as well)
+        cached = progress[0]["cached"]
+        assert cached >= 125 and progress[0] == {"parsed": cached, "total": 250, "cached": cached}
+        assert progress[-1] == {"parsed": 250, "total": 250, "cached": cached}
+        assert len(progress) <= PARSE_PROGRESS_EVENTS + 2
+        assert [p["parsed"] for p in progress] == sorted(p["parsed"] for p in progress)
+        
+        # Ranking arrives before interactions, plots and the report
+        assert len(ranking) == 1 and ranking[0]["total_ligands"] == 250
+        assert [l["ligand_name"] for l in ranking[0]["top_ligands"]] == [
+            f"ligand_{idx:04d}" for idx in range(249, 249 - RANKING_EVENT_LIGANDS, -1)
+        ]
+        # Events stay JSON-friendly for the stream
+        json.dumps(events)
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 4 PASSED\n")
+
+
+def test_archive_parsing():
+    """Test zip and tar.gz uploads are parsed member by member, like loose files."""
+    print("=" * 60)
+    print("TEST 5: Archive Parsing")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        count = ARCHIVE_PARSE_BATCH + PARALLEL_PARSE_MIN_FILES
+        log_dir = os.path.join(temp_dir, "logs")
+        os.makedirs(log_dir)
+        paths = _write_vina_logs(log_dir, count)
+        zip_path = os.path.join(temp_dir, "screen.zip")
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path in paths:
+                archive.write(path, f"logs/{os.path.basename(path)}")
+        tar_path = os.path.join(temp_dir, "screen.tar.gz")
+        with tarfile.open(tar_path, "w:gz") as archive:
+            for path in paths:
+                archive.add(path, f"logs/{os.path.basename(path)}")
+        
+        loose = DockingAnalysisOrchestrator()
+        loose.validate_input(paths)
+        loose.parse_docking_results(paths)
+        expected = [r["poses"] for r in loose.state_machine.state.parsed_docking_results]
+        
+        cache = ParseCache(cache_dir=os.path.join(temp_dir, "cache"))
+        # Streamed zip (hashed, then parsed on a miss), streamed tar (hashed while
+        # parsing) and pooled tar batches
+        for archive_path, workers in ((zip_path, 1), (tar_path, 1), (tar_path, 2)):
+            orchestrator = DockingAnalysisOrchestrator(parse_workers=workers, parse_cache=cache)
+            events = []
+            orchestrator.state_machine.add_listener(lambda event, data: events.append((event, data)))
+            orchestrator.validate_input([archive_path])
+            orchestrator.parse_docking_results([archive_path])
+            results = orchestrator.state_machine.state.parsed_docking_results
+            progress = [data for event, data in events if event == "parse_progress"]
+            
+            print(f"\n{os.path.basename(archive_path)}: {len(results)} ligands, progress {progress[-1]}")
+            assert orchestrator.state_machine.state.current_stage == "parsed"
+            assert [r["poses"] for r in results] == expected
+            assert results[0]["ligand_name"] == "ligand_0000"
+            assert results[0]["file_path"] == f"{archive_path}!/logs/ligand_0000.log"
+            assert progress[-1]["parsed"] == progress[-1]["total"] == count
+        # The tar.gz holds the same content, so every member was a cache hit
+        assert progress[-1]["cached"] == count
+        # Streamed hashes are the whole member's SHA-256, like pooled ones
+        with open(paths[0], "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        assert cache.get(cache.content_key(paths[0], content_hash=digest), paths[0]) is not None
+        
+        # Pool batches are also bounded by bytes; tiny batches parse the same
+        batch_bytes = orchestrator_module.ARCHIVE_BATCH_BYTES
+        orchestrator_module.ARCHIVE_BATCH_BYTES = 512
+        try:
+            orchestrator = DockingAnalysisOrchestrator(parse_workers=2)
+            orchestrator.validate_input([zip_path])
+            orchestrator.parse_docking_results([zip_path])
+            assert [r["poses"] for r in orchestrator.state_machine.state.parsed_docking_results] == expected
+        finally:
+            orchestrator_module.ARCHIVE_BATCH_BYTES = batch_bytes
+        
+        # Extension validation applies per member
+        bad_path = os.path.join(temp_dir, "bad.zip")
+        with zipfile.ZipFile(bad_path, "w") as archive:
+            archive.write(paths[0], "ligand_0000.log")
+            archive.writestr("notes.txt", "not a docking output")
+        orchestrator = DockingAnalysisOrchestrator()
+        orchestrator.validate_input([bad_path])
+        orchestrator.parse_docking_results([bad_path])
+        errors = orchestrator.state_machine.state.validation_errors
+        print(f"Invalid member: {errors}")
+        assert errors == [f"Unsupported file format: {bad_path}!/notes.txt"]
+        assert orchestrator.state_machine.state.current_stage == "failed"
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 5 PASSED\n")
+
+
+def test_rescored_ranking_fallback():
+    """Test rescored ranking without a receptor falls back to binding affinity with a warning."""
+    print("=" * 60)
+    print("TEST 6: Rescored Ranking Fallback")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        paths = _write_vina_logs(temp_dir, 3)
+        for top_k in (0, 2):
+            orchestrator = DockingAnalysisOrchestrator(ranking_top_k=top_k)
+            orchestrator.ranker.rank_key = "rescored_affinity"
+            orchestrator.validate_input(paths)
+            orchestrator.parse_docking_results(paths)
+            result = orchestrator.rank_ligands(orchestrator.state_machine.state.parsed_docking_results)
+            warnings = orchestrator.state_machine.state.warnings
+            
+            print(f"\nTop-K {top_k}: {[l['ligand_name'] for l in result['ranked_ligands']]}, warnings {warnings}")
+            assert result["errors"] == []
+            assert result["ranked_ligands"][0]["ligand_name"] == "ligand_0002"
+            assert warnings == ["Ranking by rescored affinity requires a receptor; ranked by binding affinity instead"]
+            assert orchestrator.state_machine.state.current_stage != "failed"
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 6 PASSED\n")
+
+
+class _InterruptedCompletions:
+    """Groq-like client whose streamed reply fails after a few chunks."""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, stream=False, **kwargs):
+        return self._chunks()
+
+    def _chunks(self):
+        for text in ("Docking ", "scores ", "suggest "):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+        raise ConnectionError("stream interrupted")
+
+
+def test_interrupted_report_stream():
+    """Test an LLM stream failing partway is replaced by the template discussion, with a warning."""
+    print("=" * 60)
+    print("TEST 7: Interrupted Report Stream")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        paths = _write_vina_logs(temp_dir, 3)
+        orchestrator = DockingAnalysisOrchestrator()
+        orchestrator.report_writer.groq_client = _InterruptedCompletions()
+        events = []
+        orchestrator.state_machine.add_listener(lambda event, data: events.append((event, data)))
+        orchestrator.validate_input(paths)
+        orchestrator.parse_docking_results(paths)
+        orchestrator.rank_ligands(orchestrator.state_machine.state.parsed_docking_results)
+        report = orchestrator.generate_report(orchestrator.state_machine.state.ranked_ligands, {}, [])
+        
+        # What a listener ends up with after applying resets
+        received = ""
+        for event, data in events:
+            if event == "report_token":
+                received += data["text"]
+            elif event == "report_reset":
+                received = data["text"]
+        warnings = orchestrator.state_machine.state.warnings
+        print(f"\nResets: {sum(1 for event, _ in events if event == 'report_reset')}, warnings {warnings}")
+        assert received == report == orchestrator.state_machine.state.final_report_md
+        assert "Docking scores suggest" not in report
+        assert len(warnings) == 1 and "interrupted" in warnings[0]
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 7 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("ORCHESTRATOR VALIDATION TESTS")
+    print("=" * 60 + "\n")
+    
+    try:
+        test_parallel_parsing_order()
+        test_parallel_parsing_errors()
+        test_cached_parsing()
+        test_progress_events()
+        test_archive_parsing()
+        test_rescored_ranking_fallback()
+        test_interrupted_report_stream()
+        
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+        
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Test script for Pareto ranking validation."""
+
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.tools.interactions import ReceptorIndex
+from backend.tools.pareto import crowding_distance, non_dominated_sort
+from backend.tools.pose_arrays import ATOM_TYPE_CODES, PoseArrays
+from backend.tools.ranking import LigandRanker
+
+
+def _naive_fronts(objectives):
+    """Reference: peel non-dominated sets with a full dominance matrix."""
+    values = np.where(np.isnan(objectives), np.inf, objectives)
+    dominates = (values[:, None] <= values[None]).all(axis=2) & (values[:, None] < values[None]).any(axis=2)
+    fronts = np.full(len(values), -1)
+    remaining = np.ones(len(values), dtype=bool)
+    front = 0
+    while remaining.any():
+        current = remaining & ~dominates[remaining].any(axis=0)
+        fronts[current] = front
+        remaining &= ~current
+        front += 1
+    return fronts
+
+
+def test_non_dominated_sort():
+    """Test fronts against the naive algorithm, with ties and NaN."""
+    print("=" * 60)
+    print("TEST 1: Non-Dominated Sorting")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    for n_objectives in (1, 2, 3, 4, 6):
+        for trial in range(4):
+            n_points = int(rng.integers(1, 400))
+            # Few distinct values force duplicates and ties
+            objectives = rng.integers(0, 6, (n_points, n_objectives)).astype(np.float64)
+            if trial % 2:
+                objectives[rng.random(objectives.shape) < 0.05] = np.nan
+            fronts = non_dominated_sort(objectives, chunk_points=int(rng.integers(1, 64)))
+            assert np.array_equal(fronts, _naive_fronts(objectives)), (n_objectives, trial)
+        print(f"\n{n_objectives} objectives: matches naive sort")
+
+    # Two objectives: a staircase and the points it dominates
+    points = np.array([[1.0, 5.0], [2.0, 3.0], [4.0, 1.0], [2.0, 5.0], [3.0, 3.0], [5.0, 5.0], [1.0, 5.0]])
+    assert non_dominated_sort(points).tolist() == [0, 0, 0, 1, 1, 2, 0]
+    assert non_dominated_sort(np.zeros((0, 3))).tolist() == []
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_crowding_distance():
+    """Test crowding distance on a single front."""
+    print("=" * 60)
+    print("TEST 2: Crowding Distance")
+    print("=" * 60)
+
+    points = np.array([[0.0, 4.0], [1.0, 3.0], [3.0, 1.0], [4.0, 0.0]])
+    distance = crowding_distance(points, non_dominated_sort(points))
+    print(f"\nDistances: {distance.tolist()}")
+
+    # Interior gaps: (3 - 0) / 4 per objective for point 1, same for point 2
+    assert np.isinf(distance[[0, 3]]).all()
+    assert np.allclose(distance[[1, 2]], [1.5, 1.5])
+
+    # Separate fronts are normalized separately
+    fronts = np.array([0, 0, 0, 1, 1, 1])
+    two = crowding_distance(np.array([[0.0], [1.0], [4.0], [0.0], [3.0], [4.0]]), fronts)
+    assert np.allclose(two[[1, 4]], [1.0, 1.0])
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def _ligand(name, affinity, n_heavy, cluster_poses, center):
+    """Parsed result: one pose per cluster member plus a far pose."""
+    n_atoms = n_heavy
+    base = center + np.linspace(0.0, 1.5, n_atoms)[:, None] * np.array([1.0, 0.0, 0.0])
+    poses = [base + [0.1 * idx, 0.0, 0.0] for idx in range(cluster_poses)] + [base + [20.0, 0.0, 0.0]]
+    n_poses = len(poses)
+    return {
+        "ligand_name": name,
+        "file_path": f"/mock/{name}.pdbqt",
+        "poses": [{"pose_id": idx + 1, "binding_affinity": affinity + 0.1 * idx, "rmsd_lb": 0.0}
+                  for idx in range(n_poses)],
+        "num_poses": n_poses,
+        "pose_arrays": PoseArrays(
+            coordinates=np.vstack(poses).astype(np.float32),
+            charges=np.zeros(n_poses * n_atoms, dtype=np.float32),
+            atom_types=np.full(n_poses * n_atoms, ATOM_TYPE_CODES["C"], dtype=np.uint8),
+            model_offsets=np.arange(0, (n_poses + 1) * n_atoms, n_atoms, dtype=np.int64),
+        ),
+    }
+
+
+def test_pareto_ranking_mode():
+    """Test the Pareto mode of LigandRanker."""
+    print("=" * 60)
+    print("TEST 3: Pareto Ranking Mode")
+    print("=" * 60)
+
+    receptor = ReceptorIndex(
+        coordinates=[[0.0, 3.8, 0.0], [1.5, 3.8, 0.0]],
+        atom_types=["C", "C"],
+        charges=[0.0, 0.0],
+        residue_names=["LEU", "VAL"],
+        residue_ids=[10, 11],
+        atom_names=["CD1", "CG1"],
+    )
+    parsed = [
+        # Best ΔG but large: low ligand efficiency
+        _ligand("potent", -10.0, 40, 1, [0.0, 0.0, 0.0]),
+        # Small and efficient, contacts the receptor
+        _ligand("efficient", -7.0, 10, 2, [0.0, 0.0, 0.0]),
+        # Dominated by "efficient" on every objective
+        _ligand("dominated", -6.5, 12, 1, [50.0, 0.0, 0.0]),
+    ]
+
+    ranker = LigandRanker(rank_key="pareto", receptor=receptor)
+    ranked = ranker.rank_by_binding_affinity(parsed)["ranked_ligands"]
+    for ligand in ranked:
+        print(f"\n{ligand['ligand_name']}: front {ligand['pareto_front']}, "
+              f"LE {ligand['ligand_efficiency']}, interactions {ligand['interaction_count']}, "
+              f"cluster {ligand['cluster_size']}, crowding {ligand['crowding_distance']}")
+
+    by_name = {ligand["ligand_name"]: ligand for ligand in ranked}
+    assert [ligand["ligand_name"] for ligand in ranked][-1] == "dominated"
+    assert by_name["potent"]["pareto_front"] == by_name["efficient"]["pareto_front"] == 1
+    assert by_name["dominated"]["pareto_front"] == 2
+    assert by_name["efficient"]["ligand_efficiency"] == 0.7
+    assert by_name["potent"]["ligand_efficiency"] == 0.25
+    assert by_name["efficient"]["interaction_count"] > by_name["dominated"]["interaction_count"] == 0
+    assert by_name["potent"]["crowding_distance"] is None
+
+    # Without a receptor the interaction objective is left out
+    no_receptor = LigandRanker(rank_key="pareto").rank_by_binding_affinity(parsed)["ranked_ligands"]
+    assert all("interaction_count" not in ligand for ligand in no_receptor)
+    assert [ligand["pareto_front"] for ligand in no_receptor] == [1, 1, 2]
+
+    # Top-K keeps the best K by ΔG, then orders them by front
+    top = ranker.rank_top_k(iter(parsed), 2)["ranked_ligands"]
+    assert {ligand["ligand_name"] for ligand in top} == {"potent", "efficient"}
+
+    print("\n✓ Test 3 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("PARETO RANKING VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_non_dominated_sort()
+        test_crowding_distance()
+        test_pareto_ranking_mode()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
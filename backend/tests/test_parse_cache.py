@@ -0,0 +1,253 @@
+"""Test script for content-hash parse cache validation."""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.storage.parse_cache import ParseCache, hash_file
+from backend.tools.docking_parser import DockingParser
+from backend.tools.solana_attestation import SolanaAttestationTool
+
+
+MOCK_VINA_LOG = """mode |   affinity | dist from best mode
+-----+------------+----------+----------
+   1        -8.5      0.000      0.000
+   2        -7.9      1.234      2.456
+"""
+
+
+class CountingParser(DockingParser):
+    """DockingParser that counts how often it actually parses."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def parse_vina_output(self, file_path, include_coordinates=False):
+        self.calls += 1
+        return super().parse_vina_output(file_path, include_coordinates)
+
+
+def _write(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+def test_cache_hit_skips_parser():
+    """Test a repeated file is served from memory with identical output."""
+    print("=" * 60)
+    print("TEST 1: Memory Tier Hit")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        cache = ParseCache(cache_dir=os.path.join(temp_dir, "cache"))
+        parser = CountingParser()
+        path = _write(temp_dir, "compound_A.log", MOCK_VINA_LOG)
+        
+        first = cache.parse(parser, path)
+        second = cache.parse(parser, path)
+        
+        print(f"\nParser calls: {parser.calls}")
+        print(f"Hits: {cache.hits}, Misses: {cache.misses}")
+        
+        assert parser.calls == 1
+        assert first == second == DockingParser().parse_vina_output(path)
+        
+        # Same content under another name keeps the new name
+        renamed = _write(temp_dir, "compound_B.log", MOCK_VINA_LOG)
+        third = cache.parse(parser, renamed)
+        assert parser.calls == 1
+        assert third["ligand_name"] == "compound_B"
+        assert third["file_path"] == renamed
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_disk_tier_persistence():
+    """Test entries survive a new cache instance via the disk tier."""
+    print("=" * 60)
+    print("TEST 2: Disk Tier Persistence")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        cache_dir = os.path.join(temp_dir, "cache")
+        path = _write(temp_dir, "compound_A.log", MOCK_VINA_LOG)
+        ParseCache(cache_dir=cache_dir).parse(DockingParser(), path)
+        
+        parser = CountingParser()
+        result = ParseCache(cache_dir=cache_dir).parse(parser, path)
+        
+        print(f"\nParser calls after restart: {parser.calls}")
+        
+        assert parser.calls == 0
+        assert result["num_poses"] == 2
+        
+        # A write that fails leaves no temp file behind (the target is a directory)
+        cache = ParseCache(cache_dir=cache_dir)
+        os.makedirs(os.path.join(cache_dir, "blocked.pkl"))
+        cache.put("blocked", result)
+        assert [name for name in os.listdir(cache_dir) if name.endswith(".tmp")] == []
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_disk_eviction():
+    """Test the disk tier stays within its byte budget."""
+    print("=" * 60)
+    print("TEST 3: Disk Eviction")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        cache_dir = os.path.join(temp_dir, "cache")
+        cache = ParseCache(cache_dir=cache_dir, max_memory_entries=2, max_disk_bytes=1000)
+        parser = DockingParser()
+        
+        for idx in range(20):
+            content = f"   1        -{idx}.5      0.000      0.000\n"
+            cache.parse(parser, _write(temp_dir, f"ligand_{idx}.log", content))
+        
+        disk_bytes = sum(
+            os.path.getsize(os.path.join(cache_dir, name)) for name in os.listdir(cache_dir)
+        )
+        print(f"\nDisk usage: {disk_bytes} bytes (budget 1000)")
+        print(f"Memory entries: {len(cache._memory)}")
+        
+        assert disk_bytes <= 1000
+        assert len(cache._memory) == 2
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 3 PASSED\n")
+
+
+def test_memory_byte_budget():
+    """Test the memory tier is bounded by the bytes of cached pose arrays."""
+    print("=" * 60)
+    print("TEST 4: Memory Byte Budget")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        atom = "ATOM      1  C   LIG     1       1.234   2.345   3.456  1.00  0.00     0.000 C\n"
+        # 300 atoms: about 5 KB of arrays per entry
+        content = "MODEL 1\nREMARK VINA RESULT:    -9.2      0.000      0.000\n" + atom * 300 + "ENDMDL\n"
+        cache = ParseCache(cache_dir=os.path.join(temp_dir, "cache"), max_memory_bytes=20_000)
+        parser = CountingParser()
+        
+        paths = []
+        for idx in range(10):
+            paths.append(_write(temp_dir, f"ligand_{idx}.pdbqt", content + f"REMARK {idx}\n"))
+            cache.parse(parser, paths[-1], include_coordinates=True)
+        
+        print(f"\nMemory entries: {len(cache._memory)}, {cache._memory_bytes} bytes (budget 20000)")
+        assert cache._memory_bytes <= 20_000
+        assert 0 < len(cache._memory) < 10
+        
+        # Evicted entries are still served from disk
+        result = cache.parse(parser, paths[0], include_coordinates=True)
+        assert parser.calls == 10
+        assert result["pose_arrays"].num_atoms == 300
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 4 PASSED\n")
+
+
+def test_shared_across_threads():
+    """Test request threads sharing one cache keep its counters and byte totals consistent."""
+    print("=" * 60)
+    print("TEST 5: Shared Across Threads")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        # Two memory slots for eight files, so threads constantly evict each other's keys
+        cache = ParseCache(cache_dir=os.path.join(temp_dir, "cache"), max_memory_entries=2)
+        paths = [_write(temp_dir, f"ligand_{idx}.log", MOCK_VINA_LOG + f"# {idx}\n") for idx in range(8)]
+        errors = []
+        
+        def worker(offset):
+            try:
+                parser = DockingParser()
+                for step in range(200):
+                    cache.parse(parser, paths[(offset + step) % len(paths)])
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        print(f"\nHits: {cache.hits}, misses: {cache.misses}, errors: {errors}")
+        assert errors == []
+        assert cache.hits + cache.misses == 8 * 200
+        assert len(cache._memory) <= 2
+        assert cache._memory_bytes == sum(size for _, size in cache._memory.values())
+        assert cache._disk_bytes == sum(p.stat().st_size for p in cache.cache_dir.glob("*.pkl"))
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 5 PASSED\n")
+
+
+def test_hash_matches_attestation():
+    """Test cache keys use the same hash as attestation."""
+    print("=" * 60)
+    print("TEST 6: Hash Consistency")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        path = _write(temp_dir, "compound_A.log", MOCK_VINA_LOG)
+        attestor = SolanaAttestationTool(dry_run=True)
+        
+        assert hash_file(path) == attestor.hash_input_files([path])
+        print("\n✓ Cache key matches attestation input hash")
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 6 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("PARSE CACHE VALIDATION TESTS")
+    print("=" * 60 + "\n")
+    
+    try:
+        test_cache_hit_skips_parser()
+        test_disk_tier_persistence()
+        test_disk_eviction()
+        test_memory_byte_budget()
+        test_shared_across_threads()
+        test_hash_matches_attestation()
+        
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+        
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Test script for pose RMSD and clustering validation."""
+
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.tools.pose_arrays import PoseArrays
+from backend.tools.pose_clustering import cluster_pose_table, leader_clusters, pairwise_rmsd
+from backend.tools.ranking import LigandRanker
+from backend.tools.ranking_engine import PoseTable
+
+
+def _ligand(name, affinities, poses, rmsd_lb=None):
+    """Parsed result with coordinates for every pose (or none if poses is None)."""
+    result = {
+        "ligand_name": name,
+        "file_path": f"/mock/{name}.pdbqt",
+        "poses": [
+            {"pose_id": idx + 1, "binding_affinity": affinity,
+             "rmsd_lb": rmsd_lb[idx] if rmsd_lb else 0.0, "rmsd_ub": 0.0}
+            for idx, affinity in enumerate(affinities)
+        ],
+        "num_poses": len(affinities),
+    }
+    if poses is not None:
+        poses = np.asarray(poses, dtype=np.float32)
+        n_poses, n_atoms, _ = poses.shape
+        result["pose_arrays"] = PoseArrays(
+            coordinates=poses.reshape(-1, 3),
+            charges=np.zeros(n_poses * n_atoms, dtype=np.float32),
+            atom_types=np.zeros(n_poses * n_atoms, dtype=np.uint8),
+            model_offsets=np.arange(0, (n_poses + 1) * n_atoms, n_atoms, dtype=np.int64),
+        )
+    return result
+
+
+BASE = np.array([[0.0, 0.0, 0.0], [1.5, 0.0, 0.0], [1.5, 1.5, 0.0]])
+
+
+def test_pairwise_rmsd():
+    """Test the Gram-matrix RMSD against direct broadcasting."""
+    print("=" * 60)
+    print("TEST 1: Pairwise RMSD")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    coordinates = rng.normal(0.0, 5.0, (4, 6, 12, 3))
+
+    rmsd = pairwise_rmsd(coordinates)
+    direct = np.sqrt(((coordinates[:, :, None] - coordinates[:, None, :]) ** 2).sum(-1).mean(-1))
+
+    print(f"\nMax deviation: {np.abs(rmsd - direct).max():.2e}")
+
+    assert rmsd.shape == (4, 6, 6)
+    assert np.allclose(rmsd, direct, atol=1e-9)
+    assert np.array_equal(rmsd, np.swapaxes(rmsd, -1, -2))
+    assert np.all(np.diagonal(rmsd, axis1=1, axis2=2) == 0.0)
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_leader_clusters():
+    """Test leader assignment follows rank order."""
+    print("=" * 60)
+    print("TEST 2: Leader Clustering")
+    print("=" * 60)
+
+    # Poses 0 and 2 are close, 1 and 3 are close, the two groups are far apart
+    shifts = np.array([0.0, 10.0, 0.5, 10.5])
+    coordinates = (BASE[None, :, :] + shifts[:, None, None] * np.array([1.0, 0.0, 0.0]))[None]
+
+    labels = leader_clusters(pairwise_rmsd(coordinates), threshold=2.0)
+    print(f"\nLabels: {labels.tolist()}")
+
+    assert labels.tolist() == [[0, 1, 0, 1]]
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_ranking_cluster_fields():
+    """Test ranked ligands gain cluster size and representative pose."""
+    print("=" * 60)
+    print("TEST 3: Ranking Cluster Fields")
+    print("=" * 60)
+
+    offsets = np.array([0.0, 0.5, 0.9, 9.0])[:, None, None] * np.array([1.0, 0.0, 0.0])
+    parsed = [
+        # Best mode of 3 close poses; the middle one is the medoid
+        _ligand("compound_A", [-9.0, -8.5, -8.0, -7.5, -7.0], BASE[None] + offsets[[0, 1, 2, 3, 3]]),
+        # No coordinates: rmsd_lb from the best mode is used instead
+        _ligand("compound_B", [-8.0, -7.0, -6.0], None, rmsd_lb=[0.0, 1.1, 3.5]),
+    ]
+
+    ranked = LigandRanker(cluster_rmsd=1.0).rank_by_binding_affinity(parsed)["ranked_ligands"]
+    for ligand in ranked:
+        print(f"\n{ligand['ligand_name']}: cluster_size={ligand['cluster_size']}, "
+              f"representative_pose={ligand['representative_pose']}")
+
+    assert [(l["ligand_name"], l["cluster_size"], l["representative_pose"]) for l in ranked] == [
+        ("compound_A", 3, 2),
+        ("compound_B", 1, 1),
+    ]
+
+    loose = LigandRanker(cluster_rmsd=2.0).rank_by_binding_affinity(parsed)["ranked_ligands"]
+    assert loose[1]["cluster_size"] == 2
+
+    # Top-K clusters only the kept ligands, with the same fields
+    top = LigandRanker(cluster_rmsd=1.0).rank_top_k(iter(parsed), 1)["ranked_ligands"]
+    assert top == ranked[:1]
+
+    print("\n✓ Test 3 PASSED\n")
+
+
+def test_blocked_clustering():
+    """Test block size does not change results, including mixed shapes."""
+    print("=" * 60)
+    print("TEST 4: Blocked Clustering")
+    print("=" * 60)
+
+    rng = np.random.default_rng(1)
+    parsed = []
+    for idx in range(25):
+        n_poses, n_atoms = (9, 14) if idx % 3 else (6, 20)
+        center = rng.normal(0.0, 3.0, (n_poses, 1, 3))
+        parsed.append(_ligand(
+            f"ligand_{idx:02d}",
+            sorted(rng.uniform(-10.0, -5.0, n_poses)),
+            center + rng.normal(0.0, 1.0, (1, n_atoms, 3)),
+        ))
+
+    table = PoseTable.from_parsed_results(parsed)
+    whole = cluster_pose_table(table, threshold=2.0)
+    blocked = cluster_pose_table(table, threshold=2.0, block_ligands=4)
+
+    print(f"\nCluster sizes: {whole.cluster_size.tolist()}")
+
+    assert whole.from_coordinates.all()
+    assert np.array_equal(whole.cluster_size, blocked.cluster_size)
+    assert np.array_equal(whole.representative_row, blocked.representative_row)
+
+    print("\n✓ Test 4 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("POSE CLUSTERING VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_pairwise_rmsd()
+        test_leader_clusters()
+        test_ranking_cluster_fields()
+        test_blocked_clustering()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
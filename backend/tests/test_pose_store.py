@@ -0,0 +1,149 @@
+"""Test script for binary pose store validation."""
+
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.storage.pose_store import PoseStoreReader, write_pose_store
+from backend.tools.docking_parser import DockingParser
+
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'sample_data')
+
+MOCK_PARSED_RESULTS = [
+    {
+        "ligand_name": "compound_A",
+        "file_path": "/mock/compound_A.log",
+        "poses": [
+            {"pose_id": 1, "binding_affinity": -7.2, "rmsd_lb": 0.0, "rmsd_ub": 0.0},
+            {"pose_id": 2, "binding_affinity": -6.8, "rmsd_lb": 1.234, "rmsd_ub": 2.456},
+        ],
+        "num_poses": 2,
+    },
+    {
+        "ligand_name": "化合物_B",
+        "file_path": "/mock/compound_B.log",
+        "poses": [
+            {"pose_id": 1, "binding_affinity": -9.5, "rmsd_lb": 0.0, "rmsd_ub": 0.0},
+        ],
+        "num_poses": 1,
+    },
+]
+
+
+def test_round_trip_scores():
+    """Test scores and names survive a write/read cycle."""
+    print("=" * 60)
+    print("TEST 1: Score Round Trip")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        path = os.path.join(temp_dir, "scores.dsp")
+        summary = write_pose_store(path, MOCK_PARSED_RESULTS + [{"error": "skipped"}])
+        print(f"\nWritten: {summary}")
+        
+        with PoseStoreReader(path) as reader:
+            print(f"Ligands: {reader.ligand_names()}")
+            print(f"Affinities: {reader.affinities.tolist()}")
+            
+            assert reader.num_ligands == 2 and reader.num_poses == 3
+            assert not reader.has_coordinates
+            assert reader.ligand_name(1) == "化合物_B"
+            assert reader.pose_offsets.tolist() == [0, 2, 3]
+            assert reader.to_parsed_results() == MOCK_PARSED_RESULTS
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_round_trip_coordinates():
+    """Test coordinate blocks are exposed as zero-copy views."""
+    print("=" * 60)
+    print("TEST 2: Coordinate Round Trip")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        parser = DockingParser()
+        parsed = [
+            parser.parse_vina_output(os.path.join(SAMPLE_DIR, name), include_coordinates=True)
+            for name in ("aspirin.pdbqt", "caffeine.pdbqt")
+        ]
+        path = os.path.join(temp_dir, "coords.dsp")
+        write_pose_store(path, parsed)
+        
+        with PoseStoreReader(path) as reader:
+            arrays = reader.pose_arrays(1)
+            original = parsed[1]["pose_arrays"]
+            
+            print(f"\nAtoms stored: {reader.num_atoms}")
+            print(f"Caffeine offsets: {arrays.model_offsets.tolist()}")
+            
+            assert reader.has_coordinates
+            assert np.array_equal(arrays.coordinates, original.coordinates)
+            assert np.array_equal(arrays.atom_types, original.atom_types)
+            assert np.array_equal(arrays.model_offsets, original.model_offsets)
+            # Views reference the mapped file rather than owning a copy
+            assert not reader.coordinates.flags.owndata
+            assert not reader.affinities.flags.writeable
+            del arrays
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_invalid_file():
+    """Test non-.dsp files are rejected."""
+    print("=" * 60)
+    print("TEST 3: Invalid File")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        path = os.path.join(temp_dir, "bad.dsp")
+        with open(path, "wb") as f:
+            f.write(b"not a pose store" * 8)
+        
+        try:
+            PoseStoreReader(path)
+            raise AssertionError("Expected ValueError")
+        except ValueError as e:
+            print(f"\n✓ Error correctly raised: {e}")
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("\n✓ Test 3 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("POSE STORE VALIDATION TESTS")
+    print("=" * 60 + "\n")
+    
+    try:
+        test_round_trip_scores()
+        test_round_trip_coordinates()
+        test_invalid_file()
+        
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+        
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -311,6 +311,115 @@ def test_expected_ranking_order():
         print("✗ Test 7 FAILED: Ranking order mismatch\n")
 
 
+def test_top_k_ranking():
+    """Test bounded top-K ranking matches the head of a full ranking."""
+    print("=" * 60)
+    print("TEST 8: Top-K Ranking")
+    print("=" * 60)
+    
+    ranker = LigandRanker()
+    full = ranker.rank_by_binding_affinity(MOCK_PARSED_RESULTS)["ranked_ligands"]
+    result = ranker.rank_top_k(iter(MOCK_PARSED_RESULTS), 3)
+    
+    print(f"\nTop 3: {[l['ligand_name'] for l in result['ranked_ligands']]}")
+    print(f"Ligands seen: {result['total_ligands_seen']}")
+    print(f"Affinity stats: {result['affinity_stats']}")
+    
+    assert result["ranked_ligands"] == full[:3]
+    assert result["total_ligands_seen"] == 5
+    assert result["affinity_stats"]["min"] == -10.2
+    assert result["affinity_stats"]["max"] == -6.5
+    assert sum(b["count"] for b in result["affinity_stats"]["histogram"]) == 5
+    
+    # Ties break on ligand name, like the full ranking
+    ties = [
+        {"ligand_name": name, "poses": [{"pose_id": 1, "binding_affinity": -8.0}]}
+        for name in ("t3", "t1", "t4", "t2")
+    ]
+    top_ties = ranker.rank_top_k(ties, 2)["ranked_ligands"]
+    assert [l["ligand_name"] for l in top_ties] == ["t1", "t2"]
+    
+    print("\n✓ Test 8 PASSED\n")
+
+
+def test_vectorized_tie_breaking():
+    """Test ties break on ligand name, then pose id."""
+    print("=" * 60)
+    print("TEST 9: Tie Breaking")
+    print("=" * 60)
+    
+    ranker = LigandRanker()
+    tied = [
+        {
+            "ligand_name": "zeta",
+            "file_path": "/mock/zeta.log",
+            "poses": [
+                {"pose_id": 2, "binding_affinity": -8.0},
+                {"pose_id": 1, "binding_affinity": -8.0},
+            ],
+        },
+        {
+            "ligand_name": "alpha",
+            "file_path": "/mock/alpha.log",
+            "poses": [{"pose_id": 1, "binding_affinity": -8.0}],
+        },
+    ]
+    
+    ranked = ranker.rank_by_binding_affinity(tied)["ranked_ligands"]
+    print(f"\nOrder: {[(l['ligand_name'], l['pose_id']) for l in ranked]}")
+    
+    assert [l["ligand_name"] for l in ranked] == ["alpha", "zeta"]
+    assert ranked[1]["pose_id"] == 1
+    assert ranked[1]["total_poses"] == 2
+    
+    print("\n✓ Test 9 PASSED\n")
+
+
+def test_filter_by_threshold():
+    """Test threshold filtering keeps ranked order."""
+    print("=" * 60)
+    print("TEST 10: Threshold Filtering")
+    print("=" * 60)
+    
+    ranker = LigandRanker()
+    ranked = ranker.rank_by_binding_affinity(MOCK_PARSED_RESULTS)["ranked_ligands"]
+    filtered = ranker.filter_by_threshold(ranked, -9.0)
+    
+    print(f"\nLigands ≤ -9.0 kcal/mol: {[l['ligand_name'] for l in filtered]}")
+    
+    assert [l["ligand_name"] for l in filtered] == ["compound_E", "compound_B"]
+    assert ranker.filter_by_threshold(ranked, -20.0) == []
+    assert ranker.filter_by_threshold([], -9.0) == []
+    
+    print("\n✓ Test 10 PASSED\n")
+
+
+def test_batch_comparison():
+    """Test one reference against many candidates."""
+    print("=" * 60)
+    print("TEST 11: Batch Comparison")
+    print("=" * 60)
+    
+    ranker = LigandRanker()
+    ranked = ranker.rank_by_binding_affinity(MOCK_PARSED_RESULTS)["ranked_ligands"]
+    reference = ranked[2]  # compound_C, -8.1
+    result = ranker.compare_ligands(reference, ranked)
+    
+    for comparison in result["comparisons"]:
+        print(f"  {comparison['ligand_name']}: ΔΔG = {comparison['affinity_difference']} "
+              f"(Kd ratio {comparison['estimated_kd_ratio']})")
+    
+    assert result["reference"]["ligand_name"] == "compound_C"
+    assert [c["better_than_reference"] for c in result["comparisons"]] == [True, True, False, False, False]
+    assert result["comparisons"][0]["affinity_difference"] == -2.1
+    assert result["comparisons"][2]["estimated_kd_ratio"] == 1.0
+    
+    single = ranker.compare_ligands(reference, ranked[0])
+    assert single == result["comparisons"][0]
+    
+    print("\n✓ Test 11 PASSED\n")
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 60)
@@ -325,6 +434,10 @@ def main():
         test_ranking_summary()
         test_ligand_no_poses()
         test_expected_ranking_order()
+        test_top_k_ranking()
+        test_vectorized_tie_breaking()
+        test_filter_by_threshold()
+        test_batch_comparison()
         
         print("=" * 60)
         print("ALL TESTS COMPLETED SUCCESSFULLY")
@@ -0,0 +1,168 @@
+"""Test script for prepared receptor cache validation."""
+
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.storage.receptor_cache import ReceptorCache
+from backend.tools.interactions import InteractionAnalyzer
+
+
+MOCK_RECEPTOR_PDBQT = """\
+ATOM      1  OG  SER A 195      10.000  10.000  13.000  1.00  0.00    -0.398 OA
+ATOM      2  HG  SER A 195      10.000  10.000  12.050  1.00  0.00     0.209 HD
+ATOM      3  CD1 LEU A 203      14.500  10.000  10.000  1.00  0.00     0.000 C
+ATOM      4  OD1 ASP A 189      10.000   5.900  10.000  1.00  0.00    -0.648 OA
+"""
+
+
+def _write(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+def test_memory_tier_reuse():
+    """Test the same receptor content is prepared once and shared."""
+    print("=" * 60)
+    print("TEST 1: Memory Tier Reuse")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        cache = ReceptorCache(cache_dir=os.path.join(temp_dir, "cache"))
+        first_path = _write(temp_dir, "receptor.pdbqt", MOCK_RECEPTOR_PDBQT)
+        # Same content under another name, as in a second analysis upload
+        second_path = _write(temp_dir, "receptor_copy.pdbqt", MOCK_RECEPTOR_PDBQT)
+
+        analyzer_a = InteractionAnalyzer(receptor_cache=cache)
+        analyzer_b = InteractionAnalyzer(receptor_cache=cache)
+        receptor_a = analyzer_a.load_receptor(first_path)
+        receptor_b = analyzer_b.load_receptor(second_path)
+
+        print(f"\nHits: {cache.hits}, Misses: {cache.misses}")
+
+        assert receptor_a is receptor_b
+        assert cache.misses == 1 and cache.hits == 1
+        assert receptor_a.is_donor.tolist() == [True, False, False, False]
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_disk_tier_persistence():
+    """Test a prepared receptor survives a new cache instance."""
+    print("=" * 60)
+    print("TEST 2: Disk Tier Persistence")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        cache_dir = os.path.join(temp_dir, "cache")
+        path = _write(temp_dir, "receptor.pdbqt", MOCK_RECEPTOR_PDBQT)
+        original = ReceptorCache(cache_dir=cache_dir).prepare(path)
+
+        cache = ReceptorCache(cache_dir=cache_dir)
+        restored = cache.prepare(path)
+
+        print(f"\nHits after restart: {cache.hits}, Misses: {cache.misses}")
+
+        assert cache.hits == 1 and cache.misses == 0
+        assert np.array_equal(restored.coordinates, original.coordinates)
+        assert restored.charge_sign.tolist() == original.charge_sign.tolist()
+        # The KD-tree is restored with the entry and answers queries
+        assert restored.tree.query_ball_point([10.0, 10.0, 13.0], 0.5) == [0]
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_changed_content_rebuilds():
+    """Test an edited receptor file is prepared again."""
+    print("=" * 60)
+    print("TEST 3: Content Change Invalidation")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        cache = ReceptorCache(cache_dir=os.path.join(temp_dir, "cache"))
+        path = _write(temp_dir, "receptor.pdbqt", MOCK_RECEPTOR_PDBQT)
+        before = cache.prepare(path)
+
+        _write(temp_dir, "receptor.pdbqt", "\n".join(MOCK_RECEPTOR_PDBQT.splitlines()[:3]) + "\n")
+        after = cache.prepare(path)
+
+        print(f"\nAtoms before: {len(before)}, after: {len(after)}")
+
+        assert cache.misses == 2
+        assert len(before) == 4 and len(after) == 3
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 3 PASSED\n")
+
+
+def test_disk_eviction():
+    """Test the disk tier stays within its byte budget."""
+    print("=" * 60)
+    print("TEST 4: Disk Eviction")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        cache_dir = os.path.join(temp_dir, "cache")
+        probe = ReceptorCache(cache_dir=os.path.join(temp_dir, "probe"))
+        probe.prepare(_write(temp_dir, "probe.pdbqt", MOCK_RECEPTOR_PDBQT))
+        entry_bytes = probe._disk_bytes
+        # Room for two receptors
+        cache = ReceptorCache(cache_dir=cache_dir, max_disk_bytes=int(entry_bytes * 2.5))
+
+        for idx in range(6):
+            content = MOCK_RECEPTOR_PDBQT.replace("10.000  10.000  13.000", f"10.000  10.000  1{idx}.000")
+            cache.prepare(_write(temp_dir, f"receptor_{idx}.pdbqt", content))
+
+        files = os.listdir(cache_dir)
+        disk_bytes = sum(os.path.getsize(os.path.join(cache_dir, name)) for name in files)
+        print(f"\nDisk usage: {disk_bytes} bytes in {len(files)} files (budget {cache.max_disk_bytes})")
+        assert disk_bytes <= cache.max_disk_bytes
+        assert len(files) == 2
+        assert cache._disk_bytes == disk_bytes
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 4 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("RECEPTOR CACHE VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_memory_tier_reuse()
+        test_disk_tier_persistence()
+        test_changed_content_rebuilds()
+        test_disk_eviction()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
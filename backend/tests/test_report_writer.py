@@ -2,6 +2,7 @@
 
 import sys
 import os
+from types import SimpleNamespace
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -320,6 +321,78 @@ def test_empty_data_handling():
         print("\n✗ Test 8 FAILED\n")
 
 
+class _StreamingCompletions:
+    """Groq-like client whose completions stream a fixed reply in small deltas."""
+
+    def __init__(self, reply, fail_after=None):
+        self.reply = reply
+        self.fail_after = fail_after
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, stream=False, **kwargs):
+        if not stream:
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.reply))])
+        return self._chunks()
+
+    def _chunks(self):
+        for idx in range(0, len(self.reply), 4):
+            if self.fail_after is not None and idx >= self.fail_after:
+                raise ConnectionError("stream interrupted")
+            delta = SimpleNamespace(content=self.reply[idx:idx + 4])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def test_report_streaming():
+    """Test streamed report pieces concatenate to the returned report."""
+    print("=" * 60)
+    print("TEST 9: Report Streaming")
+    print("=" * 60)
+    
+    analysis_data = {
+        "ranked_ligands": MOCK_RANKED_LIGANDS,
+        "interactions": MOCK_INTERACTIONS,
+        "visualizations": [],
+        "metadata": MOCK_METADATA,
+    }
+    reply = "Docking scores suggest favorable binding of the top-ranked ligand. Limitations apply."
+    
+    reports = []
+    for client, label in (
+        (_StreamingCompletions(reply), "header added"),
+        (_StreamingCompletions("## Discussion\n\n" + reply), "header kept"),
+        (_StreamingCompletions(reply, fail_after=20), "interrupted"),
+    ):
+        writer = ReportWriter()
+        writer.groq_client = client
+        tokens = []
+        resets = []
+        
+        def on_reset(text):
+            # Listeners replace what they received with the reset text
+            resets.append(text)
+            tokens[:] = [text]
+        
+        report = writer.compose_report(analysis_data, on_token=tokens.append, on_reset=on_reset)
+        
+        print(f"\n{label}: {len(tokens)} pieces, {len(resets)} resets, {len(report)} characters")
+        assert "".join(tokens) == report
+        assert report.count("## Discussion") == 1
+        assert "## Scientific Disclaimer" in report
+        reports.append(report)
+    
+    # The stream raised after a few chunks: its partial text is dropped for the template
+    assert len(resets) == 1 and reply[:20] not in resets[0]
+    assert reply[:20] not in reports[2]
+    assert writer.generate_discussion_section(analysis_data) in reports[2]
+    
+    # Without a callback the reply is requested in one piece, with the same result
+    writer = ReportWriter()
+    writer.groq_client = _StreamingCompletions(reply)
+    assert writer.compose_report(analysis_data) == reports[0] == reports[1]
+    
+    print("\n✓ Test 9 PASSED\n")
+
+
 def print_full_report(report):
     """Print the full generated report."""
     print("=" * 60)
@@ -352,6 +425,7 @@ def main():
         test_methods_section()
         test_discussion_section()
         test_empty_data_handling()
+        test_report_streaming()
         
         # Print full report for visual inspection
         print_full_report(report)
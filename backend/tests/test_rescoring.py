@@ -0,0 +1,229 @@
+"""Test script for Vina-like rescoring validation."""
+
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.tools.interactions import ReceptorIndex
+from backend.tools.pose_arrays import ATOM_TYPE_CODES, PoseArrays
+from backend.tools.ranking import LigandRanker
+from backend.tools.rescoring import RESCORING_TERMS, VinaRescorer, pair_terms, parse_weights
+
+
+RECEPTOR_TYPES = ["C", "C", "N", "OA", "OA", "HD", "SA", "NA"]
+RESIDUES = ["LEU", "ASP", "LYS", "SER", "GLU", "ARG"]
+LIGAND_TYPES = ["C", "A", "N", "NA", "OA", "HD", "C", "Cl"]
+
+
+def _receptor(num_atoms=1500, seed=2):
+    """Random receptor at protein-like density."""
+    rng = np.random.default_rng(seed)
+    side = (num_atoms / 0.05) ** (1 / 3)
+    return ReceptorIndex(
+        coordinates=rng.uniform(0.0, side, (num_atoms, 3)),
+        atom_types=[RECEPTOR_TYPES[i % 8] for i in range(num_atoms)],
+        charges=rng.uniform(-0.3, 0.3, num_atoms),
+        residue_names=[RESIDUES[(i // 8) % 6] for i in range(num_atoms)],
+        residue_ids=[i // 8 for i in range(num_atoms)],
+    ), side
+
+
+def _poses(side, num_poses=30, atoms_per_pose=16, seed=3):
+    """Stacked random poses inside the receptor box."""
+    rng = np.random.default_rng(seed)
+    coordinates = np.vstack([
+        rng.uniform(6.0, side - 6.0, 3) + rng.normal(0.0, 2.0, (atoms_per_pose, 3)) for _ in range(num_poses)
+    ]).astype(np.float32)
+    codes = np.array([ATOM_TYPE_CODES[LIGAND_TYPES[i % 8]] for i in range(num_poses * atoms_per_pose)],
+                     dtype=np.uint8)
+    charges = rng.uniform(-0.4, 0.4, num_poses * atoms_per_pose).astype(np.float32)
+    offsets = np.arange(0, num_poses * atoms_per_pose + 1, atoms_per_pose, dtype=np.int64)
+    return coordinates, codes, charges, offsets
+
+
+def test_pair_terms():
+    """Test the term shapes at reference surface distances."""
+    print("=" * 60)
+    print("TEST 1: Pair Terms")
+    print("=" * 60)
+
+    d = np.array([-1.0, -0.35, 0.0, 1.0, 3.0])
+    terms = pair_terms(d, np.ones(5, dtype=bool), np.ones(5, dtype=bool))
+    for name, column in zip(RESCORING_TERMS, terms.T):
+        print(f"\n{name:>14}: {np.round(column, 4).tolist()}")
+
+    assert np.allclose(terms[:, 0], np.exp(-(d / 0.5) ** 2))
+    assert terms[4, 1] == 1.0
+    assert terms[:, 2].tolist() == [1.0, 0.35 ** 2, 0.0, 0.0, 0.0]
+    assert terms[:, 3].tolist() == [1.0, 1.0, 1.0, 0.5, 0.0]
+    assert np.allclose(terms[:, 4], [1.0, 0.5, 0.0, 0.0, 0.0])
+
+    # Typing masks switch the directional terms off
+    off = pair_terms(d, np.zeros(5, dtype=bool), np.zeros(5, dtype=bool))
+    assert not off[:, 3:].any()
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_neighbor_list_matches_all_pairs():
+    """Test the cutoff neighbor list against a full distance matrix."""
+    print("=" * 60)
+    print("TEST 2: Neighbor List vs All Pairs")
+    print("=" * 60)
+
+    receptor, side = _receptor()
+    coordinates, codes, charges, offsets = _poses(side)
+    rescorer = VinaRescorer(receptor)
+
+    sums = rescorer.term_sums(coordinates, codes, charges, offsets)
+    blocked = VinaRescorer(receptor, block_atoms=37).term_sums(coordinates, codes, charges, offsets)
+    assert np.allclose(sums, blocked)
+
+    # Reference: all pairs (no cutoff), one pose at a time. Only gauss2
+    # reaches past the 8 A cutoff, which Vina truncates as well.
+    everything = VinaRescorer(receptor, cutoff=1.0e3)
+    for pose in range(len(offsets) - 1):
+        # Offsets into the stacked arrays select a single pose
+        single = rescorer.term_sums(coordinates, codes, charges, offsets[pose:pose + 2])
+        reference = everything.term_sums(coordinates, codes, charges, offsets[pose:pose + 2])
+        assert np.allclose(single[0], sums[pose])
+        assert np.allclose(single[0, [0, 2, 3, 4]], reference[0, [0, 2, 3, 4]])
+        assert single[0, 1] <= reference[0, 1]
+
+    scores = rescorer.score_poses(coordinates, codes, charges, offsets)
+    assert np.allclose(scores, sums @ rescorer.weight_vector)
+    print(f"\nScores of {len(scores)} poses: {scores.min():.2f} to {scores.max():.2f}")
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_clash_scores_worse():
+    """Test a pose overlapping receptor atoms scores worse than one in contact."""
+    print("=" * 60)
+    print("TEST 3: Clash vs Contact")
+    print("=" * 60)
+
+    receptor = ReceptorIndex(
+        coordinates=[[0.0, 0.0, 0.0], [1.5, 0.0, 0.0], [3.0, 0.0, 0.0]],
+        atom_types=["C", "C", "C"],
+        charges=[0.0, 0.0, 0.0],
+        residue_names=["LEU"] * 3,
+        residue_ids=[10] * 3,
+        atom_names=["CB", "CG", "CD1"],
+    )
+    ligand = np.array([[0.0, 0.0, 0.0], [1.5, 0.0, 0.0]])
+    clash = ligand + [0.0, 1.0, 0.0]
+    contact = ligand + [0.0, 4.0, 0.0]
+
+    scores = VinaRescorer(receptor).score_poses(
+        np.vstack([clash, contact]).astype(np.float32),
+        np.full(4, ATOM_TYPE_CODES["C"], dtype=np.uint8),
+        np.zeros(4, dtype=np.float32),
+        np.array([0, 2, 4]),
+    )
+    print(f"\nClash: {scores[0]:.3f}, contact: {scores[1]:.3f}")
+
+    assert scores[0] > 0.0 > scores[1]
+
+    # Tweaked weights apply without changing the terms
+    weights = parse_weights("repulsion=0, gauss1=-1")
+    assert weights["repulsion"] == 0.0 and weights["hydrogen_bond"] == -0.587439
+    assert VinaRescorer(receptor, weights=weights).score_poses(
+        clash.astype(np.float32), np.full(2, ATOM_TYPE_CODES["C"], dtype=np.uint8),
+        np.zeros(2, dtype=np.float32), [0, 2]
+    )[0] < 0.0
+
+    print("\n✓ Test 3 PASSED\n")
+
+
+def test_ranking_by_rescored_affinity():
+    """Test rescored affinity as an extra ranking key."""
+    print("=" * 60)
+    print("TEST 4: Ranking by Rescored Affinity")
+    print("=" * 60)
+
+    receptor, side = _receptor()
+    coordinates, codes, charges, offsets = _poses(side, num_poses=12)
+    parsed = []
+    for ligand in range(4):
+        rows = slice(offsets[ligand * 3], offsets[ligand * 3 + 3])
+        parsed.append({
+            "ligand_name": f"ligand_{ligand}",
+            "file_path": f"/mock/ligand_{ligand}.pdbqt",
+            "poses": [{"pose_id": p + 1, "binding_affinity": -9.0 + ligand + p * 0.1} for p in range(3)],
+            "num_poses": 3,
+            "pose_arrays": PoseArrays(coordinates[rows], charges[rows], codes[rows],
+                                      offsets[ligand * 3:ligand * 3 + 4] - offsets[ligand * 3]),
+        })
+    parsed.append({
+        "ligand_name": "no_coordinates",
+        "file_path": "/mock/no_coordinates.log",
+        "poses": [{"pose_id": 1, "binding_affinity": -12.0}],
+        "num_poses": 1,
+    })
+
+    rescorer = VinaRescorer(receptor)
+    scores = rescorer.score_poses(coordinates, codes, charges, offsets).reshape(4, 3)
+
+    by_docking = LigandRanker(rescorer=rescorer).rank_by_binding_affinity(parsed)["ranked_ligands"]
+    assert by_docking[0]["ligand_name"] == "no_coordinates"
+    assert by_docking[0]["rescored_affinity"] is None
+    assert [l["ligand_name"] for l in by_docking[1:]] == [f"ligand_{i}" for i in range(4)]
+    for ligand in by_docking[1:]:
+        idx = int(ligand["ligand_name"][-1])
+        assert ligand["rescored_affinity"] == round(scores[idx].min(), 4)
+        assert ligand["rescored_pose_id"] == int(np.argmin(scores[idx])) + 1
+
+    ranker = LigandRanker(rescorer=rescorer, rank_key="rescored_affinity")
+    by_rescore = ranker.rank_by_binding_affinity(parsed)["ranked_ligands"]
+    expected = [f"ligand_{i}" for i in np.argsort(scores.min(axis=1), kind="stable")] + ["no_coordinates"]
+    for ligand in by_rescore:
+        print(f"\n{ligand['ligand_name']}: docked {ligand['binding_affinity']}, "
+              f"rescored {ligand['rescored_affinity']}")
+    assert [l["ligand_name"] for l in by_rescore] == expected
+
+    # Streamed ligands are rescored once; the kept ones reuse those scores
+    calls = []
+    score_poses = rescorer.score_poses
+    rescorer.score_poses = lambda *args: calls.append(len(args[3]) - 1) or score_poses(*args)
+    top = ranker.rank_top_k(iter(parsed), 2)["ranked_ligands"]
+    rescorer.score_poses = score_poses
+    print(f"\nPoses rescored per call while streaming: {calls}")
+    assert calls == [3, 3, 3, 3]
+    assert top == by_rescore[:2]
+
+    # Rescored ranking without a receptor is reported, not silently ignored
+    errors = LigandRanker(rank_key="rescored_affinity").rank_by_binding_affinity(parsed)["errors"]
+    assert errors == ["Ranking by rescored affinity requires a receptor"]
+
+    print("\n✓ Test 4 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("RESCORING VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_pair_terms()
+        test_neighbor_list_matches_all_pairs()
+        test_clash_scores_worse()
+        test_ranking_by_rescored_affinity()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Test script for SQLite analysis storage validation."""
+
+import sys
+import os
+import json
+import random
+import shutil
+import tempfile
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.storage.analysis_store import AnalysisStore
+from backend.storage.sqlite_store import SQLiteAnalysisStore
+
+
+def _analysis(idx, affinity, tags=(), project="", verified=False):
+    """Minimal stored analysis with one top ligand."""
+    return {
+        "timestamp": f"2026-01-{idx + 1:02d}T12:00:00",
+        "ranked_ligands": [
+            {"ligand_name": f"ZINC{idx:04d}", "binding_affinity": affinity},
+            {"ligand_name": f"decoy_{idx}", "binding_affinity": affinity + 1.0},
+        ],
+        "attestation": {"success": verified, "transaction_signature": "sig" if verified else None},
+        "metadata": {"uploaded_files": [f"ZINC{idx:04d}.pdbqt"]},
+        "tags": list(tags),
+        "project": project,
+        "report": f"report {idx}",
+    }
+
+
+SCREEN = [
+    _analysis(0, -7.5, tags=["kinase"], project="EGFR"),
+    _analysis(1, -9.1, tags=["kinase", "lead"], project="egfr", verified=True),
+    _analysis(2, -6.0, project="BRD4"),
+    _analysis(3, -8.4, tags=["lead"], verified=True),
+    _analysis(4, -5.2, tags=["100%_match"]),
+]
+
+
+def _fill(store):
+    for idx, data in enumerate(SCREEN):
+        store.save_analysis(f"analysis_{idx}", dict(data))
+
+
+def test_matches_json_store():
+    """Test listing, filters, pagination and statistics match the JSON store."""
+    print("=" * 60)
+    print("TEST 1: Parity With JSON Store")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        json_store = AnalysisStore(storage_dir=os.path.join(temp_dir, "json"))
+        sqlite_store = SQLiteAnalysisStore(storage_dir=os.path.join(temp_dir, "sqlite"))
+        for store in (json_store, sqlite_store):
+            _fill(store)
+            store.update_metadata("analysis_2", {"tags": ["bromodomain"], "notes": "retest"})
+            store.delete_analysis("analysis_0")
+
+        queries = [
+            {},
+            {"limit": 2},
+            {"limit": 2, "offset": 2},
+            {"search": "zinc0001"},
+            {"search": "%"},
+            {"tags": ["lead", "bromodomain"]},
+            {"project": "EGFR"},
+            {"tags": ["kinase"], "project": "egfr", "search": "analysis"},
+        ]
+        for query in queries:
+            expected = json_store.list_analyses(**query)
+            listed = sqlite_store.list_analyses(**query)
+            print(f"\n{query}: {[e['analysis_id'] for e in listed]}")
+            assert listed == expected
+
+        stats = sqlite_store.get_statistics()
+        print(f"\nStatistics: {stats}")
+        assert stats == json_store.get_statistics()
+        assert stats["best_overall_candidate"]["analysis_id"] == "analysis_1"
+        assert sqlite_store.get_all_tags() == json_store.get_all_tags()
+        assert sqlite_store.get_all_projects() == json_store.get_all_projects()
+        assert sqlite_store.get_analysis("analysis_2") == json_store.get_analysis("analysis_2")
+        assert sqlite_store.get_analysis("analysis_0") is None
+        assert not sqlite_store.delete_analysis("analysis_0")
+        assert not sqlite_store.update_metadata("analysis_0", {"notes": "gone"})
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_json_import_and_threads():
+    """Test an existing JSON store is imported and threads share the database."""
+    print("=" * 60)
+    print("TEST 2: JSON Import and Threaded Writes")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        json_store = AnalysisStore(storage_dir=temp_dir)
+        _fill(json_store)
+
+        store = SQLiteAnalysisStore(storage_dir=temp_dir)
+        print(f"\nImported: {[e['analysis_id'] for e in store.list_analyses()]}")
+        assert store.list_analyses() == json_store.list_analyses()
+
+        def save_many(worker):
+            for idx in range(20):
+                store.save_analysis(f"thread_{worker}_{idx}", _analysis(idx % 28, -6.0 - idx * 0.1))
+
+        threads = [threading.Thread(target=save_many, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = store.get_statistics()["total_analyses"]
+        print(f"After threaded writes: {total} analyses")
+        assert total == len(SCREEN) + 80
+        # A second open does not import again
+        assert SQLiteAnalysisStore(storage_dir=temp_dir).get_statistics()["total_analyses"] == total
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_save_order_and_aggregates():
+    """Test re-saves move to the front and aggregates match the JSON store under random operations."""
+    print("=" * 60)
+    print("TEST 3: Save Order and Aggregates")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="docksight_test_")
+    try:
+        rng = random.Random(5)
+        json_store = AnalysisStore(storage_dir=os.path.join(temp_dir, "json"))
+        sqlite_store = SQLiteAnalysisStore(storage_dir=os.path.join(temp_dir, "sqlite"))
+        for step in range(300):
+            ids = [e["analysis_id"] for e in json_store.list_analyses()]
+            action = rng.random()
+            if action < 0.5 or not ids:
+                # Timestamps unrelated to save order, so only the save order can match
+                idx = rng.randrange(28)
+                data = _analysis(
+                    idx, rng.choice([-9.1, -8.4, -7.5]),
+                    tags=rng.sample(["kinase", "lead", "retest"], 2),
+                    project=rng.choice(["EGFR", "egfr", "BRD4", ""]),
+                    verified=rng.random() < 0.3,
+                )
+                analysis_id = f"a{rng.randrange(40)}"
+                for store in (json_store, sqlite_store):
+                    store.save_analysis(analysis_id, json.loads(json.dumps(data)))
+            elif action < 0.75:
+                analysis_id = rng.choice(ids)
+                updates = {"tags": rng.sample(["kinase", "lead", "retest", "hit"], rng.randint(0, 3)),
+                           "project": rng.choice(["EGFR", "KRAS", ""])}
+                for store in (json_store, sqlite_store):
+                    store.update_metadata(analysis_id, dict(updates))
+            else:
+                analysis_id = rng.choice(ids)
+                for store in (json_store, sqlite_store):
+                    store.delete_analysis(analysis_id)
+
+            assert sqlite_store.list_analyses() == json_store.list_analyses(), f"order differs at step {step}"
+            assert sqlite_store.get_statistics() == json_store.get_statistics(), f"statistics differ at step {step}"
+            assert sqlite_store.get_all_tags() == json_store.get_all_tags()
+            assert sqlite_store.get_all_projects() == json_store.get_all_projects()
+
+        print(f"\nAfter 300 operations: {sqlite_store.get_statistics()}")
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("\n✓ Test 3 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("SQLITE STORE VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_matches_json_store()
+        test_json_import_and_threads()
+        test_save_order_and_aggregates()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Test script for streaming multipart upload spooling validation."""
+
+import asyncio
+import hashlib
+import os
+import sys
+import tracemalloc
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.storage.parse_cache import hash_file
+from backend.storage.upload_spool import UploadError, UploadSpool
+
+BOUNDARY = "docksightboundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+SAMPLE_PDBQT = b"""MODEL 1
+REMARK VINA RESULT:    -9.5      0.000      0.000
+ATOM      1  C   LIG A   1       1.000   2.000   3.000  1.00  0.00     0.000 C
+ENDMDL
+"""
+
+
+def _part(field, filename, content):
+    """One multipart part; ``filename=None`` for a plain form field."""
+    disposition = f'form-data; name="{field}"'
+    if filename is not None:
+        disposition += f'; filename="{filename}"'
+    header = f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode()
+    return header + content + b"\r\n"
+
+
+def _body(*parts):
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+async def _chunks(data, chunk_size):
+    """Feed a body in network-sized chunks, like ``request.stream()``."""
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset:offset + chunk_size]
+
+
+def _receive(spool, body, chunk_size=7):
+    return asyncio.run(spool.receive(CONTENT_TYPE, _chunks(body, chunk_size)))
+
+
+def _spool(**kwargs):
+    return UploadSpool(
+        allowed_extensions={"files": (".pdbqt", ".log"), "receptor": (".pdbqt", ".pdb")},
+        **kwargs
+    )
+
+
+def test_files_spooled_and_hashed():
+    """Test files land on disk by field with hashes computed while writing."""
+    print("=" * 60)
+    print("TEST 1: Spooling and Hashing")
+    print("=" * 60)
+
+    spool = _spool()
+    body = _body(
+        _part("files", "ligand_a.pdbqt", SAMPLE_PDBQT),
+        _part("files", "ligand_b.log", b"mode | affinity\n"),
+        _part("receptor", "ligand_a.pdbqt", b"RECEPTOR\n"),
+        # An optional file input left empty
+        _part("receptor", "", b""),
+        _part("note", None, b"screen 1"),
+    )
+    try:
+        files = _receive(spool, body)
+        print(f"\nSpooled: {[(f.field_name, f.filename, f.size) for f in files]}")
+
+        assert [f.filename for f in spool.files_for("files")] == ["ligand_a.pdbqt", "ligand_b.log"]
+        receptor = spool.files_for("receptor")
+        assert len(receptor) == 1 and receptor[0].path != files[0].path
+        assert spool.fields == {"note": "screen 1"}
+
+        for spooled in files:
+            with open(spooled.path, "rb") as f:
+                content = f.read()
+            assert spooled.size == len(content)
+            assert spooled.sha256 == hashlib.sha256(content).hexdigest() == hash_file(spooled.path)
+        assert spool.content_hashes()[files[0].path] == files[0].sha256
+    finally:
+        spool.cleanup()
+    assert not os.path.exists(spool.directory)
+
+    print("\n✓ Test 1 PASSED\n")
+
+
+def test_rejected_uploads():
+    """Test bad extensions, duplicates and size limits are rejected."""
+    print("=" * 60)
+    print("TEST 2: Rejected Uploads")
+    print("=" * 60)
+
+    cases = [
+        ("bad extension", {}, _body(_part("files", "ligand.sdf", b"x")), 400),
+        ("unknown field", {}, _body(_part("extra", "ligand.pdbqt", b"x")), 400),
+        ("duplicate name", {}, _body(_part("files", "a.pdbqt", b"x"), _part("files", "a.pdbqt", b"y")), 400),
+        ("file limit", {"max_file_bytes": 64}, _body(_part("files", "a.pdbqt", b"x" * 65)), 413),
+        ("request limit", {"max_request_bytes": 128}, _body(_part("files", "a.pdbqt", b"x" * 200)), 413),
+    ]
+    for label, kwargs, body, status in cases:
+        spool = _spool(**kwargs)
+        try:
+            _receive(spool, body)
+            raise AssertionError(f"{label} was accepted")
+        except UploadError as e:
+            print(f"\n{label}: {e.status_code} {e}")
+            assert e.status_code == status
+        finally:
+            spool.cleanup()
+
+    spool = _spool()
+    try:
+        asyncio.run(spool.receive("application/json", _chunks(b"{}", 2)))
+        raise AssertionError("non-multipart body was accepted")
+    except UploadError as e:
+        assert e.status_code == 400
+    finally:
+        spool.cleanup()
+
+    print("\n✓ Test 2 PASSED\n")
+
+
+def test_large_upload_memory():
+    """Test peak memory stays near one chunk for a large upload."""
+    print("=" * 60)
+    print("TEST 3: Large Upload Memory")
+    print("=" * 60)
+
+    file_bytes = 8 * 1024 * 1024
+    chunk_size = 64 * 1024
+    head = f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"files\"; filename=\"big.pdbqt\"\r\n\r\n".encode()
+    tail = f"\r\n--{BOUNDARY}--\r\n".encode()
+    block = SAMPLE_PDBQT * (chunk_size // len(SAMPLE_PDBQT))
+
+    async def stream():
+        yield head
+        sent = 0
+        while sent < file_bytes:
+            yield block
+            sent += len(block)
+        yield tail
+
+    spool = _spool()
+    try:
+        tracemalloc.start()
+        asyncio.run(spool.receive(CONTENT_TYPE, stream()))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        spooled = spool.files[0]
+        print(f"\nSpooled {spooled.size / 1e6:.1f} MB, peak traced memory {peak / 1e6:.2f} MB")
+        assert spooled.size >= file_bytes
+        assert os.path.getsize(spooled.path) == spooled.size
+        assert peak < 8 * chunk_size
+    finally:
+        spool.cleanup()
+
+    print("\n✓ Test 3 PASSED\n")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("UPLOAD SPOOL VALIDATION TESTS")
+    print("=" * 60 + "\n")
+
+    try:
+        test_files_spooled_and_hashed()
+        test_rejected_uploads()
+        test_large_upload_memory()
+
+        print("=" * 60)
+        print("ALL TESTS COMPLETED SUCCESSFULLY")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        print(f"\n✗ TEST SUITE FAILED: {str(e)}\n")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Consensus ranking of ligands docked in several runs (e.g. receptor conformations)."""
+
+import itertools
+
+import numpy as np
+from scipy.stats import rankdata
+
+# Consensus scores, all lower-is-better
+CONSENSUS_METHODS = ("mean_rank", "min_rank", "rank_product", "z_score")
+
+
+def join_runs(runs):
+    """
+    Outer hash join of per-run ligand columns on ligand name.
+
+    The union of names is built once (dict.fromkeys keeps first-seen
+    order) and every run is mapped through that dict, so the join is
+    O(total ligands) with the hashing done in C. A name listed twice in
+    one run keeps its lowest value.
+
+    Args:
+        runs: Sequence of (ligand_names, values) per run
+
+    Returns:
+        (ligand_names, (n_ligands, n_runs) float64 with NaN where missing,
+        per-run arrays mapping each input row to its joined ligand)
+    """
+    names = list(dict.fromkeys(itertools.chain.from_iterable(run_names for run_names, _ in runs)))
+    index = dict(zip(names, range(len(names))))
+    rows = [
+        np.fromiter(map(index.__getitem__, run_names), dtype=np.int64, count=len(run_names))
+        for run_names, _ in runs
+    ]
+
+    matrix = np.full((len(index), len(runs)), np.nan)
+    for column, (row, (_, values)) in enumerate(zip(rows, runs)):
+        np.fmin.at(matrix, (row, column), np.asarray(values, dtype=np.float64))
+    return names, matrix, rows
+
+
+def run_ranks(values):
+    """
+    Rank of every ligand within each run (1 is best).
+
+    Ties share the lowest rank; missing ligands stay NaN.
+    """
+    missing = np.isnan(values)
+    ranks = rankdata(np.where(missing, np.inf, values), method="min", axis=0).astype(np.float64)
+    ranks[missing] = np.nan
+    return ranks
+
+
+def consensus_scores(values):
+    """
+    Every consensus score of ligands joined across runs.
+
+    Each score aggregates only the runs a ligand appears in:
+
+    - ``mean_rank`` / ``min_rank``: mean and best per-run rank
+    - ``rank_product``: geometric mean of rank / ligands in the run
+      (rank product normalized for runs of different sizes)
+    - ``z_score``: mean of per-run standardized values (0 when a run has
+      no spread)
+
+    Args:
+        values: (n_ligands, n_runs) values, lower is better, NaN where missing
+
+    Returns:
+        (scores dict of name -> (n_ligands,) float64, ranks (n_ligands, n_runs))
+    """
+    ranks = run_ranks(values)
+    present = ~np.isnan(values)
+    runs_present = present.sum(axis=1)
+    run_sizes = present.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        z = np.where(std > 0, (values - mean) / np.where(std > 0, std, 1.0), 0.0)
+    z[~present] = 0.0
+    log_ranks = np.where(present, np.log(np.where(present, ranks, 1.0) / np.maximum(run_sizes, 1)), 0.0)
+    counts = np.maximum(runs_present, 1)
+
+    scores = {
+        "mean_rank": np.where(present, ranks, 0.0).sum(axis=1) / counts,
+        "min_rank": np.where(present, ranks, np.inf).min(axis=1),
+        "rank_product": np.exp(log_ranks.sum(axis=1) / counts),
+        "z_score": z.sum(axis=1) / counts,
+    }
+    return scores, ranks
+
+
+def consensus_order(scores, runs_present, ligand_names, method):
+    """Ligand order: present in more runs, then ``method`` score, then name."""
+    if method not in CONSENSUS_METHODS:
+        raise ValueError(f"Unknown consensus method: {method}")
+    names = np.asarray(ligand_names, dtype=str)
+    # np.lexsort sorts by the last key first
+    return np.lexsort((names, scores[method], -runs_present))
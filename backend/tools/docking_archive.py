@@ -0,0 +1,179 @@
+"""Streaming access to docking outputs packed in .zip or .tar.gz archives."""
+
+import hashlib
+import io
+import os
+import tarfile
+import zipfile
+
+ARCHIVE_EXTENSIONS = (".zip", ".tar.gz", ".tgz")
+
+# Members are addressed as "<archive path>!/<member name>", as in jar URLs.
+# The basename stays the member's own file name, so ligand names and
+# extension checks work on member paths unchanged.
+MEMBER_SEPARATOR = "!/"
+
+
+def is_archive(file_path):
+    """Whether a path names a supported archive (by extension)."""
+    return file_path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def member_path(archive_path, member_name):
+    """Path addressing one member of an archive."""
+    return f"{archive_path}{MEMBER_SEPARATOR}{member_name}"
+
+
+def split_member_path(path):
+    """(archive path, member name) of a member path; (path, None) otherwise."""
+    archive_path, separator, member_name = path.partition(MEMBER_SEPARATOR)
+    if separator and is_archive(archive_path):
+        return archive_path, member_name
+    return path, None
+
+
+class MemberTooLargeError(ValueError):
+    """An archive member holds more than the per-file upload limit."""
+
+
+class MemberReader(io.RawIOBase):
+    """
+    Binary reader over one archive member.
+
+    Hashes the bytes as they are read and refuses more than
+    ``max_member_bytes``, whatever the member's header claims.
+    """
+
+    def __init__(self, f, name, max_member_bytes=None):
+        super().__init__()
+        self._f = f
+        self.member_name = name
+        self.max_member_bytes = max_member_bytes
+        self.size = 0
+        self._hasher = hashlib.sha256()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._f.read(len(buffer))
+        self.size += len(data)
+        if self.max_member_bytes and self.size > self.max_member_bytes:
+            raise MemberTooLargeError(
+                f"Archive member {self.member_name} exceeds {self.max_member_bytes // (1024 * 1024)} MB"
+            )
+        self._hasher.update(data)
+        buffer[:len(data)] = data
+        return len(data)
+
+    def lines(self):
+        """Text lines of the member, decoded like a file opened in text mode; the reader stays open."""
+        buffered = io.BufferedReader(self)
+        text = io.TextIOWrapper(buffered, encoding="utf-8", errors="replace", newline=None)
+        try:
+            yield from text
+        finally:
+            # Detached wrappers do not close the reader, so hexdigest still works
+            text.detach()
+            buffered.detach()
+
+    def hexdigest(self):
+        """SHA-256 of the whole member; reads whatever is left unread first."""
+        while self.read(1 << 20):
+            pass
+        return self._hasher.hexdigest()
+
+    def close(self):
+        if not self.closed:
+            self._f.close()
+        super().close()
+
+
+def can_reopen_members(archive_path):
+    """Whether iter_archive_streams can open a member more than once."""
+    return archive_path.lower().endswith(".zip")
+
+
+def iter_archive_streams(archive_path, max_member_bytes=None):
+    """
+    Yield (member path, open_member) for every file in an archive, in archive order.
+
+    ``open_member()`` returns a MemberReader over the member's bytes, so a
+    member can be hashed and parsed without holding it in memory. Zip
+    members can be opened again (see can_reopen_members); gzipped tars are
+    read as a stream in a single pass, so each member opens once and only
+    until the iteration moves on. Nothing is extracted to disk. Directories
+    and OS metadata (``__MACOSX/`` forks, dotfiles) are skipped.
+
+    Raises:
+        MemberTooLargeError: While reading a member larger than ``max_member_bytes``
+        zipfile.BadZipFile, tarfile.TarError: The archive is corrupt
+    """
+    if archive_path.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or _is_metadata(info.filename):
+                    continue
+                yield member_path(archive_path, info.filename), (
+                    lambda info=info: MemberReader(archive.open(info), info.filename, max_member_bytes)
+                )
+    else:
+        # "r|gz" reads the tar as a forward-only stream; no seeking back
+        with tarfile.open(archive_path, mode="r|gz") as archive:
+            for info in archive:
+                if not info.isfile() or _is_metadata(info.name):
+                    continue
+                yield member_path(archive_path, info.name), (
+                    lambda info=info: MemberReader(archive.extractfile(info), info.name, max_member_bytes)
+                )
+
+
+def iter_archive_members(archive_path, max_member_bytes=None):
+    """
+    Yield (member path, content) for every file in an archive, in archive order.
+
+    Like iter_archive_streams, but each member is read into bytes; only the
+    current member is held in memory.
+
+    Raises:
+        MemberTooLargeError: A member is larger than ``max_member_bytes``
+        zipfile.BadZipFile, tarfile.TarError: The archive is corrupt
+    """
+    for path, open_member in iter_archive_streams(archive_path, max_member_bytes):
+        with open_member() as reader:
+            content = reader.read()
+        yield path, content
+
+
+def read_members(member_paths):
+    """
+    Content of specific archive members, in one pass per archive.
+
+    Args:
+        member_paths: Member paths, possibly from several archives
+
+    Returns:
+        Dictionary of member path -> content for the members found
+    """
+    wanted = {}
+    for path in member_paths:
+        archive_path, member_name = split_member_path(path)
+        if member_name is not None:
+            wanted.setdefault(archive_path, set()).add(path)
+
+    contents = {}
+    for archive_path, paths in wanted.items():
+        remaining = set(paths)
+        for path, content in iter_archive_members(archive_path):
+            if path in remaining:
+                contents[path] = content
+                remaining.discard(path)
+                if not remaining:
+                    break
+    return contents
+
+
+def _is_metadata(name):
+    """Archive entries written by the OS rather than by the docking run."""
+    return name.split("/", 1)[0] == "__MACOSX" or os.path.basename(name).startswith(".")
+
@@ -1,8 +1,20 @@
 """Tool for parsing docking output files."""
 
+import io
 import os
 import re
 
+from backend.tools.pose_arrays import PoseArraysBuilder
+
+
+# Vina log table row: "   1        -8.5      0.000      0.000"
+# Groups: pose number, binding affinity, rmsd l.b., rmsd u.b.
+VINA_LOG_ROW = re.compile(r"^\s+(\d+)\s+([-\d.]+)\s+([-\d.]+)\s+([-\d.]+)")
+
+# PDBQT output remark: "REMARK VINA RESULT:    -9.2      0.000      0.000"
+# Groups: binding affinity, rmsd l.b., rmsd u.b. (RMSD columns optional)
+VINA_RESULT_REMARK = re.compile(r"REMARK VINA RESULT:\s+([-\d.]+)(?:\s+([-\d.]+)\s+([-\d.]+))?")
+
 
 class DockingParser:
     """Parses docking results from various formats."""
@@ -10,33 +22,65 @@ class DockingParser:
     def __init__(self):
         self.supported_extensions = [".pdbqt", ".log"]
 
-    def parse_vina_output(self, file_path):
-        """Parse AutoDock Vina output file."""
+    def parse_vina_output(self, file_path, include_coordinates=False):
+        """Parse AutoDock Vina output file.
+
+        With ``include_coordinates`` the ATOM/HETATM records of PDBQT files
+        are collected into a ``PoseArrays`` under the "pose_arrays" key
+        during the same pass.
+        """
         if not self.validate_format(file_path):
             return {"error": f"Unsupported file format: {file_path}"}
 
         try:
+            # Stream line by line so large virtual-screen outputs are never
+            # loaded into memory as a whole
             with open(file_path, "r") as f:
-                content = f.read()
+                return self.parse_vina_stream(f, file_path, include_coordinates)
+
+        except FileNotFoundError:
+            return {"error": f"File not found: {file_path}"}
+        except Exception as e:
+            return {"error": f"Failed to parse {file_path}: {str(e)}"}
 
-            ligand_name = self._extract_ligand_name(file_path, content)
-            poses = self._extract_poses_from_content(content)
+    def parse_vina_content(self, content, file_path, include_coordinates=False):
+        """Parse AutoDock Vina output already in memory, e.g. an archive member.
 
-            if not poses:
-                return {"error": f"No valid poses found in {file_path}"}
+        ``content`` is the raw bytes of the file; ``file_path`` names it for
+        the ligand name and error messages.
+        """
+        if not self.validate_format(file_path):
+            return {"error": f"Unsupported file format: {file_path}"}
 
-            return {
-                "ligand_name": ligand_name,
-                "file_path": file_path,
-                "poses": poses,
-                "num_poses": len(poses),
-            }
+        try:
+            # newline=None translates line endings like a file opened in text mode
+            lines = io.StringIO(content.decode("utf-8", "replace"), newline=None)
+            return self.parse_vina_stream(lines, file_path, include_coordinates)
 
-        except FileNotFoundError:
-            return {"error": f"File not found: {file_path}"}
         except Exception as e:
             return {"error": f"Failed to parse {file_path}: {str(e)}"}
 
+    def parse_vina_stream(self, lines, file_path, include_coordinates=False):
+        """Parse AutoDock Vina output from an iterable of lines."""
+        ligand_name = self._extract_ligand_name(file_path, None)
+        builder = PoseArraysBuilder() if include_coordinates else None
+        poses = self._extract_poses_from_lines(lines, builder)
+
+        if not poses:
+            return {"error": f"No valid poses found in {file_path}"}
+
+        result = {
+            "ligand_name": ligand_name,
+            "file_path": file_path,
+            "poses": poses,
+            "num_poses": len(poses),
+        }
+
+        if builder is not None:
+            result["pose_arrays"] = builder.build()
+
+        return result
+
     def extract_binding_scores(self, parsed_data):
         """Extract binding affinity scores from parsed data."""
         if "error" in parsed_data:
@@ -81,45 +125,55 @@ class DockingParser:
 
     def _extract_poses_from_content(self, content):
         """Extract poses and binding affinities from file content."""
-        poses = []
-
-        # Parse Vina log format: "   1        -8.5      0.000      0.000"
-        # Pattern matches pose number and binding affinity
-        pattern = r"^\s+(\d+)\s+([-\d.]+)\s+([-\d.]+)\s+([-\d.]+)"
-
-        for line in content.split("\n"):
-            match = re.match(pattern, line)
-            if match:
-                pose_id = int(match.group(1))
-                binding_affinity = float(match.group(2))
-
-                poses.append({
-                    "pose_id": pose_id,
-                    "binding_affinity": binding_affinity,
-                })
-
-        # If no log format found, try PDBQT format
-        if not poses:
-            poses = self._extract_poses_from_pdbqt(content)
-
-        return poses
-
-    def _extract_poses_from_pdbqt(self, content):
-        """Extract poses from PDBQT format."""
-        poses = []
-        pose_id = 0
-
-        # Look for REMARK lines with VINA RESULT
-        pattern = r"REMARK VINA RESULT:\s+([-\d.]+)"
-
-        for line in content.split("\n"):
-            match = re.search(pattern, line)
-            if match:
-                pose_id += 1
-                binding_affinity = float(match.group(1))
-                poses.append({
-                    "pose_id": pose_id,
-                    "binding_affinity": binding_affinity,
-                })
-
-        return poses
+        return self._extract_poses_from_lines(content.split("\n"))
+
+    def _extract_poses_from_lines(self, lines, builder=None):
+        """Extract poses and binding affinities in a single pass over lines.
+
+        Vina log rows take priority over PDBQT ``REMARK VINA RESULT`` lines.
+        Once a log row is seen the format is fixed to "log" and remark
+        lines are no longer inspected. If a ``PoseArraysBuilder`` is given,
+        MODEL and ATOM/HETATM records are fed to it as they are read.
+        """
+        log_poses = []
+        pdbqt_poses = []
+        file_format = None
+
+        match_log_row = VINA_LOG_ROW.match
+        search_remark = VINA_RESULT_REMARK.search
+
+        for line in lines:
+            if builder is not None:
+                if line.startswith(("ATOM", "HETATM")):
+                    builder.add_atom_line(line)
+                    continue
+                if line.startswith("MODEL"):
+                    builder.start_model()
+                    continue
+
+            # Log rows always start with whitespace, ATOM/REMARK records never do
+            if line[:1].isspace():
+                match = match_log_row(line)
+                if match:
+                    file_format = "log"
+                    log_poses.append({
+                        "pose_id": int(match.group(1)),
+                        "binding_affinity": float(match.group(2)),
+                        "rmsd_lb": float(match.group(3)),
+                        "rmsd_ub": float(match.group(4)),
+                    })
+                    continue
+
+            if file_format != "log" and "VINA RESULT" in line:
+                match = search_remark(line)
+                if match:
+                    file_format = "pdbqt"
+                    rmsd_lb, rmsd_ub = match.group(2, 3)
+                    pdbqt_poses.append({
+                        "pose_id": len(pdbqt_poses) + 1,
+                        "binding_affinity": float(match.group(1)),
+                        "rmsd_lb": float(rmsd_lb) if rmsd_lb else 0.0,
+                        "rmsd_ub": float(rmsd_ub) if rmsd_ub else 0.0,
+                    })
+
+        return log_poses if file_format == "log" else pdbqt_poses
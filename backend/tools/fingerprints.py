@@ -0,0 +1,211 @@
+"""Interaction fingerprints packed into uint64 words, with Tanimoto search."""
+
+import hashlib
+
+import numpy as np
+
+from backend.tools.interactions import INTERACTION_TYPES
+
+
+WORD_BITS = 64
+
+# Per-byte popcount table for NumPy builds without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def popcount(words):
+    """Number of set bits per fingerprint (row) of a uint64 array."""
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(words.shape[:-1] + (-1,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def tanimoto(query, fingerprints, fingerprint_counts=None):
+    """
+    Tanimoto similarity of one packed fingerprint against many.
+
+    Args:
+        query: (n_words,) uint64 fingerprint
+        fingerprints: (n, n_words) uint64 fingerprints
+        fingerprint_counts: Precomputed popcount(fingerprints), optional
+
+    Returns:
+        (n,) float64 scores; two empty fingerprints score 0
+    """
+    if fingerprint_counts is None:
+        fingerprint_counts = popcount(fingerprints)
+    common = popcount(fingerprints & query)
+    union = fingerprint_counts + popcount(query) - common
+    return np.divide(common, union, out=np.zeros(len(common), dtype=np.float64), where=union > 0)
+
+
+def top_k_similar(scores, k):
+    """Indices of the ``k`` highest scores, best first (ties by index)."""
+    if k >= len(scores):
+        return np.lexsort((np.arange(len(scores)), -scores))
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+class InteractionFingerprinter:
+    """Maps interactions onto a fixed residue x interaction-type bit layout.
+
+    Bit ``r * len(INTERACTION_TYPES) + t`` is set when residue ``r`` of the
+    receptor takes part in an interaction of type ``t``. Fingerprints built
+    from the same residue list are comparable.
+    """
+
+    def __init__(self, residues):
+        self.residues = list(residues)
+        self._bit_of = {
+            (residue, interaction_type): r * len(INTERACTION_TYPES) + t
+            for r, residue in enumerate(self.residues)
+            for t, interaction_type in enumerate(INTERACTION_TYPES)
+        }
+        self.num_bits = len(self._bit_of)
+        self.num_words = max(1, -(-self.num_bits // WORD_BITS))
+
+    @property
+    def vocabulary_key(self):
+        """Short hash of the residue layout, shared by comparable fingerprints."""
+        return hashlib.sha256("\n".join(self.residues).encode("utf-8")).hexdigest()[:16]
+
+    def encode(self, interaction_residues):
+        """
+        Pack (interaction type, residue) pairs into uint64 words.
+
+        Args:
+            interaction_residues: Pairs from InteractionAnalyzer.interaction_residues
+
+        Returns:
+            (num_words,) uint64 fingerprint; unknown residues are ignored
+        """
+        words = np.zeros(self.num_words, dtype=np.uint64)
+        for interaction_type, residue in interaction_residues:
+            bit = self._bit_of.get((residue, interaction_type))
+            if bit is not None:
+                words[bit // WORD_BITS] |= np.uint64(1) << np.uint64(bit % WORD_BITS)
+        return words
+
+    def decode(self, words):
+        """(interaction type, residue) pairs of the set bits of a fingerprint."""
+        bits = np.flatnonzero(np.unpackbits(words.astype("<u8").view(np.uint8), bitorder="little"))
+        n_types = len(INTERACTION_TYPES)
+        return [
+            (INTERACTION_TYPES[bit % n_types], self.residues[bit // n_types])
+            for bit in bits.tolist() if bit < self.num_bits
+        ]
+
+
+class FingerprintSet:
+    """Fingerprints of the best poses of one analysis, stored column-wise."""
+
+    def __init__(self, residues, ligand_names, pose_ids, words):
+        self.residues = list(residues)
+        self.ligand_names = list(ligand_names)
+        self.pose_ids = np.asarray(pose_ids, dtype=np.int64)
+        self.words = np.asarray(words, dtype=np.uint64)  # (n_ligands, n_words)
+        self._counts = None
+
+    @property
+    def fingerprinter(self):
+        """Fingerprinter with this set's residue layout."""
+        return InteractionFingerprinter(self.residues)
+
+    @property
+    def vocabulary_key(self):
+        """Residue layout key; only sets with equal keys are comparable."""
+        return self.fingerprinter.vocabulary_key
+
+    @property
+    def counts(self):
+        """Popcount of every fingerprint, computed once."""
+        if self._counts is None:
+            self._counts = popcount(self.words)
+        return self._counts
+
+    def __len__(self):
+        return len(self.ligand_names)
+
+    def fingerprint(self, ligand_name):
+        """Fingerprint of a ligand's best pose, or None if absent."""
+        try:
+            return self.words[self.ligand_names.index(ligand_name)]
+        except ValueError:
+            return None
+
+    def save(self, path):
+        """Write to an uncompressed .npz file."""
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                residues=np.array(self.residues, dtype=str),
+                ligand_names=np.array(self.ligand_names, dtype=str),
+                pose_ids=self.pose_ids,
+                words=self.words,
+            )
+
+    @classmethod
+    def load(cls, path):
+        """Read a set written by save."""
+        with np.load(path) as data:
+            return cls(
+                residues=data["residues"].tolist(),
+                ligand_names=data["ligand_names"].tolist(),
+                pose_ids=data["pose_ids"],
+                words=data["words"],
+            )
+
+
+def search_fingerprint_sets(query, vocabulary_key, fingerprint_sets, limit=10, min_score=0.0, exclude=None):
+    """
+    Rank the poses of many fingerprint sets by Tanimoto similarity to a query.
+
+    Args:
+        query: (n_words,) uint64 reference fingerprint
+        vocabulary_key: Residue layout of the query; other layouts are skipped
+        fingerprint_sets: Iterable of (analysis_id, FingerprintSet)
+        limit: Maximum number of hits
+        min_score: Drop hits scoring below this
+        exclude: (analysis_id, ligand_name) left out of the hits, e.g. the query itself
+
+    Returns:
+        Hits sorted by descending score
+    """
+    owners, sets = [], []
+    for analysis_id, fingerprint_set in fingerprint_sets:
+        if len(fingerprint_set) and fingerprint_set.vocabulary_key == vocabulary_key:
+            owners.append(analysis_id)
+            sets.append(fingerprint_set)
+    if not sets:
+        return []
+
+    # One packed matrix so the whole search is a single vectorized pass
+    words = np.concatenate([s.words for s in sets])
+    counts = np.concatenate([s.counts for s in sets])
+    set_offsets = np.cumsum([0] + [len(s) for s in sets])
+
+    scores = tanimoto(query, words, counts)
+    if exclude is not None:
+        for set_index, analysis_id in enumerate(owners):
+            if analysis_id == exclude[0]:
+                names = sets[set_index].ligand_names
+                rows = [set_offsets[set_index] + i for i, name in enumerate(names) if name == exclude[1]]
+                # Below any real score, so excluded rows sort last
+                scores[rows] = -1.0
+
+    hits = []
+    for row in top_k_similar(scores, limit).tolist():
+        if scores[row] < min_score or scores[row] < 0:
+            break
+        set_index = int(np.searchsorted(set_offsets, row, side="right") - 1)
+        local = row - set_offsets[set_index]
+        hits.append({
+            "analysis_id": owners[set_index],
+            "ligand_name": sets[set_index].ligand_names[local],
+            "pose_id": int(sets[set_index].pose_ids[local]),
+            "tanimoto": round(float(scores[row]), 4),
+        })
+    return hits
@@ -0,0 +1,260 @@
+"""Vectorized interaction analysis over stacked ligand poses."""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from backend.tools.interactions import (
+    AUTODOCK_ACCEPTOR_NITROGENS,
+    COVALENT_H_CUTOFF,
+    HBOND_CUTOFF,
+    HBOND_MIN_ANGLE,
+    HYDROPHOBIC_CUTOFF,
+    HYDROPHOBIC_MAX_CHARGE,
+    INTERACTION_TYPES,
+    MAX_CUTOFF,
+    NEGATIVE_OXYGEN_CHARGE,
+    POSITIVE_NITROGEN_CHARGE,
+    SALT_BRIDGE_CUTOFF,
+    _element,
+)
+from backend.tools.pose_arrays import AUTODOCK_ATOM_TYPES
+
+HYDROGEN_BOND, HYDROPHOBIC_CONTACT, SALT_BRIDGE = range(len(INTERACTION_TYPES))
+
+# Ligand atoms per radius query; bounds the size of the candidate pair arrays
+DEFAULT_BLOCK_ATOMS = 50_000
+
+# Shift between poses when pairing hydrogens, far beyond any bond length
+_POSE_SEPARATION = 1.0e4
+
+# Per-code element flags, indexed by AutoDock type code
+_CODE_ELEMENTS = np.array([_element(t) for t in AUTODOCK_ATOM_TYPES], dtype=object)
+_CODE_IS_H = _CODE_ELEMENTS == "H"
+_CODE_IS_C = _CODE_ELEMENTS == "C"
+_CODE_IS_N = _CODE_ELEMENTS == "N"
+_CODE_IS_O = _CODE_ELEMENTS == "O"
+_CODE_IS_ACCEPTOR_N = np.isin(np.array(AUTODOCK_ATOM_TYPES, dtype=object), AUTODOCK_ACCEPTOR_NITROGENS)
+
+
+class InteractionTable:
+    """Columnar interactions of many poses, sorted by pose.
+
+    ``ligand_atom`` indexes the stacked ligand arrays the table was built
+    from; ``receptor_atom`` indexes the receptor. ``interaction_type`` holds
+    positions in INTERACTION_TYPES.
+    """
+
+    def __init__(self, pose_index, ligand_atom, receptor_atom, interaction_type, distance, num_poses):
+        self.pose_index = pose_index  # (n,) int64
+        self.ligand_atom = ligand_atom  # (n,) int64
+        self.receptor_atom = receptor_atom  # (n,) int64
+        self.interaction_type = interaction_type  # (n,) uint8
+        self.distance = distance  # (n,) float32
+        self.num_poses = num_poses
+
+    def __len__(self):
+        return len(self.pose_index)
+
+    def pose_rows(self, pose_index):
+        """Row slice of the interactions of one pose."""
+        start, end = np.searchsorted(self.pose_index, [pose_index, pose_index + 1])
+        return slice(int(start), int(end))
+
+    def counts_by_pose(self):
+        """(num_poses, len(INTERACTION_TYPES)) interaction counts."""
+        flat = self.pose_index * len(INTERACTION_TYPES) + self.interaction_type
+        counts = np.bincount(flat, minlength=self.num_poses * len(INTERACTION_TYPES))
+        return counts.reshape(self.num_poses, len(INTERACTION_TYPES))
+
+    def type_names(self):
+        """Interaction type names of every row."""
+        return [INTERACTION_TYPES[code] for code in self.interaction_type.tolist()]
+
+
+def _ligand_typing(atom_types, charges, atom_offsets, coordinates):
+    """Vectorized donor/acceptor/hydrophobic/charge flags for stacked poses."""
+    codes = np.asarray(atom_types, dtype=np.intp)
+    is_h, is_c = _CODE_IS_H[codes], _CODE_IS_C[codes]
+    is_n, is_o = _CODE_IS_N[codes], _CODE_IS_O[codes]
+    acceptor_n = _CODE_IS_ACCEPTOR_N[codes]
+    n_atoms = len(codes)
+
+    pose_of_atom = np.repeat(np.arange(len(atom_offsets) - 1), np.diff(atom_offsets))
+
+    # Pair polar hydrogens with N/O of the same pose: shifting every pose far
+    # apart lets one KD-tree query cover all poses without cross-pose pairs
+    hydrogen_index = np.full(n_atoms, -1, dtype=np.int64)
+    heavy = np.flatnonzero(is_n | is_o)
+    hydrogens = np.flatnonzero(is_h)
+    if len(heavy) and len(hydrogens):
+        trees = []
+        for rows in (hydrogens, heavy):
+            shifted = coordinates[rows].astype(np.float64)
+            shifted[:, 0] += pose_of_atom[rows] * _POSE_SEPARATION
+            trees.append(cKDTree(shifted))
+        pairs = trees[0].sparse_distance_matrix(trees[1], COVALENT_H_CUTOFF, output_type="ndarray")
+        hydrogen_index[heavy[pairs["j"]]] = hydrogens[pairs["i"]]
+
+    # Poses without explicit hydrogens let every N/O donate (as TypedAtoms)
+    pose_has_h = np.bincount(pose_of_atom[is_h], minlength=len(atom_offsets) - 1) > 0
+    implicit = ~pose_has_h[pose_of_atom]
+    is_donor = (hydrogen_index >= 0) | (implicit & ((is_n & ~acceptor_n) | is_o))
+
+    charges = np.asarray(charges, dtype=np.float64)
+    charge_sign = np.zeros(n_atoms, dtype=np.int8)
+    charge_sign[is_n & (charges >= POSITIVE_NITROGEN_CHARGE)] = 1
+    charge_sign[is_o & (charges <= NEGATIVE_OXYGEN_CHARGE)] = -1
+
+    return {
+        "is_hydrogen": is_h,
+        "hydrogen_index": hydrogen_index,
+        "is_donor": is_donor,
+        "is_acceptor": is_o | acceptor_n,
+        "is_hydrophobic": is_c & (np.abs(charges) < HYDROPHOBIC_MAX_CHARGE),
+        "charge_sign": charge_sign,
+        "pose_of_atom": pose_of_atom,
+    }
+
+
+def _donor_angles(donor_xyz, hydrogen_xyz, acceptor_xyz):
+    """Donor-H...acceptor angles in degrees for arrays of triples."""
+    h_to_donor = donor_xyz - hydrogen_xyz
+    h_to_acceptor = acceptor_xyz - hydrogen_xyz
+    cosine = np.einsum("ij,ij->i", h_to_donor, h_to_acceptor) / (
+        np.linalg.norm(h_to_donor, axis=1) * np.linalg.norm(h_to_acceptor, axis=1)
+    )
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+def _closest_per_residue(lig_idx, rec_idx, distances, residue_index):
+    """Keep the shortest pair per (ligand atom, receptor residue)."""
+    if len(lig_idx) == 0:
+        return np.zeros(0, dtype=np.intp)
+    residues = residue_index[rec_idx]
+    order = np.lexsort((distances, residues, lig_idx))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (lig_idx[order][1:] != lig_idx[order][:-1]) | (residues[order][1:] != residues[order][:-1])
+    return order[first]
+
+
+def analyze_pose_batch(receptor, coordinates, atom_types, charges, atom_offsets,
+                       block_atoms=DEFAULT_BLOCK_ATOMS):
+    """
+    Interactions of every pose against one receptor, in vectorized blocks.
+
+    Applies the same rules as InteractionAnalyzer.analyze_pose (for ligands
+    typed from AutoDock codes and charges).
+
+    Args:
+        receptor: Prepared ReceptorIndex
+        coordinates: (n_atoms, 3) stacked ligand coordinates
+        atom_types: (n_atoms,) AutoDock type codes
+        charges: (n_atoms,) partial charges
+        atom_offsets: (n_poses + 1,) pose -> atom rows (PoseArrays.model_offsets
+            or PoseStoreReader.atom_offsets)
+        block_atoms: Approximate number of ligand atoms per radius query
+
+    Returns:
+        InteractionTable sorted by pose
+    """
+    atom_offsets = np.asarray(atom_offsets, dtype=np.int64)
+    num_poses = len(atom_offsets) - 1
+    # Rows outside the offsets (e.g. other ligands of a store) are ignored;
+    # slicing keeps memory-mapped inputs as views
+    base = int(atom_offsets[0])
+    atom_offsets = atom_offsets - base
+    total = int(atom_offsets[-1])
+    coordinates = np.asarray(coordinates).reshape(-1, 3)[base:base + total]
+    atom_types = np.asarray(atom_types)[base:base + total]
+    charges = np.asarray(charges)[base:base + total]
+
+    ligand = _ligand_typing(atom_types, charges, atom_offsets, coordinates)
+    residue_index = receptor.residue_indices()
+
+    columns = {name: [] for name in ("pose_index", "ligand_atom", "receptor_atom", "interaction_type", "distance")}
+
+    # Deduplication keys on global ligand atoms, so blocks may split poses
+    block_atoms = max(1, block_atoms)
+    for start in range(0, total, block_atoms):
+        block = coordinates[start:start + block_atoms].astype(np.float64)
+        lig_idx, rec_idx, distances = receptor.neighbor_pairs(block, MAX_CUTOFF)
+        lig_idx = lig_idx.astype(np.int64) + start
+        rec_idx = rec_idx.astype(np.int64)
+
+        for code, (keep_lig, keep_rec, keep_dist) in enumerate((
+            _hydrogen_bond_pairs(ligand, receptor, coordinates, lig_idx, rec_idx, distances),
+            _hydrophobic_pairs(ligand, receptor, residue_index, lig_idx, rec_idx, distances),
+            _salt_bridge_pairs(ligand, receptor, residue_index, lig_idx, rec_idx, distances),
+        )):
+            columns["pose_index"].append(ligand["pose_of_atom"][keep_lig])
+            columns["ligand_atom"].append(keep_lig + base)
+            columns["receptor_atom"].append(keep_rec)
+            columns["interaction_type"].append(np.full(len(keep_lig), code, dtype=np.uint8))
+            columns["distance"].append(keep_dist.astype(np.float32))
+
+    dtypes = {"pose_index": np.int64, "ligand_atom": np.int64, "receptor_atom": np.int64,
+              "interaction_type": np.uint8, "distance": np.float32}
+    merged = {
+        name: np.concatenate(parts) if parts else np.zeros(0, dtype=dtypes[name])
+        for name, parts in columns.items()
+    }
+
+    # Stable order: pose, type, distance, ligand atom, receptor atom
+    order = np.lexsort((
+        merged["receptor_atom"], merged["ligand_atom"], merged["distance"],
+        merged["interaction_type"], merged["pose_index"],
+    ))
+    return InteractionTable(num_poses=num_poses, **{name: values[order] for name, values in merged.items()})
+
+
+def _hydrogen_bond_pairs(ligand, receptor, coordinates, lig_idx, rec_idx, distances):
+    """Donor/acceptor pairs within the H-bond cutoff passing the angle test."""
+    ligand_donates = ligand["is_donor"][lig_idx] & receptor.is_acceptor[rec_idx]
+    receptor_donates = receptor.is_donor[rec_idx] & ligand["is_acceptor"][lig_idx] & ~ligand_donates
+    keep = (
+        (distances <= HBOND_CUTOFF)
+        & (ligand_donates | receptor_donates)
+        & ~ligand["is_hydrogen"][lig_idx]
+        & ~receptor.is_hydrogen[rec_idx]
+    )
+    lig_idx, rec_idx, distances = lig_idx[keep], rec_idx[keep], distances[keep]
+    ligand_donates = ligand_donates[keep]
+
+    # Angle test wherever the donor has an explicit hydrogen
+    lig_h = ligand["hydrogen_index"][lig_idx]
+    rec_h = receptor.hydrogen_index[rec_idx]
+    hydrogen = np.where(ligand_donates, lig_h, rec_h)
+    has_h = hydrogen >= 0
+    passes = np.ones(len(lig_idx), dtype=bool)
+
+    for donates, donor_xyz, h_xyz, acceptor_xyz in (
+        (ligand_donates, coordinates[lig_idx], coordinates[np.maximum(lig_h, 0)], receptor.coordinates[rec_idx]),
+        (~ligand_donates, receptor.coordinates[rec_idx], receptor.coordinates[np.maximum(rec_h, 0)], coordinates[lig_idx]),
+    ):
+        check = donates & has_h
+        if check.any():
+            passes[check] = _donor_angles(donor_xyz[check], h_xyz[check], acceptor_xyz[check]) >= HBOND_MIN_ANGLE
+
+    return lig_idx[passes], rec_idx[passes], distances[passes]
+
+
+def _hydrophobic_pairs(ligand, receptor, residue_index, lig_idx, rec_idx, distances):
+    """Closest carbon-carbon contact per ligand atom and residue."""
+    keep = (
+        (distances <= HYDROPHOBIC_CUTOFF)
+        & ligand["is_hydrophobic"][lig_idx]
+        & receptor.is_hydrophobic[rec_idx]
+    )
+    lig_idx, rec_idx, distances = lig_idx[keep], rec_idx[keep], distances[keep]
+    rows = _closest_per_residue(lig_idx, rec_idx, distances, residue_index)
+    return lig_idx[rows], rec_idx[rows], distances[rows]
+
+
+def _salt_bridge_pairs(ligand, receptor, residue_index, lig_idx, rec_idx, distances):
+    """Closest oppositely charged pair per ligand atom and residue."""
+    lig_sign = ligand["charge_sign"][lig_idx].astype(np.int16)
+    rec_sign = receptor.charge_sign[rec_idx].astype(np.int16)
+    keep = (distances <= SALT_BRIDGE_CUTOFF) & (lig_sign * rec_sign < 0)
+    lig_idx, rec_idx, distances = lig_idx[keep], rec_idx[keep], distances[keep]
+    rows = _closest_per_residue(lig_idx, rec_idx, distances, residue_index)
+    return lig_idx[rows], rec_idx[rows], distances[rows]
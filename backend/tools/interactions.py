@@ -1,28 +1,502 @@
 """Tool for analyzing molecular interactions."""
 
+import numpy as np
+from scipy.spatial import cKDTree
+
+from backend.tools.pose_arrays import AUTODOCK_ATOM_TYPES
+
+
+# Distance cutoffs in Angstroms
+HBOND_CUTOFF = 3.5
+HYDROPHOBIC_CUTOFF = 4.5
+SALT_BRIDGE_CUTOFF = 4.0
+MAX_CUTOFF = max(HBOND_CUTOFF, HYDROPHOBIC_CUTOFF, SALT_BRIDGE_CUTOFF)
+
+# Polar hydrogen to heavy atom bond length upper bound
+COVALENT_H_CUTOFF = 1.2
+# Minimum donor-H...acceptor angle when hydrogens are available (degrees)
+HBOND_MIN_ANGLE = 120.0
+
+# Carbons with larger Gasteiger charges are bonded to heteroatoms
+HYDROPHOBIC_MAX_CHARGE = 0.15
+# Ligand partial charge thresholds for formal-charge groups
+POSITIVE_NITROGEN_CHARGE = 0.3
+NEGATIVE_OXYGEN_CHARGE = -0.5
+
+# AutoDock types that do not start with their element symbol
+AUTODOCK_ELEMENTS = {
+    "A": "C", "NA": "N", "NS": "N", "OA": "O", "OS": "O", "SA": "S",
+    "HD": "H", "HS": "H", "CL": "Cl", "BR": "Br", "MG": "Mg", "CA": "Ca",
+    "MN": "Mn", "FE": "Fe", "ZN": "Zn", "G0": "C", "G1": "C", "G2": "C",
+    "G3": "C", "CG0": "C", "CG1": "C", "CG2": "C", "CG3": "C",
+}
+AUTODOCK_ACCEPTOR_NITROGENS = ("NA", "NS")
+
+NEGATIVE_RESIDUES = {"ASP", "GLU"}
+POSITIVE_RESIDUES = {"LYS", "ARG", "HIS"}
+BACKBONE_ATOMS = {"N", "CA", "C", "O", "OXT"}
+SOLVENT_RESIDUES = {"HOH", "WAT"}
+
+INTERACTION_TYPES = ("hydrogen_bonds", "hydrophobic_contacts", "salt_bridges")
+
+
+def _element(atom_type):
+    """Element symbol of an AutoDock or plain atom type."""
+    atom_type = atom_type.rstrip("+-")
+    return AUTODOCK_ELEMENTS.get(atom_type, atom_type[:1].upper() + atom_type[1:].lower())
+
+
+def _residue_number(field):
+    """Residue sequence number of a PDB(QT) resSeq field.
+
+    Numbers past 9999 are written in hybrid-36 ("A000" is 10000); blank or
+    unreadable fields give 0.
+    """
+    field = field.strip()
+    try:
+        return int(field)
+    except ValueError:
+        pass
+    try:
+        value = int(field, 36)
+    except ValueError:
+        return 0
+    width = len(field)
+    if field[:1].isupper():
+        return value - 10 * 36 ** (width - 1) + 10 ** width
+    return value + 16 * 36 ** (width - 1) + 10 ** width
+
+
+def _charge_suffix(atom_type):
+    """Formal charge sign written as a type suffix ("N+", "O-")."""
+    if atom_type.endswith("+"):
+        return 1
+    if atom_type.endswith("-"):
+        return -1
+    return 0
+
+
+class TypedAtoms:
+    """Coordinates plus interaction typing for a set of atoms.
+
+    Used for both receptors and ligand poses. Hydrogens are kept for
+    donor detection and H-bond angles but never form interactions.
+    """
+
+    def __init__(self, coordinates, atom_types, charges=None, residue_names=None,
+                 residue_ids=None, atom_names=None, atom_ids=None):
+        n_atoms = len(atom_types)
+        self.coordinates = np.asarray(coordinates, dtype=np.float64).reshape(n_atoms, 3)
+        self.atom_types = list(atom_types)
+        self.elements = np.array([_element(t) for t in self.atom_types], dtype=object)
+        self.charges = None if charges is None else np.asarray(charges, dtype=np.float64)
+        self.residue_names = residue_names
+        self.residue_ids = residue_ids
+        self.atom_names = atom_names
+        self.atom_ids = list(atom_ids) if atom_ids is not None else list(range(1, n_atoms + 1))
+
+        is_n = self.elements == "N"
+        is_o = self.elements == "O"
+        is_c = self.elements == "C"
+        self.is_hydrogen = self.elements == "H"
+        acceptor_type = np.array([t in AUTODOCK_ACCEPTOR_NITROGENS for t in self.atom_types], dtype=bool)
+
+        # Donors: N/O carrying a polar hydrogen. Without explicit hydrogens
+        # every N/O may donate.
+        self.hydrogen_index = np.full(n_atoms, -1, dtype=np.int64)
+        if self.is_hydrogen.any():
+            heavy = np.flatnonzero(is_n | is_o)
+            hydrogens = np.flatnonzero(self.is_hydrogen)
+            if len(heavy):
+                pairs = cKDTree(self.coordinates[hydrogens]).sparse_distance_matrix(
+                    cKDTree(self.coordinates[heavy]), COVALENT_H_CUTOFF, output_type="ndarray"
+                )
+                self.hydrogen_index[heavy[pairs["j"]]] = hydrogens[pairs["i"]]
+            self.is_donor = self.hydrogen_index >= 0
+        else:
+            self.is_donor = (is_n & ~acceptor_type) | is_o
+        self.is_acceptor = is_o | acceptor_type
+
+        self.is_hydrophobic = is_c.copy()
+        if self.charges is not None:
+            self.is_hydrophobic &= np.abs(self.charges) < HYDROPHOBIC_MAX_CHARGE
+        if atom_names is not None:
+            self.is_hydrophobic &= ~np.isin(np.asarray(atom_names, dtype=object), ["C", "CA"])
+
+        self.charge_sign = np.array([_charge_suffix(t) for t in self.atom_types], dtype=np.int8)
+        implicit = self.charge_sign == 0
+        if residue_names is not None:
+            residues = np.asarray(residue_names, dtype=object)
+            sidechain = np.ones(n_atoms, dtype=bool)
+            if atom_names is not None:
+                sidechain = ~np.isin(np.asarray(atom_names, dtype=object), list(BACKBONE_ATOMS))
+            negative = np.isin(residues, list(NEGATIVE_RESIDUES)) & is_o & sidechain
+            positive = np.isin(residues, list(POSITIVE_RESIDUES)) & is_n & sidechain
+            self.charge_sign[implicit & negative] = -1
+            self.charge_sign[implicit & positive] = 1
+        elif self.charges is not None:
+            self.charge_sign[implicit & is_n & (self.charges >= POSITIVE_NITROGEN_CHARGE)] = 1
+            self.charge_sign[implicit & is_o & (self.charges <= NEGATIVE_OXYGEN_CHARGE)] = -1
+
+    def __len__(self):
+        return len(self.atom_types)
+
+    def residue_label(self, idx):
+        """Residue label such as "SER195"."""
+        return f"{self.residue_names[idx]}{self.residue_ids[idx]}"
+
+    def atom_label(self, idx):
+        """Per-atom label: "SER195_N" for receptors, "ligand_O1" for ligands."""
+        if self.residue_names is not None:
+            name = self.atom_names[idx] if self.atom_names is not None else self.elements[idx]
+            return f"{self.residue_label(idx)}_{name}"
+        return f"ligand_{self.ligand_atom_label(idx)}"
+
+    def ligand_atom_label(self, idx):
+        """Short ligand atom label such as "C3" or "N+1"."""
+        return f"{self.atom_types[idx] if self.charge_sign[idx] else self.elements[idx]}{self.atom_ids[idx]}"
+
+
+class ReceptorIndex(TypedAtoms):
+    """Typed receptor atoms with a KD-tree, built once per receptor."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tree = cKDTree(self.coordinates)
+        positions = {label: idx for idx, label in enumerate(self.residue_labels())}
+        self._residue_indices = np.array(
+            [positions[self.residue_label(idx)] for idx in range(len(self))], dtype=np.int64
+        )
+
+    @classmethod
+    def from_atoms(cls, protein_atoms):
+        """Build from a list of atom dicts (atom_type, residue, residue_id, x, y, z)."""
+        return cls(
+            coordinates=[(a["x"], a["y"], a["z"]) for a in protein_atoms],
+            atom_types=[a["atom_type"] for a in protein_atoms],
+            charges=[a["charge"] for a in protein_atoms] if all("charge" in a for a in protein_atoms) else None,
+            residue_names=[a.get("residue", "UNK") for a in protein_atoms],
+            residue_ids=[a.get("residue_id", 0) for a in protein_atoms],
+            atom_names=[a["atom_name"] for a in protein_atoms] if all("atom_name" in a for a in protein_atoms) else None,
+        )
+
+    @classmethod
+    def from_pdbqt(cls, file_path):
+        """Build from ATOM/HETATM records of a receptor PDBQT (or PDB) file."""
+        coordinates, atom_types, charges = [], [], []
+        residue_names, residue_ids, atom_names = [], [], []
+        has_charges = True
+        # PDBQT carries the AutoDock type in columns 78-79; PDB the element in 77-78
+        type_columns = slice(77, 79) if str(file_path).lower().endswith(".pdbqt") else slice(76, 78)
+
+        with open(file_path, "r") as f:
+            for line in f:
+                if not line.startswith(("ATOM", "HETATM")):
+                    continue
+                residue_name = line[17:20].strip()
+                if residue_name in SOLVENT_RESIDUES:
+                    continue
+
+                atom_name = line[12:16].strip()
+                coordinates.append((float(line[30:38]), float(line[38:46]), float(line[46:54])))
+                atom_types.append(line[type_columns].strip() or atom_name[:1])
+                residue_names.append(residue_name)
+                residue_ids.append(_residue_number(line[22:26]))
+                atom_names.append(atom_name)
+                try:
+                    charges.append(float(line[68:76]))
+                except ValueError:
+                    has_charges = False
+
+        if not coordinates:
+            raise ValueError(f"No receptor atoms found in {file_path}")
+
+        return cls(
+            coordinates=coordinates,
+            atom_types=atom_types,
+            charges=charges if has_charges else None,
+            residue_names=residue_names,
+            residue_ids=residue_ids,
+            atom_names=atom_names,
+        )
+
+    def residue_labels(self):
+        """Unique residue labels in file order (the fingerprint layout)."""
+        return list(dict.fromkeys(self.residue_label(idx) for idx in range(len(self))))
+
+    def residue_indices(self):
+        """Per-atom position of the residue in residue_labels()."""
+        return self._residue_indices
+
+    def neighbor_pairs(self, coordinates, radius):
+        """All (query atom, receptor atom, distance) pairs within ``radius``."""
+        pairs = cKDTree(coordinates).sparse_distance_matrix(self.tree, radius, output_type="ndarray")
+        return pairs["i"], pairs["j"], pairs["v"]
+
 
 class InteractionAnalyzer:
     """Analyzes molecular interactions from docking poses."""
 
-    def __init__(self):
-        pass
+    def __init__(self, receptor=None, receptor_cache=None):
+        # ReceptorIndex used when pose_data does not carry protein atoms
+        self.receptor = receptor
+        # Optional ReceptorCache shared across analyzers and analyses
+        self.receptor_cache = receptor_cache
+        self._cached_protein_atoms = None
+        self._cached_receptor = None
+
+    def load_receptor(self, file_path):
+        """Prepare (or reuse) the receptor index used for subsequent poses."""
+        if self.receptor_cache is not None:
+            self.receptor = self.receptor_cache.prepare(file_path)
+        else:
+            self.receptor = ReceptorIndex.from_pdbqt(file_path)
+        return self.receptor
 
     def extract_hydrogen_bonds(self, pose_data):
         """Extract hydrogen bond interactions from pose."""
-        pass
+        ligand, receptor = self._prepare(pose_data)
+        return self._hydrogen_bonds(ligand, receptor, *receptor.neighbor_pairs(ligand.coordinates, HBOND_CUTOFF))
 
     def extract_hydrophobic_contacts(self, pose_data):
         """Extract hydrophobic interactions from pose."""
-        pass
+        ligand, receptor = self._prepare(pose_data)
+        pairs = receptor.neighbor_pairs(ligand.coordinates, HYDROPHOBIC_CUTOFF)
+        return self._hydrophobic_contacts(ligand, receptor, *pairs)
 
     def extract_salt_bridges(self, pose_data):
         """Extract salt bridge interactions from pose."""
-        pass
+        ligand, receptor = self._prepare(pose_data)
+        return self._salt_bridges(ligand, receptor, *receptor.neighbor_pairs(ligand.coordinates, SALT_BRIDGE_CUTOFF))
+
+    def analyze_pose(self, pose_data):
+        """Extract all interaction types with a single radius query."""
+        ligand, receptor = self._prepare(pose_data)
+        pairs = receptor.neighbor_pairs(ligand.coordinates, MAX_CUTOFF)
+        return {
+            "ligand_name": pose_data.get("ligand_name"),
+            "pose_id": pose_data.get("pose_id"),
+            "hydrogen_bonds": self._hydrogen_bonds(ligand, receptor, *pairs),
+            "hydrophobic_contacts": self._hydrophobic_contacts(ligand, receptor, *pairs),
+            "salt_bridges": self._salt_bridges(ligand, receptor, *pairs),
+        }
+
+    def analyze_poses(self, coordinates, atom_types, charges, atom_offsets, block_atoms=None):
+        """
+        Analyze many stacked poses against self.receptor in one call.
+
+        Args:
+            coordinates: (n_atoms, 3) ligand coordinates of all poses
+            atom_types: (n_atoms,) AutoDock type codes
+            charges: (n_atoms,) partial charges
+            atom_offsets: (n_poses + 1,) pose -> atom rows
+            block_atoms: Ligand atoms per vectorized block (default engine value)
+
+        Returns:
+            Columnar InteractionTable
+        """
+        from backend.tools.interaction_engine import DEFAULT_BLOCK_ATOMS, analyze_pose_batch
+
+        if self.receptor is None:
+            raise ValueError("No receptor available for interaction analysis")
+        return analyze_pose_batch(
+            self.receptor, coordinates, atom_types, charges, atom_offsets,
+            block_atoms=block_atoms or DEFAULT_BLOCK_ATOMS
+        )
 
     def summarize_interactions(self, interactions):
         """Summarize all interactions for a ligand."""
-        pass
+        counts = {name: len(interactions.get(name, [])) for name in INTERACTION_TYPES}
+        return {
+            "ligand_name": interactions.get("ligand_name"),
+            "total_interactions": sum(counts.values()),
+            **counts,
+            # Unique, in order of first appearance
+            "key_residues": list(dict.fromkeys(
+                residue for _, residue in self.interaction_residues(interactions)
+            )),
+        }
+
+    def interaction_residues(self, interactions):
+        """(interaction type, receptor residue) pair of every interaction."""
+        pairs = []
+        for hbond in interactions.get("hydrogen_bonds", []):
+            for label in (hbond.get("donor"), hbond.get("acceptor")):
+                if label and not label.startswith("ligand_"):
+                    pairs.append(("hydrogen_bonds", label.split("_")[0]))
+        for name in ("hydrophobic_contacts", "salt_bridges"):
+            for contact in interactions.get(name, []):
+                if contact.get("protein_residue"):
+                    pairs.append((name, contact["protein_residue"]))
+        return pairs
 
     def compare_interaction_profiles(self, ligand_interactions):
-        """Compare interaction profiles across multiple ligands."""
-        pass
+        """
+        Compare interaction profiles across multiple ligands.
+
+        Profiles may hold interaction lists (analyze_pose output) or plain
+        counts per interaction type. When every profile carries a packed
+        "fingerprint", pairwise Tanimoto similarities are added.
+        """
+        if not ligand_interactions:
+            return None
+
+        names = [profile.get("ligand_name") for profile in ligand_interactions]
+        counts = np.array([
+            [
+                value if isinstance(value, (int, np.integer)) else len(value or [])
+                for value in (profile.get(name, 0) for name in INTERACTION_TYPES)
+            ]
+            for profile in ligand_interactions
+        ], dtype=np.float64)
+
+        # Diversity: Shannon entropy of the interaction type distribution
+        totals = counts.sum(axis=1, keepdims=True)
+        fractions = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropy = -np.where(fractions > 0, fractions * np.log(fractions), 0.0).sum(axis=1)
+
+        comparison = {
+            "most_hydrogen_bonds": names[int(np.argmax(counts[:, 0]))],
+            "most_hydrophobic": names[int(np.argmax(counts[:, 1]))],
+            "most_salt_bridges": names[int(np.argmax(counts[:, 2]))],
+            "most_diverse": names[int(np.argmax(entropy))],
+        }
+
+        if all(profile.get("fingerprint") is not None for profile in ligand_interactions):
+            from backend.tools.fingerprints import tanimoto
+
+            words = np.array([profile["fingerprint"] for profile in ligand_interactions], dtype=np.uint64)
+            comparison["tanimoto_matrix"] = [
+                np.round(tanimoto(row, words), 4).tolist() for row in words
+            ]
+        return comparison
+
+    def _prepare(self, pose_data):
+        """Resolve typed ligand atoms and the receptor index for a pose."""
+        receptor = pose_data.get("receptor") or self._receptor_from_atoms(pose_data.get("protein_atoms"))
+        if receptor is None:
+            receptor = self.receptor
+        if receptor is None:
+            raise ValueError("No receptor available for interaction analysis")
+        return self._ligand_atoms(pose_data), receptor
+
+    def _receptor_from_atoms(self, protein_atoms):
+        """Build (or reuse) the index for a list of protein atom dicts."""
+        if not protein_atoms:
+            return None
+        # Holding a reference keeps id() unique while the entry is cached
+        if self._cached_protein_atoms is not protein_atoms:
+            self._cached_receptor = ReceptorIndex.from_atoms(protein_atoms)
+            self._cached_protein_atoms = protein_atoms
+        return self._cached_receptor
+
+    def _ligand_atoms(self, pose_data):
+        """Typed ligand atoms from atom dicts or parsed pose arrays."""
+        if "ligand_atoms" in pose_data:
+            atoms = pose_data["ligand_atoms"]
+            return TypedAtoms(
+                coordinates=[(a["x"], a["y"], a["z"]) for a in atoms],
+                atom_types=[a["atom_type"] for a in atoms],
+                charges=[a["charge"] for a in atoms] if all("charge" in a for a in atoms) else None,
+                atom_ids=[a.get("atom_id", idx + 1) for idx, a in enumerate(atoms)],
+            )
+
+        # PoseArrays slices: coordinates, uint8 type codes, charges
+        return TypedAtoms(
+            coordinates=pose_data["coordinates"],
+            atom_types=[AUTODOCK_ATOM_TYPES[code] for code in pose_data["atom_types"]],
+            charges=pose_data.get("charges"),
+        )
+
+    def _hydrogen_bonds(self, ligand, receptor, lig_idx, rec_idx, distances):
+        """Donor/acceptor pairs within the H-bond cutoff."""
+        within = distances <= HBOND_CUTOFF
+        lig_idx, rec_idx, distances = lig_idx[within], rec_idx[within], distances[within]
+
+        ligand_donates = ligand.is_donor[lig_idx] & receptor.is_acceptor[rec_idx]
+        receptor_donates = receptor.is_donor[rec_idx] & ligand.is_acceptor[lig_idx] & ~ligand_donates
+        keep = (ligand_donates | receptor_donates) & ~ligand.is_hydrogen[lig_idx] & ~receptor.is_hydrogen[rec_idx]
+
+        hbonds = []
+        for l, r, distance, lig_donor in zip(
+            lig_idx[keep].tolist(), rec_idx[keep].tolist(), distances[keep].tolist(), ligand_donates[keep].tolist()
+        ):
+            if lig_donor:
+                angle = self._donor_angle(ligand, l, receptor.coordinates[r])
+                donor, acceptor = ligand.atom_label(l), receptor.atom_label(r)
+            else:
+                angle = self._donor_angle(receptor, r, ligand.coordinates[l])
+                donor, acceptor = receptor.atom_label(r), ligand.atom_label(l)
+
+            if angle is not None and angle < HBOND_MIN_ANGLE:
+                continue
+
+            hbonds.append({
+                "donor": donor,
+                "acceptor": acceptor,
+                "distance": round(distance, 2),
+                "angle": None if angle is None else round(angle, 1),
+            })
+        return hbonds
+
+    def _donor_angle(self, atoms, donor_idx, acceptor_xyz):
+        """Donor-H...acceptor angle in degrees, or None without hydrogens."""
+        h_idx = atoms.hydrogen_index[donor_idx]
+        if h_idx < 0:
+            return None
+        h_to_donor = atoms.coordinates[donor_idx] - atoms.coordinates[h_idx]
+        h_to_acceptor = acceptor_xyz - atoms.coordinates[h_idx]
+        cosine = np.dot(h_to_donor, h_to_acceptor) / (
+            np.linalg.norm(h_to_donor) * np.linalg.norm(h_to_acceptor)
+        )
+        return float(np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0))))
+
+    def _hydrophobic_contacts(self, ligand, receptor, lig_idx, rec_idx, distances):
+        """Closest carbon-carbon contact per ligand atom and residue."""
+        keep = (
+            (distances <= HYDROPHOBIC_CUTOFF)
+            & ligand.is_hydrophobic[lig_idx]
+            & receptor.is_hydrophobic[rec_idx]
+        )
+        return [
+            {
+                "ligand_atom": ligand.ligand_atom_label(l),
+                "protein_residue": residue,
+                "distance": round(distance, 2),
+            }
+            for l, residue, distance in self._closest_per_residue(
+                receptor, lig_idx[keep], rec_idx[keep], distances[keep]
+            )
+        ]
+
+    def _salt_bridges(self, ligand, receptor, lig_idx, rec_idx, distances):
+        """Oppositely charged atom pairs within the salt bridge cutoff."""
+        lig_sign = ligand.charge_sign[lig_idx].astype(np.int16)
+        rec_sign = receptor.charge_sign[rec_idx].astype(np.int16)
+        keep = (distances <= SALT_BRIDGE_CUTOFF) & (lig_sign * rec_sign < 0)
+
+        return [
+            {
+                "ligand_atom": ligand.ligand_atom_label(l),
+                "protein_residue": residue,
+                "distance": round(distance, 2),
+                "charge_ligand": "+" if ligand.charge_sign[l] > 0 else "-",
+                "charge_protein": "-" if ligand.charge_sign[l] > 0 else "+",
+            }
+            for l, residue, distance in self._closest_per_residue(
+                receptor, lig_idx[keep], rec_idx[keep], distances[keep]
+            )
+        ]
+
+    def _closest_per_residue(self, receptor, lig_idx, rec_idx, distances):
+        """(ligand atom, residue, distance) of the shortest pair per atom and residue."""
+        closest = {}
+        for l, r, distance in zip(lig_idx.tolist(), rec_idx.tolist(), distances.tolist()):
+            key = (l, receptor.residue_label(r))
+            if key not in closest or distance < closest[key]:
+                closest[key] = distance
+        return sorted(
+            ((l, residue, distance) for (l, residue), distance in closest.items()),
+            key=lambda item: item[2],
+        )
@@ -0,0 +1,192 @@
+"""Non-dominated sorting and crowding distance for multi-objective ranking."""
+
+import bisect
+
+import numpy as np
+
+# Points tested together against a front; bounds the (front, chunk) matrices
+DEFAULT_CHUNK_POINTS = 128
+
+
+def non_dominated_sort(objectives, chunk_points=DEFAULT_CHUNK_POINTS):
+    """
+    Pareto front of every point, with all objectives minimized.
+
+    Points are visited in lexicographic order, so a point can only be
+    dominated by points before it. Two objectives use an O(N log N) sweep;
+    more objectives use efficient non-dominated sorting with binary search
+    over fronts (ENS-BS), testing a chunk of points at a time against
+    objective ranks packed into uint64 words.
+
+    Args:
+        objectives: (n_points, n_objectives) values, lower is better; NaN
+            counts as the worst value
+        chunk_points: Points per vectorized dominance test
+
+    Returns:
+        (n_points,) int64 front index, 0 for the non-dominated set
+    """
+    values = np.asarray(objectives, dtype=np.float64)
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64)
+    values = np.where(np.isnan(values), np.inf, values)
+
+    # Identical points share a front; np.unique also sorts lexicographically
+    unique, inverse = np.unique(values, axis=0, return_inverse=True)
+    if unique.shape[1] == 1:
+        fronts = np.arange(len(unique), dtype=np.int64)
+    elif unique.shape[1] == 2:
+        fronts = _two_objective_fronts(unique[:, 1])
+    else:
+        fronts = _ens_bs(unique[:, 1:], max(1, chunk_points))
+    return fronts[inverse.ravel()]
+
+
+def _two_objective_fronts(second):
+    """Fronts of unique points sorted by (first, second) objective.
+
+    Within a front the second objective strictly decreases, so each front
+    is summarized by its last value, and those values increase from front
+    to front: a point joins the first front whose last value exceeds its
+    own (one bisection per point).
+    """
+    tails = []
+    fronts = np.empty(len(second), dtype=np.int64)
+    for idx, value in enumerate(second.tolist()):
+        front = bisect.bisect_right(tails, value)
+        if front == len(tails):
+            tails.append(value)
+        else:
+            tails[front] = value
+        fronts[idx] = front
+    return fronts
+
+
+def _pack_ranks(columns):
+    """
+    Dense per-column ranks packed into uint64 words.
+
+    Every field carries a guard bit above the rank, so ``q <= p`` holds in
+    all fields of a word exactly when ``((p | guard) - q) & guard == guard``:
+    a subtraction per word replaces one comparison per objective.
+
+    Returns:
+        (words (n_points, n_words) uint64, guard (n_words,) uint64)
+    """
+    ranks = [np.unique(column, return_inverse=True)[1].ravel() for column in columns.T]
+    width = max(int(rank.max()) for rank in ranks).bit_length() + 1
+    per_word = 64 // width
+    n_words = -(-len(ranks) // per_word)
+
+    words = np.zeros((len(columns), n_words), dtype=np.uint64)
+    guard = np.zeros(n_words, dtype=np.uint64)
+    for column, rank in enumerate(ranks):
+        word, field = divmod(column, per_word)
+        words[:, word] |= rank.astype(np.uint64) << np.uint64(field * width)
+        guard[word] |= np.uint64(1 << (field * width + width - 1))
+    return words, guard
+
+
+def _dominates(words, guarded, guard):
+    """(len(words), len(guarded)) matrix: point q weakly dominates point p."""
+    return (((guarded[None, :, :] - words[:, None, :]) & guard) == guard).all(axis=2)
+
+
+def _ens_bs(rest, chunk_points):
+    """ENS-BS fronts of unique, lexicographically sorted points.
+
+    ``rest`` holds every objective but the first (already ordered). A point
+    dominated by a member of front k is dominated by a member of every
+    earlier front, so binary search finds its front.
+    """
+    words, guard = _pack_ranks(rest)
+    guarded = words | guard
+    fronts = []  # packed members of each front
+    front_of = np.empty(len(words), dtype=np.int64)
+
+    for start in range(0, len(words), chunk_points):
+        chunk = slice(start, start + chunk_points)
+        points = guarded[chunk]
+
+        # Binary search over fronts of earlier chunks, all points in lockstep
+        lo = np.zeros(len(points), dtype=np.int64)
+        hi = np.full(len(points), len(fronts), dtype=np.int64)
+        while True:
+            active = np.flatnonzero(lo < hi)
+            if len(active) == 0:
+                break
+            mid = (lo[active] + hi[active]) // 2
+            for front in np.unique(mid).tolist():
+                rows = active[mid == front]
+                dominated = _dominates(fronts[front], points[rows], guard).any(axis=0)
+                lo[rows[dominated]] = front + 1
+                hi[rows[~dominated]] = front
+
+        # Earlier points of the same chunk push a point to later fronts;
+        # relax along dominance chains until nothing changes
+        within = np.triu(_dominates(words[chunk], points, guard), 1)
+        front = lo
+        while True:
+            relaxed = np.maximum(lo, np.where(within, front[:, None] + 1, 0).max(axis=0))
+            if np.array_equal(relaxed, front):
+                break
+            front = relaxed
+
+        front_of[chunk] = front
+        for value in np.unique(front).tolist():
+            members = words[chunk][front == value]
+            if value < len(fronts):
+                fronts[value] = np.concatenate([fronts[value], members])
+            else:
+                fronts.append(members)
+
+    return front_of
+
+
+def crowding_distance(objectives, fronts):
+    """
+    NSGA-II crowding distance of every point within its front.
+
+    Each objective contributes the gap between a point's neighbors in the
+    front, normalized by the front's range; the extremes of each objective
+    get infinity. NaN values are treated as the column's worst value.
+
+    Args:
+        objectives: (n_points, n_objectives) values, lower is better
+        fronts: (n_points,) front index from non_dominated_sort
+
+    Returns:
+        (n_points,) float64 crowding distance
+    """
+    values = np.array(objectives, dtype=np.float64)
+    fronts = np.asarray(fronts, dtype=np.int64)
+    n_points, n_objectives = values.shape
+    distance = np.zeros(n_points)
+    if n_points == 0:
+        return distance
+
+    for column in range(n_objectives):
+        missing = np.isnan(values[:, column])
+        if missing.any():
+            worst = np.nanmax(values[:, column]) if not missing.all() else 0.0
+            values[missing, column] = worst
+
+        order = np.lexsort((values[:, column], fronts))
+        sorted_values = values[order, column]
+        sorted_fronts = fronts[order]
+
+        first = np.ones(n_points, dtype=bool)
+        first[1:] = sorted_fronts[1:] != sorted_fronts[:-1]
+        last = np.ones(n_points, dtype=bool)
+        last[:-1] = first[1:]
+
+        segment = np.cumsum(first) - 1
+        span = (sorted_values[last] - sorted_values[first])[segment]
+        interior = np.flatnonzero(~first & ~last & (span > 0))
+
+        contribution = np.zeros(n_points)
+        contribution[interior] = (sorted_values[interior + 1] - sorted_values[interior - 1]) / span[interior]
+        contribution[first | last] = np.inf
+        distance[order] += contribution
+
+    return distance
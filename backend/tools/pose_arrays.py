@@ -0,0 +1,133 @@
+"""Compact per-atom arrays for docked poses."""
+
+from array import array
+
+import numpy as np
+
+
+# AutoDock 4 / Vina atom types. Codes are positions in this tuple and are
+# stable across files, so arrays from different ligands can be stacked.
+AUTODOCK_ATOM_TYPES = (
+    "X",  # unknown type
+    "H", "HD", "HS", "C", "A", "N", "NA", "NS", "OA", "OS", "F", "Mg", "MG",
+    "P", "SA", "S", "Cl", "CL", "Ca", "CA", "Mn", "MN", "Fe", "FE", "Zn", "ZN",
+    "Br", "BR", "I", "Si", "B", "Se", "Z", "G", "GA", "J", "Q",
+    "G0", "G1", "G2", "G3", "CG0", "CG1", "CG2", "CG3", "W",
+)
+
+ATOM_TYPE_CODES = {name: code for code, name in enumerate(AUTODOCK_ATOM_TYPES)}
+
+UNKNOWN_ATOM_TYPE = 0
+
+
+class PoseArrays:
+    """Atom coordinates, charges and types for all poses of one ligand.
+
+    Atoms of every MODEL are stored back to back. Pose ``i`` owns the rows
+    ``model_offsets[i]:model_offsets[i + 1]`` of each per-atom array; a
+    MODEL without atoms is an empty slice, so poses keep their positions.
+    """
+
+    def __init__(self, coordinates, charges, atom_types, model_offsets):
+        self.coordinates = coordinates  # (n_atoms, 3) float32
+        self.charges = charges  # (n_atoms,) float32
+        self.atom_types = atom_types  # (n_atoms,) uint8 codes into AUTODOCK_ATOM_TYPES
+        self.model_offsets = model_offsets  # (n_poses + 1,) int64
+
+    @property
+    def num_poses(self):
+        """Number of MODEL blocks."""
+        return len(self.model_offsets) - 1
+
+    @property
+    def num_atoms(self):
+        """Total number of atoms across all poses."""
+        return len(self.coordinates)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the arrays."""
+        return (
+            self.coordinates.nbytes + self.charges.nbytes
+            + self.atom_types.nbytes + self.model_offsets.nbytes
+        )
+
+    def pose_slice(self, pose_index):
+        """Row slice of the atoms belonging to a pose (0-based)."""
+        return slice(int(self.model_offsets[pose_index]), int(self.model_offsets[pose_index + 1]))
+
+    def pose_coordinates(self, pose_index):
+        """Coordinates of a single pose as an (n_atoms, 3) view."""
+        return self.coordinates[self.pose_slice(pose_index)]
+
+    def pose_charges(self, pose_index):
+        """Partial charges of a single pose."""
+        return self.charges[self.pose_slice(pose_index)]
+
+    def pose_atom_types(self, pose_index):
+        """AutoDock atom type codes of a single pose."""
+        return self.atom_types[self.pose_slice(pose_index)]
+
+    def atom_type_names(self, codes=None):
+        """Translate atom type codes back to AutoDock type names."""
+        if codes is None:
+            codes = self.atom_types
+        return [AUTODOCK_ATOM_TYPES[code] for code in codes]
+
+
+class PoseArraysBuilder:
+    """Accumulates ATOM/HETATM records while a file is being streamed."""
+
+    def __init__(self):
+        self._coordinates = array("f")
+        self._charges = array("f")
+        self._atom_types = array("B")
+        self._model_offsets = []
+        self._num_atoms = 0
+
+    def start_model(self):
+        """Mark the start of a MODEL block."""
+        self._model_offsets.append(self._num_atoms)
+
+    def add_atom_line(self, line):
+        """Append the coordinates, charge and type of an ATOM/HETATM line."""
+        if not self._model_offsets:
+            # Single-pose files may omit MODEL records
+            self.start_model()
+
+        try:
+            x = float(line[30:38])
+            y = float(line[38:46])
+            z = float(line[46:54])
+            charge = float(line[68:76])
+            atom_type = line[77:79].strip()
+        except ValueError:
+            # Fall back to whitespace fields for non column-aligned files
+            fields = line.split()
+            try:
+                x, y, z = float(fields[-7]), float(fields[-6]), float(fields[-5])
+                charge = float(fields[-2])
+                atom_type = fields[-1]
+            except (ValueError, IndexError):
+                # Truncated or malformed record (e.g. the last line of a cut-off file)
+                return
+
+        self._coordinates.extend((x, y, z))
+        self._charges.append(charge)
+        self._atom_types.append(ATOM_TYPE_CODES.get(atom_type, UNKNOWN_ATOM_TYPE))
+        self._num_atoms += 1
+
+    def build(self):
+        """Return the collected PoseArrays, or None if no atoms were seen."""
+        if not self._num_atoms:
+            return None
+
+        # Empty MODEL blocks stay as zero-length slices so pose i is still MODEL i
+        offsets = self._model_offsets + [self._num_atoms]
+
+        return PoseArrays(
+            coordinates=np.frombuffer(self._coordinates, dtype=np.float32).reshape(-1, 3),
+            charges=np.frombuffer(self._charges, dtype=np.float32),
+            atom_types=np.frombuffer(self._atom_types, dtype=np.uint8),
+            model_offsets=np.asarray(offsets, dtype=np.int64),
+        )
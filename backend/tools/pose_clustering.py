@@ -0,0 +1,145 @@
+"""Pairwise pose RMSD and per-ligand pose clustering."""
+
+from collections import defaultdict
+
+import numpy as np
+
+# Poses closer than this (Angstroms) share a binding mode
+DEFAULT_CLUSTER_RMSD = 2.0
+
+# Ligands per RMSD block; bounds the (block, poses, poses) working set
+DEFAULT_BLOCK_LIGANDS = 1024
+
+
+def pairwise_rmsd(coordinates):
+    """
+    Symmetric RMSD matrices for stacked poses of equal size.
+
+    Poses of one ligand share atom order (as in Vina output), so no
+    alignment or symmetry correction is applied.
+
+    Args:
+        coordinates: (n_poses, n_atoms, 3) or (n_ligands, n_poses, n_atoms, 3)
+
+    Returns:
+        (n_poses, n_poses) or (n_ligands, n_poses, n_poses) float64 RMSD
+    """
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    n_atoms = coordinates.shape[-2]
+    flat = coordinates.reshape(coordinates.shape[:-2] + (n_atoms * 3,))
+
+    # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, one batched matmul per block
+    squared = np.einsum("...i,...i->...", flat, flat)
+    gram = flat @ np.swapaxes(flat, -1, -2)
+    distances = squared[..., :, None] + squared[..., None, :] - 2.0 * gram
+    # Rounding leaves matmul results slightly asymmetric; make ties exact
+    distances = 0.5 * (distances + np.swapaxes(distances, -1, -2))
+    diagonal = np.arange(distances.shape[-1])
+    distances[..., diagonal, diagonal] = 0.0
+    return np.sqrt(np.maximum(distances, 0.0) / n_atoms)
+
+
+def leader_clusters(rmsd, threshold=DEFAULT_CLUSTER_RMSD):
+    """
+    Leader clustering of poses given in rank order, for many ligands at once.
+
+    Each pose, best first, joins the first earlier leader within
+    ``threshold`` or becomes a new leader.
+
+    Args:
+        rmsd: (n_ligands, n_poses, n_poses) RMSD matrices
+        threshold: Maximum RMSD to a leader
+
+    Returns:
+        (n_ligands, n_poses) index of each pose's leader
+    """
+    n_ligands, n_poses, _ = rmsd.shape
+    labels = np.full((n_ligands, n_poses), -1, dtype=np.int64)
+    for pose in range(n_poses):
+        leader = labels[:, pose] < 0
+        labels[leader, pose] = pose
+        joins = leader[:, None] & (labels < 0) & (rmsd[:, pose, :] <= threshold)
+        labels[joins] = pose
+    return labels
+
+
+class PoseClusters:
+    """Clustering summary per ligand of a PoseTable.
+
+    ``representative_row`` is the pose row (into the table's pose columns)
+    of the medoid of the best pose's cluster.
+    """
+
+    def __init__(self, cluster_size, representative_row, from_coordinates):
+        self.cluster_size = cluster_size  # (n_ligands,) int64
+        self.representative_row = representative_row  # (n_ligands,) int64
+        self.from_coordinates = from_coordinates  # (n_ligands,) bool, False for rmsd_lb
+
+
+def _best_cluster(rmsd, labels):
+    """Size and medoid pose of the cluster led by the best pose (index 0)."""
+    members = labels == 0
+    spread = np.where(members[:, :, None] & members[:, None, :], rmsd, 0.0).sum(axis=2)
+    spread[~members] = np.inf
+    return members.sum(axis=1), np.argmin(spread, axis=1)
+
+
+def cluster_pose_table(table, threshold=DEFAULT_CLUSTER_RMSD, block_ligands=DEFAULT_BLOCK_LIGANDS):
+    """
+    Cluster the poses of every ligand of a PoseTable.
+
+    Ligands with coordinates for all poses are clustered by pairwise RMSD,
+    batched by (pose count, atom count) and processed in blocks, so memory
+    stays bounded by the block size. Other ligands fall back to the Vina
+    ``rmsd_lb`` column (RMSD from the best mode).
+
+    Args:
+        table: PoseTable
+        threshold: Cluster RMSD cutoff in Angstroms
+        block_ligands: Ligands per RMSD block
+
+    Returns:
+        PoseClusters aligned with the table's ligands
+    """
+    n_ligands = table.num_ligands
+    offsets = table.pose_offsets
+    counts = table.pose_counts
+
+    # Rank order inside each ligand: ΔG, then pose id
+    order = np.lexsort((table.pose_ids, table.affinities, np.repeat(np.arange(n_ligands), counts)))
+    best_rows = order[offsets[:-1]]
+
+    # rmsd_lb fallback: poses within the cutoff of Vina's best mode, which
+    # is the best pose represented by itself
+    rmsd_lb = table.rmsd_lb if table.rmsd_lb is not None else np.zeros(table.num_poses)
+    close = (rmsd_lb <= threshold).astype(np.int64)
+    cluster_size = np.add.reduceat(close, offsets[:-1]) if n_ligands else np.zeros(0, dtype=np.int64)
+    representative_row = best_rows.copy()
+    from_coordinates = np.zeros(n_ligands, dtype=bool)
+
+    groups = defaultdict(list)
+    for ligand, arrays in enumerate(table.pose_arrays or ()):
+        if arrays is None or arrays.num_poses < counts[ligand]:
+            continue
+        sizes = np.diff(arrays.model_offsets[:counts[ligand] + 1])
+        if sizes[0] > 0 and np.all(sizes == sizes[0]):
+            groups[(int(counts[ligand]), int(sizes[0]))].append(ligand)
+
+    for (n_poses, n_atoms), ligands in groups.items():
+        for start in range(0, len(ligands), block_ligands):
+            block = ligands[start:start + block_ligands]
+            # Pose rows in rank order, relative to each ligand's first pose
+            ranked = np.stack([order[offsets[l]:offsets[l + 1]] - offsets[l] for l in block])
+            coordinates = np.stack([
+                table.pose_arrays[l].coordinates[:n_poses * n_atoms].reshape(n_poses, n_atoms, 3)[ranked[i]]
+                for i, l in enumerate(block)
+            ])
+            rmsd = pairwise_rmsd(coordinates)
+            size, medoid = _best_cluster(rmsd, leader_clusters(rmsd, threshold))
+
+            block = np.asarray(block)
+            cluster_size[block] = size
+            representative_row[block] = offsets[block] + ranked[np.arange(len(block)), medoid]
+            from_coordinates[block] = True
+
+    return PoseClusters(cluster_size, representative_row, from_coordinates)
@@ -1,65 +1,270 @@
 """Tool for ranking and comparing ligands."""
 
+import heapq
+import math
+
+import numpy as np
+
+from backend.tools.consensus import CONSENSUS_METHODS, consensus_order, consensus_scores, join_runs
+from backend.tools.pose_clustering import DEFAULT_CLUSTER_RMSD, cluster_pose_table
+from backend.tools.ranking_engine import (
+    PARETO_OBJECTIVES,
+    PoseTable,
+    ligand_objectives,
+    rank_pose_table,
+    select_best_poses,
+)
+
+# Bin width (kcal/mol) of the affinity histogram reported by top-K ranking
+AFFINITY_HISTOGRAM_BIN = 0.5
+
+# RT at 298.15 K in kcal/mol, used to turn ΔΔG into a Kd ratio
+RT_KCAL_PER_MOL = 0.5925
+
+# Ligand orderings: by docking ΔG, by rescored ΔG, or by Pareto front
+RANKING_KEYS = ("binding_affinity", "rescored_affinity", "pareto")
+
 
 class LigandRanker:
     """Ranks ligands based on binding affinity and other criteria."""
 
-    def __init__(self):
-        pass
+    def __init__(self, cluster_rmsd=DEFAULT_CLUSTER_RMSD, rescorer=None, rank_key="binding_affinity",
+                 pareto_objectives=tuple(PARETO_OBJECTIVES), receptor=None):
+        if rank_key not in RANKING_KEYS:
+            raise ValueError(f"Unknown ranking key: {rank_key}")
+        unknown = [name for name in pareto_objectives if name not in PARETO_OBJECTIVES]
+        if unknown:
+            raise ValueError(f"Unknown Pareto objectives: {', '.join(unknown)}")
+        # RMSD cutoff (Angstroms) for grouping poses into binding modes
+        self.cluster_rmsd = cluster_rmsd
+        # Optional VinaRescorer; adds rescored_affinity to ranked ligands
+        self.rescorer = rescorer
+        self.rank_key = rank_key
+        # Objectives of the Pareto mode; interaction counts need the receptor
+        self.pareto_objectives = tuple(pareto_objectives)
+        self.receptor = receptor
+
+    def _rescoring_error(self):
+        """Error list when the ranking key needs a rescorer that is missing."""
+        if self.rank_key == "rescored_affinity" and self.rescorer is None:
+            return ["Ranking by rescored affinity requires a receptor"]
+        return []
+
+    def _rank_table(self, table, scores=None):
+        """Cluster, rescore (unless per-pose ``scores`` are given) and order the ligands of a PoseTable."""
+        clusters = cluster_pose_table(table, self.cluster_rmsd)
+        if scores is None and self.rescorer is not None:
+            scores = self.rescorer.score_pose_table(table)
+        objectives = None
+        if self.rank_key == "pareto":
+            objectives = ligand_objectives(table, clusters, self.pareto_objectives, self.receptor)
+        return rank_pose_table(table, clusters, scores=scores, order_by=self.rank_key, objectives=objectives)
 
     def rank_by_binding_affinity(self, parsed_docking_results):
         """Rank ligands by binding affinity scores."""
         if not parsed_docking_results:
             return {"ranked_ligands": [], "errors": ["No docking results to rank"]}
+        if self._rescoring_error():
+            return {"ranked_ligands": [], "errors": self._rescoring_error()}
 
-        best_poses = self._select_best_poses(parsed_docking_results)
-        
-        if not best_poses:
-            return {"ranked_ligands": [], "errors": ["No valid poses found for ranking"]}
+        # Best pose per ligand and the final order are computed on flat
+        # NumPy columns; ties break on ligand name, then pose id
+        table = PoseTable.from_parsed_results(parsed_docking_results)
 
-        # Sort by binding affinity (ascending, most negative = best)
-        ranked = sorted(best_poses, key=lambda x: x["binding_affinity"])
+        if table.num_ligands == 0:
+            return {"ranked_ligands": [], "errors": ["No valid poses found for ranking"]}
 
         return {
-            "ranked_ligands": ranked,
+            "ranked_ligands": self._rank_table(table),
             "errors": [],
         }
 
-    def _select_best_poses(self, parsed_docking_results):
-        """Select the best pose per ligand (lowest ΔG)."""
-        best_poses = []
-        errors = []
+    def rank_consensus(self, results_by_run, method="rank_product"):
+        """Consensus ranking of ligands docked in several runs.
 
-        for result in parsed_docking_results:
-            ligand_name = result.get("ligand_name")
-            poses = result.get("poses", [])
+        ``results_by_run`` maps a run id (receptor conformation, docking
+        run) to that run's parsed results or PoseTable. Each run is reduced
+        to its best ΔG per ligand, runs are joined on ligand name and every
+        CONSENSUS_METHODS score is computed on the joined matrix; ligands
+        docked in more runs come first, then the ``method`` score decides.
+        Entries carry ``run_affinities`` and ``run_ranks`` in run order.
+        Rescoring and Pareto keys do not apply: a rescorer is bound to one
+        receptor.
+        """
+        if method not in CONSENSUS_METHODS:
+            return {"ranked_ligands": [], "errors": [f"Unknown consensus method: {method}"]}
+        if len(results_by_run) < 2:
+            return {"ranked_ligands": [], "errors": ["Consensus ranking needs at least two runs"]}
+
+        run_ids = list(results_by_run)
+        columns = []
+        for run_id in run_ids:
+            table = results_by_run[run_id]
+            if not isinstance(table, PoseTable):
+                table = PoseTable.from_parsed_results(table)
+            columns.append((table.ligand_names, table.affinities[select_best_poses(table)]))
+
+        names, affinities, _ = join_runs(columns)
+        if not names:
+            return {"ranked_ligands": [], "errors": ["No valid poses found for ranking"]}
+
+        scores, ranks = consensus_scores(affinities)
+        runs_present = np.count_nonzero(~np.isnan(affinities), axis=1)
+        order = consensus_order(scores, runs_present, names, method)
+
+        rounded = {name: np.round(values[order], 4).tolist() for name, values in scores.items()}
+        best = np.nanmin(affinities[order], axis=1).tolist()
+        present = runs_present[order].tolist()
+        # Per-run columns aligned with "runs", None where a ligand is missing
+        missing = np.isnan(affinities[order])
+        run_affinities = np.where(missing, None, affinities[order]).tolist()
+        run_ranks = np.where(missing, None, np.nan_to_num(ranks[order]).astype(np.int64)).tolist()
+
+        ranked = [
+            {
+                "ligand_name": names[idx],
+                "binding_affinity": best[position],
+                "consensus_score": rounded[method][position],
+                "mean_rank": mean_rank,
+                "min_rank": min_rank,
+                "rank_product": rank_product,
+                "z_score": z_score,
+                "runs_present": present[position],
+                "run_affinities": run_affinities[position],
+                "run_ranks": run_ranks[position],
+            }
+            for position, (idx, mean_rank, min_rank, rank_product, z_score) in enumerate(zip(
+                order.tolist(), *(rounded[name] for name in CONSENSUS_METHODS)
+            ))
+        ]
 
-            if not poses:
-                errors.append(f"No poses found for ligand: {ligand_name}")
+        return {"ranked_ligands": ranked, "errors": [], "method": method, "runs": run_ids}
+
+    def _best_pose_entry(self, result):
+        """Build the ranked entry for a ligand's lowest-ΔG pose."""
+        poses = result["poses"]
+
+        # Find pose with lowest binding affinity (lowest pose id on ties)
+        best_pose = min(poses, key=lambda p: (p["binding_affinity"], p["pose_id"]))
+
+        return {
+            "ligand_name": result.get("ligand_name"),
+            "file_path": result.get("file_path"),
+            "binding_affinity": best_pose["binding_affinity"],
+            "pose_id": best_pose["pose_id"],
+            "total_poses": len(poses),
+        }
+
+    def rank_top_k(self, parsed_docking_results, k):
+        """Rank only the best ``k`` ligands while streaming parsed results.
+
+        Keeps a bounded heap, so ``parsed_docking_results`` may be any
+        iterable (including a generator over a screen that never fits in
+        memory). Runs in O(N log k) time and O(k) memory, and reports the
+        number of ligands seen and their affinity distribution.
+        """
+        if k <= 0:
+            return {"ranked_ligands": [], "errors": ["Top-K size must be positive"]}
+        if self._rescoring_error():
+            return {"ranked_ligands": [], "errors": self._rescoring_error()}
+
+        # Heap root is the worst kept ligand
+        heap = []
+        stats = _AffinityStats()
+
+        for result in parsed_docking_results:
+            if not result.get("poses"):
                 continue
 
-            # Find pose with lowest binding affinity
-            best_pose = min(poses, key=lambda p: p["binding_affinity"])
+            entry = self._best_pose_entry(result)
+            item = _RankedItem(entry, result, *self._stream_rank_value(entry, result))
+            stats.add(item.entry["binding_affinity"])
+
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif heap[0] < item:
+                heapq.heapreplace(heap, item)
 
-            best_poses.append({
-                "ligand_name": ligand_name,
-                "file_path": result.get("file_path"),
-                "binding_affinity": best_pose["binding_affinity"],
-                "pose_id": best_pose["pose_id"],
-                "total_poses": len(poses),
-            })
+        if not heap:
+            return {"ranked_ligands": [], "errors": ["No valid poses found for ranking"]}
+
+        # Only the kept ligands are clustered; the engine orders them like
+        # rank_by_binding_affinity (rank key, ligand name, pose id)
+        table = PoseTable.from_parsed_results([item.result for item in heap])
+        # Pose scores computed while streaming are reused, not recomputed
+        scores = np.concatenate([item.scores for item in heap]) if heap[0].scores is not None else None
+        ranked = self._rank_table(table, scores)
+
+        return {
+            "ranked_ligands": ranked,
+            "errors": [],
+            "total_ligands_seen": stats.count,
+            "affinity_stats": stats.summary(),
+        }
+
+    def _stream_rank_value(self, entry, result):
+        """Value a streamed ligand is kept by in rank_top_k, and its pose scores if rescored.
 
-        return best_poses
+        Pareto fronts depend on every ligand, so the Pareto mode keeps the
+        K best by ΔG and orders those.
+        """
+        if self.rank_key != "rescored_affinity":
+            return entry["binding_affinity"], None
+        scores = self.rescorer.score_ligand_poses(result.get("pose_arrays"), len(result["poses"]))
+        return (math.inf if np.isnan(scores).all() else float(np.nanmin(scores))), scores
 
     def compare_ligands(self, ligand_a, ligand_b):
-        """Compare two ligands based on multiple criteria."""
-        # Not implemented in this scope
-        pass
+        """Compare a reference ligand against one or many candidates.
+
+        ``ligand_b`` may be a single ranked ligand or a list of them; the
+        list form is evaluated in one vectorized pass and returns
+        ``{"reference": ..., "comparisons": [...]}``.
+        """
+        if isinstance(ligand_b, dict):
+            return self.compare_ligands(ligand_a, [ligand_b])["comparisons"][0]
+
+        candidates = list(ligand_b)
+        reference_affinity = float(ligand_a["binding_affinity"])
+        affinities = np.fromiter(
+            (c["binding_affinity"] for c in candidates), dtype=np.float64, count=len(candidates)
+        )
+
+        # Negative difference means the candidate binds more favorably
+        differences = np.round(affinities - reference_affinity, 4)
+        # Kd(reference) / Kd(candidate) estimated from ΔΔG = -RT ln(ratio)
+        kd_ratios = np.round(np.exp(-differences / RT_KCAL_PER_MOL), 4)
+        better = differences < 0
+
+        comparisons = [
+            {
+                "ligand_name": candidate.get("ligand_name"),
+                "binding_affinity": candidate["binding_affinity"],
+                "affinity_difference": difference,
+                "estimated_kd_ratio": kd_ratio,
+                "better_than_reference": is_better,
+            }
+            for candidate, difference, kd_ratio, is_better in zip(
+                candidates, differences.tolist(), kd_ratios.tolist(), better.tolist()
+            )
+        ]
+
+        return {
+            "reference": {
+                "ligand_name": ligand_a.get("ligand_name"),
+                "binding_affinity": ligand_a["binding_affinity"],
+            },
+            "comparisons": comparisons,
+        }
 
     def filter_by_threshold(self, ligands, threshold):
-        """Filter ligands below binding affinity threshold."""
-        # Not implemented in this scope
-        pass
+        """Filter ligands at or below a binding affinity threshold (kcal/mol)."""
+        if not ligands:
+            return []
+
+        affinities = np.fromiter(
+            (ligand["binding_affinity"] for ligand in ligands), dtype=np.float64, count=len(ligands)
+        )
+        return [ligands[idx] for idx in np.flatnonzero(affinities <= threshold)]
 
     def generate_ranking_summary(self, ranked_ligands):
         """Generate summary of ranking results."""
@@ -71,3 +276,57 @@ class LigandRanker:
             "best_ligand": ranked_ligands[0]["ligand_name"],
             "best_affinity": ranked_ligands[0]["binding_affinity"],
         }
+
+
+class _RankedItem:
+    """Heap item ordered so the worst-ranked ligand is the heap minimum."""
+
+    __slots__ = ("key", "entry", "result", "scores")
+
+    def __init__(self, entry, result, rank_value, scores=None):
+        self.key = (rank_value, str(entry["ligand_name"]), entry["pose_id"])
+        self.entry = entry
+        self.result = result
+        # Per-pose rescoring scores, kept so the final ranking does not rescore
+        self.scores = scores
+
+    def __lt__(self, other):
+        return self.key > other.key
+
+
+class _AffinityStats:
+    """Streaming min/max/mean/std and histogram of binding affinities."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.histogram = {}
+
+    def add(self, affinity):
+        """Fold one affinity into the running statistics (Welford)."""
+        self.count += 1
+        delta = affinity - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (affinity - self.mean)
+        self.min = min(self.min, affinity)
+        self.max = max(self.max, affinity)
+
+        bin_start = math.floor(affinity / AFFINITY_HISTOGRAM_BIN) * AFFINITY_HISTOGRAM_BIN
+        self.histogram[bin_start] = self.histogram.get(bin_start, 0) + 1
+
+    def summary(self):
+        """Return the statistics as a JSON-serializable dictionary."""
+        std = math.sqrt(self._m2 / self.count) if self.count else 0.0
+        return {
+            "min": self.min,
+            "max": self.max,
+            "mean": round(self.mean, 4),
+            "std": round(std, 4),
+            "histogram": [
+                {"bin_start": bin_start, "count": count}
+                for bin_start, count in sorted(self.histogram.items())
+            ],
+        }
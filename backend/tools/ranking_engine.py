@@ -0,0 +1,287 @@
+"""Vectorized NumPy ranking over flat pose columns."""
+
+import math
+
+import numpy as np
+
+from backend.tools.interaction_engine import _CODE_IS_H, analyze_pose_batch
+from backend.tools.pareto import crowding_distance, non_dominated_sort
+
+# Pareto objectives and their direction: 1 minimizes, -1 maximizes
+PARETO_OBJECTIVES = {
+    "binding_affinity": 1,
+    "ligand_efficiency": -1,
+    "cluster_size": -1,
+    "interaction_count": -1,
+}
+
+
+class PoseTable:
+    """Flat, columnar view of parsed docking results.
+
+    Ligand ``i`` owns pose rows ``pose_offsets[i]:pose_offsets[i + 1]``.
+    Ligands without poses are not included.
+    """
+
+    def __init__(self, ligand_names, file_paths, pose_offsets, pose_ids, affinities,
+                 rmsd_lb=None, pose_arrays=None):
+        self.ligand_names = ligand_names  # list of str (n_ligands)
+        self.file_paths = file_paths  # list of str (n_ligands)
+        self.pose_offsets = pose_offsets  # (n_ligands + 1,) int64
+        self.pose_ids = pose_ids  # (n_poses,) int64
+        self.affinities = affinities  # (n_poses,) float64
+        self.rmsd_lb = rmsd_lb  # (n_poses,) float64 or None
+        self.pose_arrays = pose_arrays  # list of PoseArrays/None (n_ligands) or None
+
+    @classmethod
+    def from_parsed_results(cls, parsed_docking_results):
+        """Flatten DockingParser outputs into pose columns."""
+        results = [r for r in parsed_docking_results if r.get("poses")]
+        counts = [len(r["poses"]) for r in results]
+        n_poses = sum(counts)
+
+        pose_offsets = np.zeros(len(results) + 1, dtype=np.int64)
+        np.cumsum(counts, out=pose_offsets[1:])
+
+        poses = [pose for r in results for pose in r["poses"]]
+        return cls(
+            ligand_names=[r.get("ligand_name") for r in results],
+            file_paths=[r.get("file_path") for r in results],
+            pose_offsets=pose_offsets,
+            pose_ids=np.fromiter((p["pose_id"] for p in poses), dtype=np.int64, count=n_poses),
+            affinities=np.fromiter((p["binding_affinity"] for p in poses), dtype=np.float64, count=n_poses),
+            rmsd_lb=np.fromiter((p.get("rmsd_lb", 0.0) for p in poses), dtype=np.float64, count=n_poses),
+            pose_arrays=[r.get("pose_arrays") for r in results],
+        )
+
+    @classmethod
+    def from_pose_store(cls, reader, coordinates=True):
+        """Build a table over the columns of an open PoseStoreReader.
+
+        With ``coordinates=False`` no pose arrays are attached, so the table
+        holds no views into the reader and outlives it.
+        """
+        counts = np.diff(reader.pose_offsets)
+        keep = np.flatnonzero(counts > 0)
+        names = reader.ligand_names()
+        offsets = np.zeros(len(keep) + 1, dtype=np.int64)
+        np.cumsum(counts[keep], out=offsets[1:])
+        return cls(
+            ligand_names=[names[idx] for idx in keep],
+            file_paths=[reader.file_path(idx) for idx in keep],
+            pose_offsets=offsets,
+            pose_ids=reader.pose_ids.astype(np.int64),
+            # float32 on disk; round so ranked values print like the source files
+            affinities=reader.affinities.astype(np.float64).round(4),
+            rmsd_lb=reader.rmsd_lb.astype(np.float64),
+            pose_arrays=[reader.pose_arrays(idx) for idx in keep] if coordinates and reader.has_coordinates else None,
+        )
+
+    @property
+    def num_ligands(self):
+        """Number of ligands with at least one pose."""
+        return len(self.pose_offsets) - 1
+
+    @property
+    def num_poses(self):
+        """Total number of poses."""
+        return len(self.affinities)
+
+    @property
+    def pose_counts(self):
+        """Number of poses per ligand."""
+        return np.diff(self.pose_offsets)
+
+
+def segmented_argmin(values, offsets, tie_breaker=None):
+    """Row index of the minimum of each segment ``offsets[i]:offsets[i + 1]``.
+
+    Ties are resolved by the smallest ``tie_breaker`` value, then by the
+    first row. Every segment must be non-empty.
+    """
+    starts = offsets[:-1]
+    counts = np.diff(offsets)
+
+    segment_min = np.minimum.reduceat(values, starts)
+    candidate = values == np.repeat(segment_min, counts)
+
+    if tie_breaker is not None:
+        masked = np.where(candidate, tie_breaker, np.iinfo(tie_breaker.dtype).max)
+        tie_min = np.minimum.reduceat(masked, starts)
+        candidate &= masked == np.repeat(tie_min, counts)
+
+    rows = np.flatnonzero(candidate)
+    segments = np.searchsorted(offsets, rows, side="right") - 1
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = segments[1:] != segments[:-1]
+    return rows[first]
+
+
+def select_best_poses(table):
+    """Best pose row per ligand: lowest ΔG, then lowest pose id."""
+    return segmented_argmin(table.affinities, table.pose_offsets, table.pose_ids)
+
+
+def rank_ligand_order(best_affinities, ligand_names, best_pose_ids):
+    """Ligand order by ΔG, then ligand name, then pose id (single lexsort)."""
+    names = np.asarray(ligand_names, dtype=str)
+    # np.lexsort sorts by the last key first
+    return np.lexsort((best_pose_ids, names, best_affinities))
+
+
+def _best_pose_atoms(table, best_rows):
+    """Ligands whose best pose has coordinates, with that pose's atom rows."""
+    ligands, rows = [], []
+    for ligand, arrays in enumerate(table.pose_arrays or ()):
+        model = int(best_rows[ligand] - table.pose_offsets[ligand])
+        if arrays is not None and model < arrays.num_poses:
+            pose_rows = arrays.pose_slice(model)
+            # A MODEL block without atoms has no coordinates either
+            if pose_rows.stop > pose_rows.start:
+                ligands.append(ligand)
+                rows.append(pose_rows)
+    return ligands, rows
+
+
+def ligand_objectives(table, clusters, names=tuple(PARETO_OBJECTIVES), receptor=None):
+    """
+    Per-ligand Pareto objective columns, aligned with the table's ligands.
+
+    Ligand efficiency (-ΔG per heavy atom of the best pose) needs pose
+    coordinates; interaction counts of the best pose also need a prepared
+    receptor. Objectives whose inputs are missing for every ligand are
+    left out, and single ligands missing an input get NaN.
+
+    Returns:
+        Dict of objective name -> (n_ligands,) float64, in ``names`` order
+    """
+    best_rows = select_best_poses(table)
+    ligands, rows = _best_pose_atoms(table, best_rows)
+    poses = [table.pose_arrays[ligand] for ligand in ligands]
+
+    columns = {}
+    for name in names:
+        if name not in PARETO_OBJECTIVES:
+            raise ValueError(f"Unknown Pareto objective: {name}")
+
+        values = np.full(table.num_ligands, np.nan)
+        if name == "binding_affinity":
+            values = table.affinities[best_rows]
+        elif name == "cluster_size" and clusters is not None:
+            values = clusters.cluster_size.astype(np.float64)
+        elif name == "ligand_efficiency" and ligands:
+            heavy_atoms = np.array([
+                np.count_nonzero(~_CODE_IS_H[pose.atom_types[atoms]]) for pose, atoms in zip(poses, rows)
+            ])
+            values[ligands] = -table.affinities[best_rows[ligands]] / np.maximum(heavy_atoms, 1)
+        elif name == "interaction_count" and ligands and receptor is not None:
+            offsets = np.zeros(len(ligands) + 1, dtype=np.int64)
+            np.cumsum([atoms.stop - atoms.start for atoms in rows], out=offsets[1:])
+            interactions = analyze_pose_batch(
+                receptor,
+                np.concatenate([pose.coordinates[atoms] for pose, atoms in zip(poses, rows)]),
+                np.concatenate([pose.atom_types[atoms] for pose, atoms in zip(poses, rows)]),
+                np.concatenate([pose.charges[atoms] for pose, atoms in zip(poses, rows)]),
+                offsets,
+            )
+            values[ligands] = interactions.counts_by_pose().sum(axis=1)
+        else:
+            continue
+        columns[name] = values
+    return columns
+
+
+def pareto_order(objectives, best_affinities, ligand_names, best_pose_ids):
+    """
+    Ligand order by Pareto front, then crowding distance (most isolated
+    first), then ΔG, ligand name and pose id.
+
+    Returns:
+        (order, fronts, crowding) with fronts and crowding per ligand
+    """
+    matrix = np.column_stack([values * PARETO_OBJECTIVES[name] for name, values in objectives.items()])
+    fronts = non_dominated_sort(matrix)
+    crowding = crowding_distance(matrix, fronts)
+    names = np.asarray(ligand_names, dtype=str)
+    order = np.lexsort((best_pose_ids, names, best_affinities, -crowding, fronts))
+    return order, fronts, crowding
+
+
+def rank_pose_table(table, clusters=None, scores=None, order_by="binding_affinity", objectives=None):
+    """Rank ligands of a PoseTable in the ``ranked_ligands`` schema.
+
+    With PoseClusters, entries gain ``cluster_size`` (poses in the best
+    pose's cluster) and ``representative_pose`` (that cluster's medoid).
+    With per-pose rescoring ``scores`` (NaN where a pose was not scored),
+    entries gain ``rescored_affinity`` and ``rescored_pose_id`` of the best
+    rescored pose, and ``order_by="rescored_affinity"`` ranks by it
+    (unscored ligands last).
+
+    With ``order_by="pareto"`` and ``objectives`` from ligand_objectives,
+    ligands are ordered by pareto_order and entries gain ``pareto_front``
+    (1 is non-dominated), ``crowding_distance`` (None for the extremes of a
+    front, whose distance is infinite) and the objective values.
+    """
+    if table.num_ligands == 0:
+        return []
+
+    best_rows = select_best_poses(table)
+    best_affinities = table.affinities[best_rows]
+    best_pose_ids = table.pose_ids[best_rows]
+
+    if scores is not None:
+        scored = np.where(np.isnan(scores), np.inf, scores)
+        rescored_rows = segmented_argmin(scored, table.pose_offsets, table.pose_ids)
+        rescored = scores[rescored_rows]
+        rescored_pose_ids = table.pose_ids[rescored_rows]
+
+    if objectives and order_by == "pareto":
+        order, fronts, crowding = pareto_order(objectives, best_affinities, table.ligand_names, best_pose_ids)
+    elif scores is not None and order_by == "rescored_affinity":
+        order = rank_ligand_order(scored[rescored_rows], table.ligand_names, rescored_pose_ids)
+    else:
+        order = rank_ligand_order(best_affinities, table.ligand_names, best_pose_ids)
+
+    affinities = best_affinities[order].tolist()
+    pose_ids = best_pose_ids[order].tolist()
+    totals = table.pose_counts[order].tolist()
+
+    ranked = [
+        {
+            "ligand_name": table.ligand_names[idx],
+            "file_path": table.file_paths[idx],
+            "binding_affinity": affinity,
+            "pose_id": pose_id,
+            "total_poses": total,
+        }
+        for idx, affinity, pose_id, total in zip(order.tolist(), affinities, pose_ids, totals)
+    ]
+
+    if clusters is not None:
+        sizes = clusters.cluster_size[order].tolist()
+        representatives = table.pose_ids[clusters.representative_row[order]].tolist()
+        for entry, size, representative in zip(ranked, sizes, representatives):
+            entry["cluster_size"] = size
+            entry["representative_pose"] = representative
+
+    if scores is not None:
+        values = np.round(rescored[order], 4).tolist()
+        pose_ids = rescored_pose_ids[order].tolist()
+        for entry, value, pose_id in zip(ranked, values, pose_ids):
+            scored_pose = not math.isnan(value)
+            entry["rescored_affinity"] = value if scored_pose else None
+            entry["rescored_pose_id"] = pose_id if scored_pose else None
+
+    if objectives and order_by == "pareto":
+        front_numbers = (fronts[order] + 1).tolist()
+        distances = np.round(crowding[order], 4).tolist()
+        for entry, front, distance in zip(ranked, front_numbers, distances):
+            entry["pareto_front"] = front
+            entry["crowding_distance"] = distance if math.isfinite(distance) else None
+
+        for name, cast in (("ligand_efficiency", float), ("interaction_count", int)):
+            if name in objectives:
+                for entry, value in zip(ranked, np.round(objectives[name][order], 4).tolist()):
+                    entry[name] = None if math.isnan(value) else cast(value)
+
+    return ranked
@@ -19,8 +19,17 @@ class ReportWriter:
             except Exception as e:
                 print(f"Warning: Failed to initialize Groq client: {e}")
 
-    def compose_report(self, analysis_data):
-        """Compose complete scientific report."""
+    def compose_report(self, analysis_data, on_token=None, on_reset=None):
+        """Compose complete scientific report.
+
+        With ``on_token``, the report is also delivered piece by piece as
+        it is written (the LLM discussion token by token); the pieces
+        concatenate to the returned report. If the LLM stream fails
+        partway, its text is abandoned for the template discussion and
+        ``on_reset`` gets the report text without it: listeners replace
+        what they received with that text and keep appending.
+        """
+        emit = on_token or (lambda text: None)
         report_sections = []
 
         # Build report sections
@@ -28,27 +37,40 @@ class ReportWriter:
         report_sections.append(self._generate_introduction())
         report_sections.append(self.generate_methods_section(analysis_data.get("metadata", {})))
         report_sections.append(self.generate_results_section(analysis_data))
+        head = "\n\n".join(report_sections) + "\n\n"
+        emit(head)
         
         # Use Groq for discussion if available
         if self.groq_client:
-            discussion = self._generate_discussion_with_llm(analysis_data)
+            on_abandon = (lambda: on_reset(head)) if on_reset else None
+            discussion = self._generate_discussion_with_llm(analysis_data, on_token, on_abandon)
         else:
             discussion = self.generate_discussion_section(analysis_data)
+            emit(discussion)
         
         report_sections.append(discussion)
         report_sections.append(self.add_scientific_disclaimer())
+        emit("\n\n" + report_sections[-1])
 
         return "\n\n".join(report_sections)
 
-    def _generate_discussion_with_llm(self, analysis_data):
-        """Generate discussion section using Groq LLM."""
+    def _generate_discussion_with_llm(self, analysis_data, on_token=None, on_abandon=None):
+        """Generate discussion section using Groq LLM (streamed to ``on_token`` if given).
+
+        Any LLM failure falls back to the template discussion; ``on_abandon``
+        is called first when part of the LLM text was already streamed.
+        """
         ranked_ligands = analysis_data.get("ranked_ligands", [])
         
         if not ranked_ligands:
-            return self.generate_discussion_section(analysis_data)
+            discussion = self.generate_discussion_section(analysis_data)
+            if on_token:
+                on_token(discussion)
+            return discussion
         
         # Prepare structured input for LLM
         prompt = self._build_discussion_prompt(analysis_data)
+        streamed = []
         
         try:
             response = self.groq_client.chat.completions.create(
@@ -65,9 +87,13 @@ class ReportWriter:
                 ],
                 temperature=0.2,
                 max_tokens=2000,
+                stream=on_token is not None,
             )
             
-            llm_discussion = response.choices[0].message.content
+            if on_token is None:
+                llm_discussion = response.choices[0].message.content
+            else:
+                llm_discussion = self._stream_discussion(response, on_token, streamed)
             
             # Ensure discussion section has proper header
             if not llm_discussion.startswith("## Discussion"):
@@ -77,7 +103,38 @@ class ReportWriter:
             
         except Exception as e:
             print(f"Warning: Groq LLM failed, using fallback: {e}")
-            return self.generate_discussion_section(analysis_data)
+            if streamed and on_abandon:
+                # A truncated discussion is never stored or attested; listeners drop it
+                on_abandon()
+            discussion = self.generate_discussion_section(analysis_data)
+            if on_token:
+                on_token(discussion)
+            return discussion
+
+    def _stream_discussion(self, chunks, on_token, streamed):
+        """Forward streamed LLM deltas, adding the Discussion header if missing.
+
+        Text is held back until it can be told whether it starts with the
+        header, so listeners see exactly the returned discussion.
+        """
+        header = "## Discussion"
+        pending = ""
+        for chunk in chunks:
+            text = chunk.choices[0].delta.content or ""
+            if not streamed:
+                pending += text
+                if len(pending) < len(header) and header.startswith(pending):
+                    continue
+                text = pending if pending.startswith(header) else header + "\n\n" + pending
+            streamed.append(text)
+            on_token(text)
+        
+        if not streamed:
+            # Short reply that never got past the header check
+            text = pending if pending.startswith(header) else header + "\n\n" + pending
+            streamed.append(text)
+            on_token(text)
+        return "".join(streamed)
 
     def _build_discussion_prompt(self, analysis_data):
         """Build structured prompt for LLM discussion generation."""
@@ -0,0 +1,262 @@
+"""Vina-like empirical rescoring of docked poses against a prepared receptor."""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from backend.tools.interaction_engine import _CODE_ELEMENTS, _ligand_typing
+
+# AutoDock Vina weights of the intermolecular terms
+VINA_WEIGHTS = {
+    "gauss1": -0.035579,
+    "gauss2": -0.005156,
+    "repulsion": 0.840245,
+    "hydrophobic": -0.035069,
+    "hydrogen_bond": -0.587439,
+}
+RESCORING_TERMS = tuple(VINA_WEIGHTS)
+
+# Pairs farther apart than this (Angstroms) do not contribute
+RESCORING_CUTOFF = 8.0
+
+# Ligand atoms per neighbor query; at the cutoff each heavy atom sees ~100
+# receptor atoms, so this bounds the pair arrays to a few million rows
+DEFAULT_RESCORING_BLOCK_ATOMS = 20_000
+# KD-tree leaf size; smaller leaves suit the dense 8 A pair search
+NEIGHBOR_LEAFSIZE = 16
+
+# X-Score van der Waals radii by element, as used by Vina
+XS_RADII = {
+    "C": 1.9, "N": 1.8, "O": 1.7, "S": 2.0, "P": 2.1, "F": 1.5,
+    "Cl": 1.8, "Br": 2.0, "I": 2.2, "Mg": 1.2, "Ca": 1.2, "Mn": 1.2,
+    "Fe": 1.2, "Zn": 1.2,
+}
+DEFAULT_XS_RADIUS = 1.9
+HALOGENS = ("F", "Cl", "Br", "I")
+# Metal ions count as H-bond donors
+METALS = ("Mg", "Ca", "Mn", "Fe", "Zn")
+
+# XS radius per AutoDock type code
+_CODE_RADII = np.array([XS_RADII.get(e, DEFAULT_XS_RADIUS) for e in _CODE_ELEMENTS], dtype=np.float32)
+
+# Piecewise-linear ranges on the surface distance (Angstroms)
+HYDROPHOBIC_GOOD, HYDROPHOBIC_BAD = 0.5, 1.5
+HBOND_GOOD, HBOND_BAD = -0.7, 0.0
+
+# Surface distance beyond which gauss1 is below e^-36 and skipped; the
+# repulsion, hydrophobic and H-bond terms vanish beyond HYDROPHOBIC_BAD
+GAUSS1_RANGE = 3.0
+
+
+def parse_weights(spec):
+    """Vina weights overridden by a "gauss1=-0.03,repulsion=0.9" string."""
+    weights = dict(VINA_WEIGHTS)
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, _, value = item.partition("=")
+        name = name.strip()
+        if name not in weights:
+            raise ValueError(f"Unknown rescoring term: {name}")
+        weights[name] = float(value)
+    return weights
+
+
+def gauss1(d):
+    """Steric attraction at contact distance."""
+    return np.exp(-np.square(d * 2.0))
+
+
+def gauss2(d):
+    """Broad steric attraction peaking 3 A beyond contact."""
+    return np.exp(-np.square((d - 3.0) * 0.5))
+
+
+def repulsion(d):
+    """Quadratic penalty for overlapping atoms."""
+    return np.square(np.minimum(d, 0.0))
+
+
+def hydrophobic(d):
+    """1 below HYDROPHOBIC_GOOD, linear to 0 at HYDROPHOBIC_BAD."""
+    return np.clip((HYDROPHOBIC_BAD - d) / (HYDROPHOBIC_BAD - HYDROPHOBIC_GOOD), 0.0, 1.0)
+
+
+def hydrogen_bond(d):
+    """1 below HBOND_GOOD, linear to 0 at HBOND_BAD."""
+    return np.clip((HBOND_BAD - d) / (HBOND_BAD - HBOND_GOOD), 0.0, 1.0)
+
+
+def pair_terms(surface_distance, hydrophobic_pair, hbond_pair):
+    """
+    Unweighted Vina terms of atom pairs.
+
+    Args:
+        surface_distance: (n,) distance minus both XS radii
+        hydrophobic_pair: (n,) bool, both atoms hydrophobic
+        hbond_pair: (n,) bool, donor/acceptor pair in either direction
+
+    Returns:
+        (n, len(RESCORING_TERMS)) term values
+    """
+    d = np.asarray(surface_distance, dtype=np.float64)
+    return np.column_stack((
+        gauss1(d),
+        gauss2(d),
+        repulsion(d),
+        np.where(hydrophobic_pair, hydrophobic(d), 0.0),
+        np.where(hbond_pair, hydrogen_bond(d), 0.0),
+    ))
+
+
+class VinaRescorer:
+    """Scores stacked ligand poses with a Vina-like intermolecular function.
+
+    Hydrogens are ignored, like in Vina. Atom typing reuses the interaction
+    rules (charges separate polar from hydrophobic carbons), and the score
+    is the weighted intermolecular sum without Vina's rotatable-bond
+    normalization, which needs the ligand torsion tree.
+    """
+
+    def __init__(self, receptor, weights=None, cutoff=RESCORING_CUTOFF,
+                 block_atoms=DEFAULT_RESCORING_BLOCK_ATOMS):
+        self.receptor = receptor
+        self.weights = dict(VINA_WEIGHTS, **(weights or {}))
+        self.cutoff = cutoff
+        self.block_atoms = max(1, block_atoms)
+
+        # Receptor typing and a heavy-atom tree, computed once per receptor
+        elements = receptor.elements
+        self._heavy = np.flatnonzero(~receptor.is_hydrogen)
+        self._tree = cKDTree(receptor.coordinates[self._heavy], leafsize=NEIGHBOR_LEAFSIZE)
+        radius = np.array([XS_RADII.get(e, DEFAULT_XS_RADIUS) for e in elements], dtype=np.float32)
+        self._radius = radius[self._heavy]
+        self._hydrophobic = (receptor.is_hydrophobic | np.isin(elements, HALOGENS))[self._heavy]
+        self._donor = (receptor.is_donor | np.isin(elements, METALS))[self._heavy]
+        self._acceptor = receptor.is_acceptor[self._heavy]
+
+    @property
+    def weight_vector(self):
+        """Weights in RESCORING_TERMS order."""
+        return np.array([self.weights[name] for name in RESCORING_TERMS])
+
+    def term_sums(self, coordinates, atom_types, charges, atom_offsets):
+        """
+        Per-pose sums of the unweighted terms.
+
+        Keeping terms separate lets callers try other weights without
+        another neighbor search.
+
+        Args:
+            coordinates: (n_atoms, 3) stacked ligand coordinates
+            atom_types: (n_atoms,) AutoDock type codes
+            charges: (n_atoms,) partial charges
+            atom_offsets: (n_poses + 1,) pose -> atom rows
+
+        Returns:
+            (n_poses, len(RESCORING_TERMS)) float64
+        """
+        atom_offsets = np.asarray(atom_offsets, dtype=np.int64)
+        num_poses = len(atom_offsets) - 1
+        base = int(atom_offsets[0])
+        atom_offsets = atom_offsets - base
+        total = int(atom_offsets[-1])
+        coordinates = np.asarray(coordinates).reshape(-1, 3)[base:base + total]
+        codes = np.asarray(atom_types)[base:base + total]
+
+        ligand = _ligand_typing(codes, np.asarray(charges)[base:base + total], atom_offsets, coordinates)
+        codes = codes.astype(np.intp)
+        elements = _CODE_ELEMENTS[codes]
+        radius = _CODE_RADII[codes]
+        hydrophobic_atom = ligand["is_hydrophobic"] | np.isin(elements, HALOGENS)
+        donor, acceptor = ligand["is_donor"], ligand["is_acceptor"]
+        heavy = np.flatnonzero(~ligand["is_hydrogen"])
+
+        sums = np.zeros((num_poses, len(RESCORING_TERMS)))
+
+        def add(column, pose, values):
+            sums[:, column] += np.bincount(pose, weights=values, minlength=num_poses)
+
+        for start in range(0, len(heavy), self.block_atoms):
+            rows = heavy[start:start + self.block_atoms]
+            tree = cKDTree(coordinates[rows].astype(np.float64), leafsize=NEIGHBOR_LEAFSIZE)
+            pairs = tree.sparse_distance_matrix(self._tree, self.cutoff, output_type="ndarray")
+            lig, rec = rows[pairs["i"]], pairs["j"]
+            d = pairs["v"].astype(np.float32) - radius[lig] - self._radius[rec]
+            pose = ligand["pose_of_atom"][lig]
+            add(1, pose, gauss2(d))
+
+            # The other terms only matter near contact; narrowing the pairs
+            # first skips most of the arithmetic and typing lookups
+            near = np.flatnonzero(d < GAUSS1_RANGE)
+            lig, rec, d, pose = lig[near], rec[near], d[near], pose[near]
+            add(0, pose, gauss1(d))
+
+            near = np.flatnonzero(d < HYDROPHOBIC_BAD)
+            lig, rec, d, pose = lig[near], rec[near], d[near], pose[near]
+            add(2, pose, repulsion(d))
+            contact = hydrophobic_atom[lig] & self._hydrophobic[rec]
+            add(3, pose[contact], hydrophobic(d[contact]))
+            hbond = (donor[lig] & self._acceptor[rec]) | (acceptor[lig] & self._donor[rec])
+            add(4, pose[hbond], hydrogen_bond(d[hbond]))
+
+        return sums
+
+    def score_poses(self, coordinates, atom_types, charges, atom_offsets):
+        """Weighted score (kcal/mol-like, lower is better) of every pose."""
+        return self.term_sums(coordinates, atom_types, charges, atom_offsets) @ self.weight_vector
+
+    def score_ligand_poses(self, arrays, n_poses):
+        """
+        Scores of one ligand's first ``n_poses`` poses, e.g. while streaming.
+
+        Poses without coordinates get NaN, as in score_pose_table.
+        """
+        scores = np.full(n_poses, np.nan)
+        if arrays is None:
+            return scores
+        n_scored = min(arrays.num_poses, n_poses)
+        end = int(arrays.model_offsets[n_scored])
+        if end == 0:
+            return scores
+
+        offsets = arrays.model_offsets[:n_scored + 1]
+        pose_scores = self.score_poses(arrays.coordinates[:end], arrays.atom_types[:end], arrays.charges[:end], offsets)
+        # MODEL blocks without atoms have no coordinates to score
+        pose_scores[np.diff(offsets) == 0] = np.nan
+        scores[:n_scored] = pose_scores
+        return scores
+
+    def score_pose_table(self, table):
+        """
+        Scores aligned with the pose rows of a PoseTable.
+
+        Poses without coordinates (no pose_arrays, or fewer MODEL blocks
+        than scored poses) get NaN.
+        """
+        scores = np.full(table.num_poses, np.nan)
+        if not table.pose_arrays:
+            return scores
+
+        rows, coordinates, types, charges, sizes = [], [], [], [], []
+        for ligand, arrays in enumerate(table.pose_arrays):
+            if arrays is None:
+                continue
+            n_poses = min(arrays.num_poses, int(table.pose_counts[ligand]))
+            end = int(arrays.model_offsets[n_poses])
+            rows.append(np.arange(table.pose_offsets[ligand], table.pose_offsets[ligand] + n_poses))
+            coordinates.append(arrays.coordinates[:end])
+            types.append(arrays.atom_types[:end])
+            charges.append(arrays.charges[:end])
+            sizes.append(np.diff(arrays.model_offsets[:n_poses + 1]))
+
+        if not rows:
+            return scores
+
+        sizes = np.concatenate(sizes)
+        offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        pose_scores = self.score_poses(
+            np.concatenate(coordinates), np.concatenate(types), np.concatenate(charges), offsets
+        )
+        # MODEL blocks without atoms have no coordinates to score
+        pose_scores[sizes == 0] = np.nan
+        scores[np.concatenate(rows)] = pose_scores
+        return scores